@@ -0,0 +1,31 @@
+import os
+from sqlalchemy.orm import Session
+from cache import TTLCache
+import http_cache
+import models
+
+ANSWER_KEY_CACHE_TTL_SECONDS = float(os.environ.get("ANSWER_KEY_CACHE_TTL_SECONDS", "300"))
+ANSWER_KEY_CACHE_MAX_SIZE = int(os.environ.get("ANSWER_KEY_CACHE_MAX_SIZE", "1000"))
+
+answer_key_cache = TTLCache(ANSWER_KEY_CACHE_MAX_SIZE, ANSWER_KEY_CACHE_TTL_SECONDS)
+
+def get_answer_key(db: Session, course_id: int):
+    # Other workers only bump the version, so a cached key is served only while it still matches
+    version = http_cache.current_version(db, http_cache.quizzes_key(course_id))
+    cached = answer_key_cache.get(course_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    rows = db.query(models.Quiz.id, models.Quiz.correct_answer).filter(
+        models.Quiz.course_id == course_id
+    ).order_by(models.Quiz.id).all()
+    answer_key = tuple((str(quiz_id), correct_answer.upper()) for quiz_id, correct_answer in rows)
+    answer_key_cache.set(course_id, (version, answer_key))
+    return answer_key
+
+def invalidate_answer_key(course_id: int):
+    answer_key_cache.invalidate(course_id)
+
+def grade(answer_key, answers: dict):
+    submitted = {quiz_id: answer.upper() for quiz_id, answer in answers.items()}
+    return sum(submitted.get(quiz_id) == correct_answer for quiz_id, correct_answer in answer_key)
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_async.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import httpx
+
+CONCURRENCY_LEVELS = [50, 200, 1000]
+REQUESTS_PER_CLIENT = 5
+PORT = 8765
+
+def seed():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    from database import engine, SessionLocal
+    import migrations
+    import models
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    for i in range(50):
+        db.add(models.Course(title=f"Course {i}", description="Benchmark course", teacher_id=teacher.id))
+    db.commit()
+    db.close()
+    engine.dispose()
+
+def start_server(async_db: bool):
+    env = dict(os.environ, ASYNC_DB="true" if async_db else "false")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/health")
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+async def run_level(concurrency: int):
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            for _ in range(REQUESTS_PER_CLIENT):
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/courses/")
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    completed = len(latencies)
+    latencies = sorted(latencies) or [0.0]
+    return {
+        "concurrency": concurrency,
+        "requests": completed,
+        "errors": errors,
+        "requests_per_sec": round(completed / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000, 2),
+    }
+
+def main():
+    seed()
+    results = []
+    for async_db in (False, True):
+        proc = start_server(async_db)
+        try:
+            for concurrency in CONCURRENCY_LEVELS:
+                result = asyncio.run(run_level(concurrency))
+                result["mode"] = "async" if async_db else "sync"
+                results.append(result)
+                print(json.dumps(result))
+        finally:
+            proc.terminate()
+            proc.wait()
+    return results
+
+if __name__ == "__main__":
+    main()
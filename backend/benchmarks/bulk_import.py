@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_bulk.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from database import engine, SessionLocal
+from security import create_access_token
+import migrations
+import models
+import main
+
+ROWS = 1000
+
+def seed():
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Bulk", description="Benchmark course", teacher_id=teacher.id)
+    db.add(course)
+    db.commit()
+    ids = teacher.id, course.id
+    db.close()
+    return ids
+
+def quiz_row(i):
+    return {
+        "question": f"Question {i}",
+        "option_a": "a", "option_b": "b", "option_c": "c", "option_d": "d",
+        "correct_answer": "A",
+    }
+
+def main_benchmark():
+    teacher_id, course_id = seed()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(teacher_id)})}"}
+    client = TestClient(main.app)
+
+    started = time.perf_counter()
+    for i in range(ROWS):
+        response = client.post("/quizzes/", json=dict(quiz_row(i), course_id=course_id), headers=headers)
+        response.raise_for_status()
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    response = client.post(
+        "/quizzes/bulk",
+        json={"course_id": course_id, "quizzes": [quiz_row(i) for i in range(ROWS)]},
+        headers=headers
+    )
+    response.raise_for_status()
+    bulk = time.perf_counter() - started
+
+    print(json.dumps({
+        "rows": ROWS,
+        "single_rows_per_sec": round(ROWS / single, 1),
+        "bulk_rows_per_sec": round(ROWS / bulk, 1),
+        "speedup": round(single / bulk, 1),
+    }))
+
+if __name__ == "__main__":
+    main_benchmark()
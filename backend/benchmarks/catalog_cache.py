@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_catalog.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from database import engine, SessionLocal
+import catalog_cache
+import migrations
+import models
+import main
+
+COURSES = 100
+TEACHERS = 10
+REQUESTS = 1000
+
+def seed():
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teachers = []
+    for i in range(TEACHERS):
+        teacher = models.User(name=f"Teacher {i}", email=f"teacher{i}@bench", password="pw", role="teacher")
+        db.add(teacher)
+        teachers.append(teacher)
+    db.flush()
+    for i in range(COURSES):
+        db.add(models.Course(
+            title=f"Course {i}", description="Benchmark course " * 10, teacher_id=teachers[i % TEACHERS].id
+        ))
+    db.commit()
+    db.close()
+
+def run(client, backend_name: str):
+    cache = catalog_cache.catalog_cache
+    cache.backend = catalog_cache.build_backend(backend_name)
+    cache.hits = cache.misses = cache.rebuilds = 0
+
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        client.get("/courses/").raise_for_status()
+    elapsed = time.perf_counter() - started
+
+    stats = cache.stats()
+    return {
+        "backend": backend_name,
+        "requests_per_sec": round(REQUESTS / elapsed, 1),
+        "hit_ratio": stats["hit_ratio"],
+        "rebuilds": stats["rebuilds"],
+    }
+
+def main_benchmark():
+    seed()
+    client = TestClient(main.app)
+    with client:
+        for backend_name in ("none", "memory"):
+            print(json.dumps(run(client, backend_name)))
+
+if __name__ == "__main__":
+    main_benchmark()
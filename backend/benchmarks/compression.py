@@ -0,0 +1,146 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_compression.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["COMPRESSION"] = "true"
+
+from fastapi.testclient import TestClient
+from database import engine, SessionLocal
+from security import create_access_token
+import compression
+import lesson_content
+import migrations
+import models
+import main
+
+STUDENTS = 500
+LESSONS = 200
+QUIZZES = 50
+REQUESTS = 200
+ENCODER_LEVELS = {
+    "gzip": [1, 6, 9],
+    "br": [1, 5, 11],
+    "zstd": [1, 3, 10],
+}
+
+def seed():
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Compressed", description="Benchmark course", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    db.bulk_insert_mappings(models.Lesson, [
+        {"title": f"Lesson {i}: wetlands, rivers and watersheds", "course_id": course.id,
+         **lesson_content.pack("Lesson content " * 200)}
+        for i in range(LESSONS)
+    ])
+    db.bulk_insert_mappings(models.Quiz, [
+        {"question": f"Which habitat stores the most carbon per hectare? ({i})", "option_a": "Peat bogs",
+         "option_b": "Grassland", "option_c": "Desert", "option_d": "Tundra", "correct_answer": "A",
+         "course_id": course.id}
+        for i in range(QUIZZES)
+    ])
+    db.bulk_insert_mappings(models.User, [
+        {"name": f"Student {i}", "email": f"student{i}@bench", "password": "pw", "role": "student"}
+        for i in range(STUDENTS)
+    ])
+    student_ids = [user_id for (user_id,) in db.query(models.User.id).filter(models.User.role == "student")]
+    db.bulk_insert_mappings(models.Enrollment, [
+        {"user_id": student_id, "course_id": course.id} for student_id in student_ids
+    ])
+    db.bulk_insert_mappings(models.StudentProgress, [
+        {"student_id": student_id, "course_id": course.id, "lesson_completed": True,
+         "quiz_score": student_id % 6, "quiz_total": 5, "quiz_attempts": 1}
+        for student_id in student_ids
+    ])
+    db.commit()
+    token = create_access_token(data={"sub": str(teacher.id)})
+    course_id = course.id
+    db.close()
+    return course_id, {"Authorization": f"Bearer {token}"}
+
+def cpu_ms(fn, body: bytes, repeat: int = 20):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(body)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best * 1000, 3)
+
+def request_ms(client, url, headers, clear_cache=False):
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        if clear_cache:
+            compression.compressed_cache.clear()
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.status_code
+    return round((time.perf_counter() - started) / REQUESTS * 1000, 3), int(response.headers["content-length"])
+
+def encoders():
+    found = []
+    for name, levels in ENCODER_LEVELS.items():
+        for level in levels:
+            try:
+                found.append((f"{name}-{level}", compression.ENCODERS[name](level)))
+            except ImportError:
+                break
+    return found
+
+def main_benchmark():
+    course_id, headers = seed()
+    client = TestClient(main.app)
+    urls = {
+        "progress": f"/progress/course/{course_id}?limit=500",
+        "enrollments": f"/enrollments/course/{course_id}?limit=500",
+        "lessons": f"/lessons/course/{course_id}",
+        "quizzes": f"/quizzes/course/{course_id}",
+        "catalog": "/courses/",
+    }
+    available = encoders()
+    negotiated = compression.available_encoders[0].name if compression.available_encoders else None
+    results = []
+    for name, url in urls.items():
+        body = client.get(url, headers={**headers, "Accept-Encoding": "identity"}).content
+        identity_ms, _ = request_ms(client, url, {**headers, "Accept-Encoding": "identity"})
+        result = {
+            "endpoint": name,
+            "body_bytes": len(body),
+            "compressed": len(body) >= compression.COMPRESSION_MIN_BYTES,
+            "identity_request_ms": identity_ms,
+            "encoders": {},
+        }
+        for label, encoder in available:
+            compressed = encoder.compress(body)
+            result["encoders"][label] = {
+                "bytes": len(compressed),
+                "saved_pct": round((1 - len(compressed) / len(body)) * 100, 1),
+                "compress_ms": cpu_ms(encoder.compress, body),
+            }
+        if negotiated:
+            encoder = compression.available_encoders[0]
+            encoded = {**headers, "Accept-Encoding": negotiated}
+            compression.compressed_cache.clear()
+            compression.compressed_cache.compress(encoder, body, True)
+            result["negotiated"] = negotiated
+            result["cache_hit_ms"] = cpu_ms(lambda data: compression.compressed_cache.compress(encoder, data, True), body)
+            result["uncached_request_ms"], result["wire_bytes"] = request_ms(client, url, encoded, clear_cache=True)
+            result["cached_request_ms"], _ = request_ms(client, url, encoded)
+        results.append(result)
+        print(json.dumps(result))
+    return results
+
+if __name__ == "__main__":
+    main_benchmark()
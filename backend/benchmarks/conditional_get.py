@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_etag.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from database import engine, SessionLocal
+from security import create_access_token
+import lesson_content
+import migrations
+import models
+import main
+
+LESSONS_PER_COURSE = 20
+CONTENT_SIZES = [1_000, 50_000, 500_000]
+REQUESTS = 200
+
+def seed():
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course_ids = {}
+    for size in CONTENT_SIZES:
+        course = models.Course(title=f"{size} byte lessons", description="Benchmark course", teacher_id=teacher.id)
+        db.add(course)
+        db.flush()
+        for i in range(LESSONS_PER_COURSE):
+            db.add(models.Lesson(title=f"Lesson {i}", course_id=course.id, **lesson_content.pack("x" * size)))
+        course_ids[size] = course.id
+    db.commit()
+    token = create_access_token(data={"sub": str(teacher.id)})
+    db.close()
+    return course_ids, {"Authorization": f"Bearer {token}"}
+
+def timed(client, url, headers, expected_status):
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = client.get(url, headers=headers)
+        assert response.status_code == expected_status, response.status_code
+    elapsed = time.perf_counter() - started
+    return round(elapsed / REQUESTS * 1000, 3), len(response.content)
+
+def main_benchmark():
+    course_ids, headers = seed()
+    client = TestClient(main.app)
+    results = []
+    for size, course_id in course_ids.items():
+        url = f"/lessons/course/{course_id}"
+        etag = client.get(url, headers=headers).headers["etag"]
+        full_ms, full_bytes = timed(client, url, headers, 200)
+        revalidate_ms, revalidate_bytes = timed(client, url, {**headers, "If-None-Match": etag}, 304)
+        result = {
+            "lesson_bytes": size,
+            "lessons": LESSONS_PER_COURSE,
+            "full_ms": full_ms,
+            "full_body_bytes": full_bytes,
+            "revalidate_ms": revalidate_ms,
+            "revalidate_body_bytes": revalidate_bytes,
+        }
+        results.append(result)
+        print(json.dumps(result))
+
+    fastest = min(result["revalidate_ms"] for result in results)
+    slowest = max(result["revalidate_ms"] for result in results)
+    print(json.dumps({"revalidate_ms_spread": round(slowest / fastest, 2)}))
+    return results
+
+if __name__ == "__main__":
+    main_benchmark()
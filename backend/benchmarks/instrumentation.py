@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_instrumentation.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["INSTRUMENTATION"] = "false"
+os.environ["SLOW_REQUEST_MS"] = "0"
+
+from fastapi.testclient import TestClient
+from database import engine, SessionLocal
+from security import create_access_token
+import instrumentation
+import lesson_content
+import migrations
+import models
+import main
+
+STUDENTS = 200
+LESSONS = 20
+REQUESTS = 300
+ROUNDS = 3
+
+def seed():
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Instrumented", description="Benchmark course", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    for i in range(LESSONS):
+        db.add(models.Lesson(title=f"Lesson {i}", course_id=course.id, **lesson_content.pack("x" * 500)))
+    for i in range(STUDENTS):
+        student = models.User(name=f"Student {i}", email=f"student{i}@bench", password="pw", role="student")
+        db.add(student)
+        db.flush()
+        db.add(models.StudentProgress(student_id=student.id, course_id=course.id, quiz_score=3, quiz_total=5))
+    db.commit()
+    token = create_access_token(data={"sub": str(teacher.id)})
+    course_id = course.id
+    db.close()
+    return course_id, {"Authorization": f"Bearer {token}"}
+
+def timed(client, urls, headers):
+    for url in urls:
+        for _ in range(50):
+            client.get(url, headers=headers)
+    results = {}
+    for url in urls:
+        best = None
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            for _ in range(REQUESTS):
+                response = client.get(url, headers=headers)
+                assert response.status_code == 200, response.status_code
+            elapsed = (time.perf_counter() - started) / REQUESTS * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        results[url] = round(best, 3)
+    return results
+
+def main_benchmark():
+    course_id, headers = seed()
+    urls = ["/health", f"/lessons/course/{course_id}", f"/progress/course/{course_id}?limit=100"]
+    client = TestClient(main.app)
+    disabled = timed(client, urls, headers)
+
+    main.app.middleware_stack = None
+    instrumentation.install(main.app)
+    client = TestClient(main.app)
+    enabled = timed(client, urls, headers)
+
+    results = []
+    for url in urls:
+        result = {
+            "url": url,
+            "disabled_ms": disabled[url],
+            "enabled_ms": enabled[url],
+            "overhead_ms": round(enabled[url] - disabled[url], 3),
+        }
+        results.append(result)
+        print(json.dumps(result))
+    return results
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,114 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_jobs.db")
+
+def seed(certificates_count: int):
+    import models
+    from database import SessionLocal
+
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Queued certificates", description="Benchmark course", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    db.bulk_insert_mappings(models.User, [
+        {"name": f"Student {i}", "email": f"student{i}@bench", "password": "pw", "role": "student"}
+        for i in range(certificates_count)
+    ])
+    student_ids = [user_id for (user_id,) in db.query(models.User.id).filter(models.User.role == "student")]
+    db.bulk_insert_mappings(models.StudentProgress, [
+        {"student_id": student_id, "course_id": course.id, "lesson_completed": True,
+         "quiz_score": 5, "quiz_total": 5, "quiz_attempts": 1, "certificate_earned": True}
+        for student_id in student_ids
+    ])
+    course_id = course.id
+    db.commit()
+    db.close()
+    return course_id, student_ids
+
+def enqueue_all(course_id: int, student_ids):
+    import certificates
+    from database import SessionLocal
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        for student_id in student_ids:
+            certificates.enqueue_certificate(db, student_id, course_id)
+            db.commit()
+    finally:
+        db.close()
+    return time.perf_counter() - started
+
+def counts():
+    from sqlalchemy import func
+    import models
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return {
+            "jobs": dict(db.query(models.Job.status, func.count()).group_by(models.Job.status).all()),
+            "certificates": db.query(func.count(models.Certificate.id)).scalar(),
+        }
+    finally:
+        db.close()
+
+def main_benchmark(certificates_count: int, concurrency: int):
+    import jobs
+    import migrations
+    from database import engine
+
+    migrations.upgrade(engine)
+    course_id, student_ids = seed(certificates_count)
+
+    enqueue_seconds = enqueue_all(course_id, student_ids)
+    started = time.perf_counter()
+    processed = jobs.work(concurrency, once=True)
+    drain_seconds = time.perf_counter() - started
+    after_drain = counts()
+
+    duplicate_seconds = enqueue_all(course_id, student_ids)
+    reprocessed = jobs.work(concurrency, once=True)
+    after_duplicates = counts()
+
+    result = {
+        "database": engine.dialect.name,
+        "certificates": certificates_count,
+        "concurrency": concurrency,
+        "enqueue_ms_per_job": round(enqueue_seconds / certificates_count * 1000, 3),
+        "processed": processed,
+        "drain_seconds": round(drain_seconds, 2),
+        "jobs_per_second": round(processed / drain_seconds, 1),
+        "after_drain": after_drain,
+        "duplicate_enqueue_ms_per_job": round(duplicate_seconds / certificates_count * 1000, 3),
+        "reprocessed": reprocessed,
+        "after_duplicates": after_duplicates,
+    }
+    print(json.dumps(result))
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Queue and drain certificate jobs")
+    parser.add_argument("--certificates", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--database-url", default=None, help="empty database to use instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        if os.path.exists(DB_PATH):
+            os.remove(DB_PATH)
+        os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+    main_benchmark(args.certificates, args.concurrency)
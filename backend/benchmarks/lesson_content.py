@@ -0,0 +1,133 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_lesson_content.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from typing import List
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy.orm import undefer
+from database import engine, SessionLocal
+from security import create_access_token
+import lesson_content
+import migrations
+import models
+import schemas
+import search
+import main
+
+LESSONS = 200
+MIN_WORDS = 1_000
+MAX_WORDS = 12_000
+ROUNDS = 20
+
+WORDS = (
+    "soil water carbon forest river climate energy species habitat wetland ocean plant animal pollution "
+    "recycling compost solar wind erosion drought flood glacier coral reef pollinator insect bird mammal "
+    "the of and to in is that for with as on by this are from can be it an which their more"
+).split()
+
+def lesson_text(rng: random.Random):
+    words = rng.choices(WORDS, k=rng.randint(MIN_WORDS, MAX_WORDS))
+    return "\n\n".join(" ".join(words[i:i + 120]).capitalize() + "." for i in range(0, len(words), 120))
+
+def seed():
+    migrations.upgrade(engine)
+    rng = random.Random(22)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Long-form lessons", description="Benchmark course", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    db.bulk_insert_mappings(models.Lesson, [
+        {"title": f"Lesson {i}", "course_id": course.id, **lesson_content.pack(lesson_text(rng))}
+        for i in range(LESSONS)
+    ])
+    db.commit()
+    search.rebuild(db)
+    token = create_access_token(data={"sub": str(teacher.id)})
+    course_id = course.id
+    lesson_ids = [lesson_id for (lesson_id,) in db.query(models.Lesson.id).order_by(models.Lesson.id)]
+    db.close()
+    return course_id, lesson_ids, {"Authorization": f"Bearer {token}"}
+
+def storage():
+    db = SessionLocal()
+    try:
+        rows = db.query(models.Lesson).options(undefer(models.Lesson.content), undefer(models.Lesson.content_compressed)).all()
+        documents = db.query(models.SearchDocument).filter(models.SearchDocument.kind == "lesson").all()
+        return {
+            "content_bytes": sum(row.content_size for row in rows),
+            "stored_bytes": sum(len(row.content_compressed or row.content.encode()) for row in rows),
+            "search_document_bytes": sum(len(row.body_compressed or (row.body or "").encode()) for row in documents),
+            "compressed_lessons": sum(1 for row in rows if row.content_encoding),
+        }
+    finally:
+        db.close()
+
+def full_listing(course_id: int):
+    adapter = TypeAdapter(List[schemas.LessonResponse])
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        lessons = db.query(models.Lesson).filter(models.Lesson.course_id == course_id).order_by(models.Lesson.id).all()
+        body = adapter.dump_json([
+            schemas.LessonResponse(id=lesson.id, title=lesson.title, content=lesson.body, course_id=lesson.course_id)
+            for lesson in lessons
+        ])
+        return round((time.perf_counter() - started) * 1000, 3), len(body)
+    finally:
+        db.close()
+
+def timed(client, urls, headers, expected_status):
+    started = time.perf_counter()
+    transferred = 0
+    for url in urls:
+        response = client.get(url, headers=headers)
+        assert response.status_code == expected_status, (url, response.status_code)
+        transferred += int(response.headers["content-length"])
+    return round((time.perf_counter() - started) / len(urls) * 1000, 3), transferred // len(urls)
+
+def main_benchmark():
+    course_id, lesson_ids, headers = seed()
+    client = TestClient(main.app)
+    listing_url = f"/lessons/course/{course_id}"
+    content_urls = [f"/lessons/{lesson_id}/content" for lesson_id in lesson_ids]
+
+    full_ms, full_bytes = min(full_listing(course_id) for _ in range(3))
+    listing_ms, listing_bytes = timed(client, [listing_url] * ROUNDS, headers, 200)
+    identity_ms, identity_bytes = timed(client, content_urls, {**headers, "Accept-Encoding": "identity"}, 200)
+    gzip_ms, gzip_bytes = timed(client, content_urls, {**headers, "Accept-Encoding": "gzip"}, 200)
+    range_ms, range_bytes = timed(client, content_urls, {**headers, "Range": "bytes=0-4095"}, 206)
+
+    result = {
+        "lessons": LESSONS,
+        "storage": storage(),
+        "full_listing_with_content": {"ms": full_ms, "bytes": full_bytes},
+        "summary_listing": {"ms": listing_ms, "bytes": listing_bytes},
+        "one_lesson_identity": {"ms": identity_ms, "bytes": identity_bytes},
+        "one_lesson_gzip": {"ms": gzip_ms, "bytes": gzip_bytes},
+        "one_lesson_first_4k": {"ms": range_ms, "bytes": range_bytes},
+        "navigation_bytes": {
+            "before": full_bytes,
+            "after_identity": listing_bytes + identity_bytes,
+            "after_gzip": listing_bytes + gzip_bytes,
+        },
+    }
+    print(json.dumps(result, indent=2))
+    return result
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_login.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import httpx
+
+COST_SETTINGS = [
+    {"PASSWORD_HASHER": "scrypt", "SCRYPT_LOG_N": "14"},
+    {"PASSWORD_HASHER": "scrypt", "SCRYPT_LOG_N": "15"},
+    {"PASSWORD_HASHER": "bcrypt", "BCRYPT_ROUNDS": "10"},
+    {"PASSWORD_HASHER": "bcrypt", "BCRYPT_ROUNDS": "12"},
+    {"PASSWORD_HASHER": "argon2", "ARGON2_TIME_COST": "2", "ARGON2_MEMORY_COST": "19456"},
+    {"PASSWORD_HASHER": "argon2", "ARGON2_TIME_COST": "3", "ARGON2_MEMORY_COST": "65536"},
+]
+USERS = 200
+CONCURRENCY = 50
+LOGINS = 400
+PORT = 8767
+PASSWORD = "bench-password"
+
+def seed(setting: dict):
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    script = (
+        "from database import engine, SessionLocal\n"
+        "from passwords import make_hash\n"
+        "import migrations\n"
+        "import models\n"
+        "migrations.upgrade(engine)\n"
+        "db = SessionLocal()\n"
+        f"password_hash = make_hash({PASSWORD!r})\n"
+        f"for i in range({USERS}):\n"
+        "    db.add(models.User(name=f'Student {i}', email=f'student{i}@bench', password=password_hash, role='student'))\n"
+        "db.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, env=dict(os.environ, **setting), check=True)
+
+def start_server(setting: dict):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=dict(os.environ, **setting)
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/health")
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+async def run_logins():
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(LOGINS):
+        queue.put_nowait(f"student{i % USERS}@bench")
+
+    limits = httpx.Limits(max_connections=CONCURRENCY + 1, max_keepalive_connections=CONCURRENCY + 1)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                email = queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        async def probe(done: asyncio.Event):
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                health_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.02)
+
+        health_latencies = []
+        done = asyncio.Event()
+        prober = asyncio.create_task(probe(done))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    completed = len(latencies)
+    latencies = sorted(latencies) or [0.0]
+    return {
+        "logins": completed,
+        "errors": errors,
+        "logins_per_sec": round(completed / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000, 2),
+        "health_max_ms": round(max(health_latencies, default=0.0) * 1000, 2),
+    }
+
+def main():
+    results = []
+    for setting in COST_SETTINGS:
+        try:
+            seed(setting)
+        except subprocess.CalledProcessError:
+            print(json.dumps({"setting": setting, "skipped": "hasher not installed"}))
+            continue
+        proc = start_server(setting)
+        try:
+            result = asyncio.run(run_logins())
+        finally:
+            proc.terminate()
+            proc.wait()
+        result["setting"] = setting
+        results.append(result)
+        print(json.dumps(result))
+    return results
+
+if __name__ == "__main__":
+    main()
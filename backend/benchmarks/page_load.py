@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_pages.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import httpx
+
+COURSES = 60
+ENROLLED = 8
+QUESTIONS = 20
+STUDENTS = 50
+CONCURRENCY = 25
+PAGE_LOADS = 400
+PORT = 8768
+
+def seed():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    from database import engine, SessionLocal
+    from security import create_access_token
+    import migrations
+    import models
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    courses = []
+    for i in range(COURSES):
+        course = models.Course(title=f"Course {i}", description="Benchmark course", teacher_id=teacher.id)
+        db.add(course)
+        db.flush()
+        for q in range(QUESTIONS):
+            db.add(models.Quiz(
+                question=f"Question {q}", option_a="a", option_b="b", option_c="c", option_d="d",
+                correct_answer="A", course_id=course.id
+            ))
+        courses.append(course.id)
+    students = []
+    for i in range(STUDENTS):
+        student = models.User(name=f"Student {i}", email=f"student{i}@bench", password="pw", role="student")
+        db.add(student)
+        db.flush()
+        for course_id in courses[:ENROLLED]:
+            db.add(models.Enrollment(user_id=student.id, course_id=course_id))
+            db.add(models.StudentProgress(
+                student_id=student.id, course_id=course_id, quiz_score=QUESTIONS, quiz_total=QUESTIONS,
+                quiz_attempts=1, certificate_earned=True
+            ))
+        students.append((student.id, create_access_token(data={"sub": str(student.id)})))
+    db.commit()
+    db.close()
+    engine.dispose()
+    return courses[0], students
+
+def start_server():
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=dict(os.environ)
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/health")
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+async def fetch(client, url, headers):
+    response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return response
+
+async def fetch_all(client, url, headers):
+    cursor = None
+    while True:
+        page_url = f"{url}&limit=500" + (f"&cursor={cursor}" if cursor else "")
+        response = await fetch(client, page_url, headers)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return
+
+async def enrolled_fanout(client, student_id, course_id, headers):
+    await fetch(client, f"/enrollments/student/{student_id}", headers)
+    await fetch_all(client, "/courses/?show_inactive=true", headers)
+
+async def quiz_fanout(client, student_id, course_id, headers):
+    await asyncio.gather(
+        fetch(client, f"/quizzes/course/{course_id}", headers),
+        fetch(client, f"/courses/{course_id}", headers),
+        fetch(client, f"/progress/student/{student_id}", headers),
+    )
+
+async def certificate_fanout(client, student_id, course_id, headers):
+    await asyncio.gather(
+        fetch(client, f"/progress/student/{student_id}", headers),
+        fetch(client, f"/courses/{course_id}", headers),
+        fetch(client, f"/users/{student_id}", headers),
+    )
+
+async def enrolled_composite(client, student_id, course_id, headers):
+    await fetch(client, "/me/dashboard", headers)
+
+async def quiz_composite(client, student_id, course_id, headers):
+    await fetch(client, f"/courses/{course_id}/quiz-view", headers)
+
+async def certificate_composite(client, student_id, course_id, headers):
+    await fetch(client, f"/progress/certificate/{student_id}/{course_id}", headers)
+
+PAGES = {
+    "EnrolledCourses": (enrolled_fanout, enrolled_composite),
+    "Quiz": (quiz_fanout, quiz_composite),
+    "Certificate": (certificate_fanout, certificate_composite),
+}
+
+async def run_page(load, course_id, students):
+    latencies = []
+    limits = httpx.Limits(max_connections=CONCURRENCY * 3, max_keepalive_connections=CONCURRENCY * 3)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=60) as client:
+        async def worker(offset):
+            for i in range(offset, PAGE_LOADS, CONCURRENCY):
+                student_id, token = students[i % len(students)]
+                started = time.perf_counter()
+                await load(client, student_id, course_id, {"Authorization": f"Bearer {token}"})
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(offset) for offset in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "pages_per_sec": round(PAGE_LOADS / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000, 2),
+    }
+
+def main():
+    course_id, students = seed()
+    proc = start_server()
+    results = []
+    try:
+        for page, (fanout, composite) in PAGES.items():
+            for variant, load in (("fan-out", fanout), ("composite", composite)):
+                result = asyncio.run(run_page(load, course_id, students))
+                result.update(page=page, variant=variant)
+                results.append(result)
+                print(json.dumps(result))
+    finally:
+        proc.terminate()
+        proc.wait()
+    return results
+
+if __name__ == "__main__":
+    main()
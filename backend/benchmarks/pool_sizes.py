@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_pool.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import httpx
+
+POOL_SIZES = [1, 5, 20]
+CONCURRENCY = 100
+REQUESTS_PER_CLIENT = 5
+PORT = 8766
+
+def seed():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    from database import engine, SessionLocal
+    import migrations
+    import models
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    for i in range(50):
+        db.add(models.Course(title=f"Course {i}", description="Benchmark course", teacher_id=teacher.id))
+    db.commit()
+    db.close()
+    engine.dispose()
+
+def start_server(pool_size: int):
+    env = dict(os.environ, DB_POOL_SIZE=str(pool_size), DB_MAX_OVERFLOW="0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/health")
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+async def run_load():
+    latencies = []
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=60) as client:
+        async def worker():
+            for _ in range(REQUESTS_PER_CLIENT):
+                started = time.perf_counter()
+                response = await client.get("/courses/")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+        pool = (await client.get("/health/pool")).json()
+
+    latencies.sort()
+    return {
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "pool_wait": pool["wait_seconds"],
+    }
+
+def main():
+    seed()
+    for pool_size in POOL_SIZES:
+        proc = start_server(pool_size)
+        try:
+            result = asyncio.run(run_load())
+            result["pool_size"] = pool_size
+            print(json.dumps(result))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+if __name__ == "__main__":
+    main()
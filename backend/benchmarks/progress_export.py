@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_export.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import insert
+from database import engine, SessionLocal
+from exports import iter_progress_export
+import migrations
+import models
+
+SEED_BATCH = 50000
+
+def seed_course(db, title, students):
+    teacher = models.User(name=f"{title} Teacher", email=f"{title}@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title=title, description="Benchmark course", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+
+    for start in range(0, students, SEED_BATCH):
+        count = min(SEED_BATCH, students - start)
+        student_ids = db.scalars(
+            insert(models.User).returning(models.User.id, sort_by_parameter_order=True),
+            [
+                {"name": f"Student {start + i}", "email": f"{title}-{start + i}@bench", "password": "pw", "role": "student"}
+                for i in range(count)
+            ]
+        ).all()
+        db.execute(insert(models.StudentProgress), [
+            {"student_id": student_id, "course_id": course.id, "quiz_score": 8, "quiz_total": 10, "quiz_attempts": 1}
+            for student_id in student_ids
+        ])
+    db.commit()
+    return course.id
+
+def measure(course_id, export_format):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = 0
+    for chunk in iter_progress_export(course_id, export_format):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"bytes": size, "seconds": round(elapsed, 2), "peak_memory_kb": round(peak / 1024, 1)}
+
+def main(rows: int):
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    small_course = seed_course(db, "small", 10000)
+    large_course = seed_course(db, "large", rows)
+    db.close()
+
+    for export_format in ("csv", "jsonl"):
+        print(json.dumps({"format": export_format, "rows": 10000, **measure(small_course, export_format)}))
+        print(json.dumps({"format": export_format, "rows": rows, **measure(large_course, export_format)}))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,85 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_quiz.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from database import engine, SessionLocal
+from security import create_access_token
+from answer_keys import answer_key_cache
+import migrations
+import models
+import main
+
+QUESTIONS = 50
+STUDENTS_PER_RUN = 500
+
+def seed():
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Exam", description="Benchmark course", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    for i in range(QUESTIONS):
+        db.add(models.Quiz(
+            question=f"Question {i} " + "text " * 50,
+            option_a="a", option_b="b", option_c="c", option_d="d",
+            correct_answer="A", course_id=course.id
+        ))
+    tokens = {"cold": [], "cached": []}
+    for run in tokens:
+        for i in range(STUDENTS_PER_RUN):
+            student = models.User(name=f"{run} {i}", email=f"{run}{i}@bench", password="pw", role="student")
+            db.add(student)
+            db.flush()
+            db.add(models.Enrollment(user_id=student.id, course_id=course.id))
+            tokens[run].append(create_access_token(data={"sub": str(student.id)}))
+    db.commit()
+    quiz_ids = [quiz_id for (quiz_id,) in db.query(models.Quiz.id).filter(models.Quiz.course_id == course.id)]
+    db.close()
+    return course.id, quiz_ids, tokens
+
+def run(client, course_id, answers, tokens):
+    started = time.perf_counter()
+    for token in tokens:
+        response = client.post(
+            "/quizzes/submit",
+            json={"course_id": course_id, "answers": answers},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    return round(len(tokens) / elapsed, 1)
+
+def main_benchmark():
+    course_id, quiz_ids, tokens = seed()
+    answers = {str(quiz_id): "a" for quiz_id in quiz_ids}
+    client = TestClient(main.app)
+
+    ttl = answer_key_cache.ttl
+    answer_key_cache.ttl = 0
+    cold = run(client, course_id, answers, tokens["cold"])
+    answer_key_cache.ttl = ttl
+    cached = run(client, course_id, answers, tokens["cached"])
+
+    print(json.dumps({
+        "questions": QUESTIONS,
+        "submissions_per_run": STUDENTS_PER_RUN,
+        "uncached_submissions_per_sec": cold,
+        "cached_submissions_per_sec": cached,
+    }))
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,161 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_replicas.db")
+REPLICA_PATHS = [os.path.join(tempfile.gettempdir(), f"ecolearn_bench_replica_{i}.db") for i in (1, 2)]
+for path in [DB_PATH, *REPLICA_PATHS]:
+    if os.path.exists(path):
+        os.remove(path)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["DATABASE_REPLICA_URLS"] = ",".join(f"sqlite:///{path}" for path in REPLICA_PATHS)
+os.environ["REPLICA_MAX_LAG_SECONDS"] = "2"
+os.environ["REPLICA_CHECK_SECONDS"] = "0.2"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from database import engine, async_engine, SessionLocal, replica_set
+from security import create_access_token
+import lesson_content
+import migrations
+import models
+import replicas
+import sqlite_replica
+import main
+
+COURSES = 20
+LESSONS = 20
+QUIZZES = 10
+STUDENTS = 200
+REQUESTS = 400
+WRITE_FLOWS = 50
+REPLICATION_INTERVAL_SECONDS = 0.5
+
+def seed():
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    db.bulk_insert_mappings(models.Course, [
+        {"title": f"Course {i}", "description": "Benchmark course", "teacher_id": teacher.id} for i in range(COURSES)
+    ])
+    course_ids = [course_id for (course_id,) in db.query(models.Course.id)]
+    db.bulk_insert_mappings(models.Lesson, [
+        {"title": f"Lesson {i}", "course_id": course_id, **lesson_content.pack("Lesson content " * 50)}
+        for course_id in course_ids for i in range(LESSONS)
+    ])
+    db.bulk_insert_mappings(models.Quiz, [
+        {"question": f"Question {i}", "option_a": "A", "option_b": "B", "option_c": "C", "option_d": "D",
+         "correct_answer": "A", "course_id": course_id}
+        for course_id in course_ids for i in range(QUIZZES)
+    ])
+    db.bulk_insert_mappings(models.User, [
+        {"name": f"Student {i}", "email": f"student{i}@bench", "password": "pw", "role": "student"}
+        for i in range(STUDENTS)
+    ])
+    student_ids = [user_id for (user_id,) in db.query(models.User.id).filter(models.User.role == "student")]
+    db.bulk_insert_mappings(models.StudentProgress, [
+        {"student_id": student_id, "course_id": course_ids[0], "quiz_score": 3, "quiz_total": 5, "quiz_attempts": 1}
+        for student_id in student_ids
+    ])
+    db.commit()
+    token = create_access_token(data={"sub": str(teacher.id)})
+    db.close()
+    return course_ids, {"Authorization": f"Bearer {token}"}
+
+def count_statements():
+    counts = {"primary": 0, "replicas": 0}
+
+    def counter(name):
+        def count(conn, cursor, statement, parameters, context, executemany):
+            counts[name] += 1
+        return count
+
+    event.listen(engine, "before_cursor_execute", counter("primary"))
+    if async_engine is not None:
+        event.listen(async_engine.sync_engine, "before_cursor_execute", counter("primary"))
+    for replica in replica_set.replicas:
+        target = replica.async_engine.sync_engine if replica.async_engine is not None else replica.engine
+        event.listen(target, "before_cursor_execute", counter("replicas"))
+    return counts
+
+def replicate_until(stopped):
+    while not stopped.wait(REPLICATION_INTERVAL_SECONDS):
+        sqlite_replica.replicate(os.environ["DATABASE_URL"], REPLICA_PATHS)
+
+def wait_for_replicas(healthy):
+    while any(replica.available(0.0, time.time()) for replica in replica_set.replicas) != healthy:
+        time.sleep(0.05)
+
+def read_workload(client, urls, headers, counts):
+    counts["primary"] = counts["replicas"] = 0
+    started = time.perf_counter()
+    for i in range(REQUESTS):
+        response = client.get(urls[i % len(urls)], headers=headers)
+        assert response.status_code == 200, response.status_code
+    elapsed = time.perf_counter() - started
+    total = counts["primary"] + counts["replicas"]
+    return {
+        "ms_per_request": round(elapsed / REQUESTS * 1000, 3),
+        "primary_statements": counts["primary"],
+        "replica_statements": counts["replicas"],
+        "primary_share": round(counts["primary"] / total, 3) if total else None,
+    }
+
+def write_then_read(client, headers, send_last_write):
+    stale = 0
+    for i in range(WRITE_FLOWS):
+        created = client.post("/courses/", json={"title": f"Fresh {i}", "description": "d"}, headers=headers)
+        assert created.status_code == 201, created.text
+        read_headers = dict(headers)
+        if send_last_write:
+            read_headers["X-Last-Write"] = created.headers["X-Last-Write"]
+        response = client.get(f"/quizzes/course/{created.json()['id']}", headers=read_headers)
+        stale += response.status_code == 404
+    return {"flows": WRITE_FLOWS, "stale_reads": stale}
+
+def main_benchmark():
+    course_ids, headers = seed()
+    sqlite_replica.replicate(os.environ["DATABASE_URL"], REPLICA_PATHS)
+    counts = count_statements()
+    urls = [
+        path
+        for course_id in course_ids
+        for path in ("/courses/", f"/lessons/course/{course_id}", f"/quizzes/course/{course_id}",
+                     f"/progress/course/{course_id}?limit=200")
+    ]
+
+    stopped = threading.Event()
+    replicator = threading.Thread(target=replicate_until, args=(stopped,), daemon=True)
+    replicator.start()
+    with TestClient(main.app) as client:
+        wait_for_replicas(True)
+        routed = read_workload(client, urls, headers, counts)
+        routed_writes = write_then_read(client, headers, send_last_write=True)
+        unrouted_writes = write_then_read(client, headers, send_last_write=False)
+
+        stopped.set()
+        replicator.join()
+        wait_for_replicas(False)
+        lagging = read_workload(client, urls, headers, counts)
+
+    result = {
+        "replicas": len(replica_set.replicas),
+        "healthy_replicas": routed,
+        "lagging_replicas": lagging,
+        "write_then_read_with_last_write": routed_writes,
+        "write_then_read_without_last_write": unrouted_writes,
+        "routing": replica_set.stats(),
+    }
+    print(json.dumps(result, indent=2))
+    return result
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,143 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_search.db")
+
+TOPIC_WORDS = (
+    "soil water carbon forest river climate energy species habitat wetland ocean plant animal "
+    "pollution recycling compost solar wind erosion drought flood glacier coral reef pollinator "
+    "insect bird mammal fungus bacteria nitrogen phosphorus watershed aquifer estuary mangrove "
+    "savanna tundra prairie desert canopy understory biodiversity ecosystem succession predator "
+    "prey decomposition photosynthesis respiration emissions footprint renewable conservation"
+).split()
+VOCABULARY = TOPIC_WORDS + [f"term{rank}" for rank in range(len(TOPIC_WORDS), 20_000)]
+ZIPF_WEIGHTS = list(itertools.accumulate(1 / (rank + 10) for rank in range(len(VOCABULARY))))
+
+QUERIES = {
+    "most common term": "soil",
+    "common term": "biodiversity",
+    "mid-frequency term": "term500",
+    "rare term": "sphagnum",
+    "two terms": "carbon conservation",
+    "prefix": "photosyn",
+    "no match": "zeppelin",
+}
+
+def lesson_text(rng: random.Random, words: int):
+    return " ".join(rng.choices(VOCABULARY, cum_weights=ZIPF_WEIGHTS, k=words))
+
+def seed(lessons_count: int, courses_count: int):
+    import lesson_content
+    import models
+    import search
+    from database import SessionLocal
+
+    rng = random.Random(21)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    db.bulk_insert_mappings(models.Course, [
+        {"title": f"Course {i} {lesson_text(rng, 3)}", "description": lesson_text(rng, 40), "teacher_id": teacher.id}
+        for i in range(courses_count)
+    ])
+    course_ids = [course_id for (course_id,) in db.query(models.Course.id)]
+    rare = set(rng.sample(range(lessons_count), 25))
+    for start in range(0, lessons_count, 10_000):
+        db.bulk_insert_mappings(models.Lesson, [
+            {
+                "title": f"Lesson {i} {lesson_text(rng, 4)}",
+                "course_id": course_ids[i % courses_count],
+                **lesson_content.pack(lesson_text(rng, 200) + (" sphagnum peat" if i in rare else "")),
+            }
+            for i in range(start, min(start + 10_000, lessons_count))
+        ])
+    db.commit()
+    started = time.perf_counter()
+    documents = search.rebuild(db)
+    index_seconds = time.perf_counter() - started
+    teacher_id = teacher.id
+    db.close()
+    return teacher_id, documents, index_seconds
+
+def _match_count(db, query: str):
+    from sqlalchemy import text
+    import search
+
+    terms = search.query_terms(query)
+    if db.get_bind().dialect.name == "sqlite":
+        return db.execute(text("SELECT count(*) FROM search_index WHERE search_index MATCH :match"),
+                          {"match": search._sqlite_match(terms)}).scalar()
+    return db.execute(text("SELECT count(*) FROM search_documents WHERE document @@ to_tsquery('english', :query)"),
+                      {"query": search._postgresql_query(terms)}).scalar()
+
+def measure(teacher_id: int, rounds: int):
+    import models
+    import search
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user = db.get(models.User, teacher_id)
+        results = {}
+        for name, query in QUERIES.items():
+            search.search(db, query, user)
+            timings = []
+            hits = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                hits, next_cursor = search.search(db, query, user)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[name] = {
+                "query": query,
+                "matching_documents": _match_count(db, query),
+                "hits_on_page": len(hits),
+                "p50_ms": round(statistics.median(timings), 2),
+                "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 2),
+            }
+        return results
+    finally:
+        db.close()
+
+def main_benchmark(lessons_count: int, courses_count: int, rounds: int):
+    import migrations
+    from database import engine
+
+    migrations.upgrade(engine)
+    teacher_id, documents, index_seconds = seed(lessons_count, courses_count)
+    result = {
+        "database": engine.dialect.name,
+        "lessons": lessons_count,
+        "documents": documents,
+        "index_build_seconds": round(index_seconds, 2),
+        "queries": measure(teacher_id, rounds),
+    }
+    print(json.dumps(result, indent=2))
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time ranked full-text search over a seeded lesson corpus")
+    parser.add_argument("--lessons", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--database-url", default=None, help="empty database to use instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        if os.path.exists(DB_PATH):
+            os.remove(DB_PATH)
+        os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+    main_benchmark(args.lessons, args.courses, args.rounds)
@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_serialization.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from pydantic import TypeAdapter
+
+ROWS = 10000
+
+def seed():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    from database import engine, SessionLocal
+    import migrations
+    import models
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    db.bulk_insert_mappings(models.Course, [
+        {"title": f"Course {i}", "description": "Benchmark course", "teacher_id": teacher.id}
+        for i in range(ROWS)
+    ])
+    db.bulk_insert_mappings(models.User, [
+        {"name": f"Student {i}", "email": f"student{i}@bench", "password": "pw", "role": "student"}
+        for i in range(ROWS)
+    ])
+    db.flush()
+    course_id = db.query(models.Course.id).order_by(models.Course.id).first()[0]
+    student_ids = [user_id for (user_id,) in db.query(models.User.id).filter(models.User.role == "student")]
+    db.bulk_insert_mappings(models.Enrollment, [
+        {"user_id": student_id, "course_id": course_id} for student_id in student_ids
+    ])
+    db.bulk_insert_mappings(models.StudentProgress, [
+        {"student_id": student_id, "course_id": course_id, "lesson_completed": True,
+         "quiz_score": 4, "quiz_total": 5, "quiz_attempts": 1, "certificate_earned": True}
+        for student_id in student_ids
+    ])
+    db.commit()
+    return db, course_id
+
+def run(name, rows, schema):
+    from serialization import RowSerializer
+
+    adapter = TypeAdapter(List[schema])
+    serializer = RowSerializer(schema)
+
+    def per_row_models():
+        return adapter.dump_json(adapter.validate_python([schema(**row._mapping) for row in rows]))
+
+    def row_serializer():
+        return serializer.dump(rows)
+
+    assert per_row_models() == row_serializer()
+    results = []
+    for path, dump in (("per-row models", per_row_models), ("row serializer", row_serializer)):
+        seconds = min(timeit.repeat(dump, number=1, repeat=5))
+        results.append({"listing": name, "rows": len(rows), "path": path, "ms": round(seconds * 1000, 2)})
+    return results
+
+def main():
+    db, course_id = seed()
+    import queries
+    import schemas
+
+    listings = [
+        ("courses", queries.list_courses(db, show_inactive=True)[0], schemas.CourseResponse),
+        ("course progress", queries.list_progress(db, course_id=course_id)[0], schemas.ProgressResponse),
+        ("course enrollments", queries.list_enrollments(db, course_id=course_id)[0], schemas.EnrollmentResponse),
+        ("users", queries.list_users(db, role="student")[0], schemas.UserResponse),
+    ]
+    results = []
+    for name, rows, schema in listings:
+        for result in run(name, rows, schema):
+            results.append(result)
+            print(json.dumps(result))
+    db.close()
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_serve.db")
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+COURSES = 20
+LESSONS = 20
+QUIZZES = 10
+
+def seed():
+    from database import SessionLocal, engine
+    from security import create_access_token
+    import lesson_content
+    import migrations
+    import models
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    teacher = models.User(name="Bench Teacher", email="teacher@bench", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    db.bulk_insert_mappings(models.Course, [
+        {"title": f"Course {i}", "description": "Benchmark course", "teacher_id": teacher.id} for i in range(COURSES)
+    ])
+    course_ids = [course_id for (course_id,) in db.query(models.Course.id)]
+    db.bulk_insert_mappings(models.Lesson, [
+        {"title": f"Lesson {i}", "course_id": course_id, **lesson_content.pack("Lesson content " * 50)}
+        for course_id in course_ids for i in range(LESSONS)
+    ])
+    db.bulk_insert_mappings(models.Quiz, [
+        {"question": f"Question {i}", "option_a": "A", "option_b": "B", "option_c": "C", "option_d": "D",
+         "correct_answer": "A", "course_id": course_id}
+        for course_id in course_ids for i in range(QUIZZES)
+    ])
+    db.commit()
+    token = create_access_token(data={"sub": str(teacher.id)})
+    db.close()
+    return course_ids, {"Authorization": f"Bearer {token}"}
+
+def start(command, port):
+    proc = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    started = time.perf_counter()
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{' '.join(command)} exited with {proc.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return proc, time.perf_counter() - started
+        except OSError:
+            time.sleep(0.01)
+
+def stop(proc):
+    started = time.perf_counter()
+    proc.terminate()
+    proc.wait(timeout=60)
+    return time.perf_counter() - started
+
+def timed_get(port, url, headers):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    started = time.perf_counter()
+    connection.request("GET", url, headers=headers)
+    response = connection.getresponse()
+    response.read()
+    assert response.status == 200, (url, response.status)
+    return round((time.perf_counter() - started) * 1000, 2)
+
+def commands(port, workers):
+    return {
+        "uvicorn": [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+                    "--workers", str(workers), "--log-level", "warning"],
+        "serve": [sys.executable, "serve.py", "--port", str(port), "--workers", str(workers),
+                  "--log-level", "warning"],
+    }
+
+def startup(args, urls, headers):
+    results = {}
+    for name, command in commands(args.port, args.startup_workers).items():
+        runs = []
+        for _ in range(args.rounds):
+            proc, ready = start(command, args.port)
+            first = {label: timed_get(args.port, url, headers) for label, url in urls.items()}
+            drained = stop(proc)
+            runs.append({"ready_s": round(ready, 3), "first_request_ms": first, "stop_s": round(drained, 3)})
+        results[name] = min(runs, key=lambda run: run["ready_s"])
+    return results
+
+def client(port, urls, headers, deadline, queue):
+    latencies = []
+    errors = 0
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    index = os.getpid()
+    while time.perf_counter() < deadline:
+        url = urls[index % len(urls)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            connection.request("GET", url, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    queue.put((latencies, errors))
+
+def throughput(args, urls, headers):
+    results = []
+    context = multiprocessing.get_context("fork")
+    for workers in args.workers:
+        proc, _ = start(commands(args.port, workers)["serve"], args.port)
+        for url in urls:
+            timed_get(args.port, url, headers)
+        queue = context.Queue()
+        deadline = time.perf_counter() + args.duration
+        clients = [
+            context.Process(target=client, args=(args.port, urls, headers, deadline, queue))
+            for _ in range(args.concurrency)
+        ]
+        started = time.perf_counter()
+        for process in clients:
+            process.start()
+        latencies, errors = [], 0
+        for _ in clients:
+            samples, failed = queue.get()
+            latencies.extend(samples)
+            errors += failed
+        elapsed = time.perf_counter() - started
+        for process in clients:
+            process.join()
+        stop(proc)
+
+        latencies.sort()
+        result = {
+            "workers": workers,
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+            "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else None,
+        }
+        results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure serve.py startup and throughput scaling across worker counts")
+    parser.add_argument("--workers", default="1,2,4,8", help="worker counts for the throughput runs")
+    parser.add_argument("--startup-workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3, help="startup runs per server, best is reported")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load per worker count")
+    parser.add_argument("--concurrency", type=int, default=32, help="client processes with one keep-alive connection each")
+    parser.add_argument("--port", type=int, default=8771)
+    args = parser.parse_args()
+    args.workers = [int(count) for count in args.workers.split(",")]
+
+    course_ids, headers = seed()
+    course_id = course_ids[0]
+    first_urls = {"health": "/health", "catalog": "/courses/", "lessons": f"/lessons/course/{course_id}"}
+    load_urls = [
+        path
+        for course_id in course_ids
+        for path in ("/courses/", f"/lessons/course/{course_id}", f"/quizzes/course/{course_id}")
+    ]
+
+    report = {
+        "cpu_count": os.cpu_count(),
+        "startup": startup(args, first_urls, headers),
+        "throughput": throughput(args, load_urls, headers),
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "ecolearn_bench_suite.db")
+PASSWORD = "bench-password"
+SCENARIOS = ["login_storm", "dashboard", "exam_window", "teacher_progress", "mixed"]
+MIXED_WEIGHTS = {"login_storm": 1, "dashboard": 5, "exam_window": 3, "teacher_progress": 1}
+MAX_QUIZ_ATTEMPTS = 2
+
+query_count = contextvars.ContextVar("query_count", default=None)
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+def instrumented_app():
+    from sqlalchemy import event
+    import database
+    import main
+
+    event.listen(database.engine, "before_cursor_execute", _count_query)
+    if database.async_engine is not None:
+        event.listen(database.async_engine.sync_engine, "before_cursor_execute", _count_query)
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return await main.app(scope, receive, send)
+
+        counter = [0]
+        token = query_count.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-query-count", str(counter[0]).encode())
+                ]
+            await send(message)
+
+        try:
+            await main.app(scope, receive, send_with_count)
+        finally:
+            query_count.reset(token)
+
+    return app
+
+def seed(args):
+    from database import SessionLocal, engine
+    from passwords import make_hash
+    from security import create_access_token
+    import migrations
+    import lesson_content
+    import models
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    if db.query(models.User.id).first() is not None:
+        db.close()
+        raise SystemExit("The benchmark database must be empty")
+
+    password = make_hash(PASSWORD)
+    db.bulk_insert_mappings(models.User, [
+        {"name": f"Teacher {i}", "email": f"teacher{i}@bench", "password": password, "role": "teacher"}
+        for i in range(args.teachers)
+    ] + [
+        {"name": f"Student {i}", "email": f"student{i}@bench", "password": password, "role": "student"}
+        for i in range(args.students)
+    ])
+    users = db.query(models.User.id, models.User.email, models.User.role).order_by(models.User.id).all()
+    teacher_ids = [user.id for user in users if user.role == "teacher"]
+    students = [(user.id, user.email) for user in users if user.role == "student"]
+
+    db.bulk_insert_mappings(models.Course, [
+        {"title": f"Course {teacher_id}.{i}", "description": "Benchmark course " * 10, "teacher_id": teacher_id}
+        for teacher_id in teacher_ids for i in range(args.courses_per_teacher)
+    ])
+    courses = db.query(models.Course.id, models.Course.teacher_id).order_by(models.Course.id).all()
+    db.bulk_insert_mappings(models.Lesson, [
+        {"title": f"Lesson {i}", "course_id": course.id, **lesson_content.pack("Lesson content " * 200)}
+        for course in courses for i in range(args.lessons)
+    ])
+    db.bulk_insert_mappings(models.Quiz, [
+        {"question": f"Question {i} " + "text " * 30, "option_a": "a", "option_b": "b",
+         "option_c": "c", "option_d": "d", "correct_answer": "A", "course_id": course.id}
+        for course in courses for i in range(args.quizzes)
+    ])
+
+    rng = random.Random(args.seed)
+    exam_course_id = courses[0].id
+    enrollments = {}
+    for student_id, _ in students:
+        picked = {exam_course_id} | {
+            course.id for course in rng.sample(courses, min(args.enrollments_per_student, len(courses)))
+        }
+        enrollments[student_id] = sorted(picked)
+    db.bulk_insert_mappings(models.Enrollment, [
+        {"user_id": student_id, "course_id": course_id}
+        for student_id, course_ids in enrollments.items() for course_id in course_ids
+    ])
+    db.commit()
+
+    quiz_ids = [quiz_id for (quiz_id,) in db.query(models.Quiz.id).filter(
+        models.Quiz.course_id == exam_course_id
+    ).order_by(models.Quiz.id)]
+    db.close()
+    engine.dispose()
+
+    return {
+        "teachers": [
+            {"id": teacher_id, "token": create_access_token(data={"sub": str(teacher_id)}),
+             "courses": [course.id for course in courses if course.teacher_id == teacher_id]}
+            for teacher_id in teacher_ids
+        ],
+        "students": [
+            {"id": student_id, "email": email, "token": create_access_token(data={"sub": str(student_id)}),
+             "courses": enrollments[student_id]}
+            for student_id, email in students
+        ],
+        "exam_course_id": exam_course_id,
+        "exam_answers": {str(quiz_id): rng.choice("ABCD") for quiz_id in quiz_ids},
+    }
+
+class Recorder:
+    def __init__(self, client):
+        self.client = client
+        self.samples = {}
+
+    async def request(self, label, method, url, token=None, **kwargs):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+            ok = response.status_code < 400
+            queries = int(response.headers.get("x-query-count", 0))
+        except Exception:
+            ok, queries = False, 0
+        self.samples.setdefault(label, []).append((time.perf_counter() - started, ok, queries))
+
+async def login_storm(recorder, data, index, rng):
+    student = data["students"][index % len(data["students"])]
+    await recorder.request(
+        "POST /auth/login", "POST", "/auth/login",
+        json={"email": student["email"], "password": PASSWORD}
+    )
+
+async def dashboard(recorder, data, index, rng):
+    student = data["students"][index % len(data["students"])]
+    token = student["token"]
+    course_id = rng.choice(student["courses"])
+    await recorder.request("GET /me/dashboard", "GET", "/me/dashboard", token)
+    await asyncio.gather(
+        recorder.request("GET /courses/", "GET", "/courses/", token),
+        recorder.request(
+            "GET /enrollments/student/{id}", "GET", f"/enrollments/student/{student['id']}", token
+        ),
+    )
+    await asyncio.gather(
+        recorder.request("GET /lessons/course/{id}", "GET", f"/lessons/course/{course_id}", token),
+        recorder.request("GET /courses/{id}", "GET", f"/courses/{course_id}", token),
+    )
+    await recorder.request(
+        "GET /progress/student/{id}", "GET", f"/progress/student/{student['id']}", token
+    )
+
+async def exam_window(recorder, data, index, rng):
+    student = data["students"][index % len(data["students"])]
+    token = student["token"]
+    course_id = data["exam_course_id"]
+    await recorder.request("GET /courses/{id}/quiz-view", "GET", f"/courses/{course_id}/quiz-view", token)
+    await recorder.request(
+        "POST /quizzes/submit", "POST", "/quizzes/submit", token,
+        json={"course_id": course_id, "answers": data["exam_answers"]}
+    )
+
+async def teacher_progress(recorder, data, index, rng):
+    teacher = data["teachers"][index % len(data["teachers"])]
+    token = teacher["token"]
+    course_id = rng.choice(teacher["courses"])
+    await recorder.request(
+        "GET /courses/?teacher_id", "GET", f"/courses/?show_inactive=true&teacher_id={teacher['id']}", token
+    )
+    await asyncio.gather(
+        recorder.request(
+            "GET /progress/course/{id}", "GET", f"/progress/course/{course_id}?limit=50", token
+        ),
+        recorder.request(
+            "GET /progress/course/{id}/summary", "GET", f"/progress/course/{course_id}/summary", token
+        ),
+    )
+
+FLOWS = {
+    "login_storm": login_storm,
+    "dashboard": dashboard,
+    "exam_window": exam_window,
+    "teacher_progress": teacher_progress,
+}
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+def summarize(samples, elapsed):
+    endpoints = {}
+    for label, records in sorted(samples.items()):
+        latencies = sorted(latency for latency, _, _ in records)
+        endpoints[label] = {
+            "requests": len(records),
+            "errors": sum(1 for _, ok, _ in records if not ok),
+            "rps": round(len(records) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "queries_per_request": round(sum(queries for _, _, queries in records) / len(records), 2),
+        }
+    return endpoints
+
+async def run_scenario(client, name, data, args):
+    rng = random.Random(f"{args.seed}:{name}")
+    if name == "mixed":
+        names = list(MIXED_WEIGHTS)
+        plan = rng.choices(names, weights=[MIXED_WEIGHTS[flow] for flow in names], k=args.flows)
+    else:
+        plan = [name] * args.flows
+
+    flows_seen = {}
+    jobs = []
+    for flow in plan:
+        index = flows_seen.get(flow, 0)
+        flows_seen[flow] = index + 1
+        jobs.append((FLOWS[flow], index, random.Random(rng.random())))
+
+    recorder = Recorder(client)
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    async def worker():
+        while not queue.empty():
+            flow, index, flow_rng = queue.get_nowait()
+            await flow(recorder, data, index, flow_rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    endpoints = summarize(recorder.samples, elapsed)
+    requests = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "flows": len(jobs),
+        "requests": requests,
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "elapsed_s": round(elapsed, 3),
+        "flows_per_sec": round(len(jobs) / elapsed, 1),
+        "rps": round(requests / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+def start_server(port):
+    import httpx
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.suite:instrumented_app", "--factory",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=dict(os.environ)
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health")
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+async def run_all(args, data, base_url, transport=None):
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=120) as client:
+        for name in args.scenarios:
+            results[name] = await run_scenario(client, name, data, args)
+            print(json.dumps({"scenario": name, **{k: v for k, v in results[name].items() if k != "endpoints"}}),
+                  file=sys.stderr)
+    return results
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline, max_regression):
+    regressions = []
+    for name, scenario in report["scenarios"].items():
+        for label, current in scenario["endpoints"].items():
+            previous = baseline.get("scenarios", {}).get(name, {}).get("endpoints", {}).get(label)
+            if not previous:
+                continue
+            change = {"scenario": name, "endpoint": label}
+            for metric in ("p50_ms", "p99_ms", "rps", "queries_per_request"):
+                if previous[metric]:
+                    change[metric] = round((current[metric] - previous[metric]) / previous[metric] * 100, 1)
+            print(json.dumps(change), file=sys.stderr)
+            if max_regression is not None and (
+                change.get("p99_ms", 0) > max_regression or change.get("rps", 0) < -max_regression
+                or round(current["queries_per_request"]) > round(previous["queries_per_request"])
+            ):
+                regressions.append(change)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a database and drive realistic traffic mixes against the API")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--teachers", type=int, default=10)
+    parser.add_argument("--courses-per-teacher", type=int, default=5)
+    parser.add_argument("--lessons", type=int, default=10, help="lessons per course")
+    parser.add_argument("--quizzes", type=int, default=20, help="quiz questions per course")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--enrollments-per-student", type=int, default=4)
+    parser.add_argument("--flows", type=int, default=500, help="user flows per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--port", type=int, default=8769)
+    parser.add_argument("--database-url", default=None, help="empty database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", default=None, help="earlier JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="exit 1 if p99 or throughput regresses by more than this percentage, "
+                             "or queries per request increase")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    exam_scenarios = len({"exam_window", "mixed"} & set(args.scenarios))
+    if exam_scenarios:
+        args.flows = min(args.flows, args.students * MAX_QUIZ_ATTEMPTS // exam_scenarios)
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        if os.path.exists(DB_PATH):
+            os.remove(DB_PATH)
+        os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+    data = seed(args)
+
+    if args.mode == "uvicorn":
+        proc = start_server(args.port)
+        try:
+            scenarios = asyncio.run(run_all(args, data, f"http://127.0.0.1:{args.port}"))
+        finally:
+            proc.terminate()
+            proc.wait()
+    else:
+        import httpx
+        transport = httpx.ASGITransport(app=instrumented_app())
+        scenarios = asyncio.run(run_all(args, data, "http://bench", transport))
+
+    options = {key: value for key, value in vars(args).items() if key not in ("output", "compare", "max_regression")}
+    options.pop("database_url")
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": os.environ["DATABASE_URL"].split("://", 1)[0],
+            "async_db": os.environ.get("ASYNC_DB", "false"),
+            "options": options,
+        },
+        "scenarios": scenarios,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(report, json.load(handle), args.max_regression)
+        if regressions:
+            print(f"{len(regressions)} endpoint(s) regressed", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import json
+import os
+import sys
+import timeit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import security
+
+DISTINCT_TOKENS = 1000
+DECODES = 20000
+
+def run(tokens, cached: bool):
+    security.token_cache.clear()
+    decode = security.decode_access_token if cached else security._verify
+    for token in tokens:
+        decode(token)
+
+    def decode_all():
+        for i in range(DECODES):
+            decode(tokens[i % len(tokens)])
+
+    seconds = min(timeit.repeat(decode_all, number=1, repeat=3))
+    return {
+        "cache": cached,
+        "decodes": DECODES,
+        "us_per_decode": round(seconds / DECODES * 1e6, 2),
+        "decodes_per_sec": round(DECODES / seconds),
+    }
+
+def main():
+    tokens = [
+        security.create_access_token(data={"sub": str(i), "role": "student", "name": f"Student {i}"})
+        for i in range(DISTINCT_TOKENS)
+    ]
+    results = [run(tokens, cached=False), run(tokens, cached=True)]
+    for result in results:
+        print(json.dumps(result))
+    return results
+
+if __name__ == "__main__":
+    main()
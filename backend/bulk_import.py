@@ -0,0 +1,69 @@
+import codecs
+import csv
+import json
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+import schemas
+
+BULK_MAX_ROWS = 5000
+VALID_ANSWERS = ("A", "B", "C", "D")
+
+def check_batch_size(count: int):
+    if count > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch exceeds {BULK_MAX_ROWS} rows"
+        )
+
+def read_upload_rows(upload, item_schema):
+    filename = (upload.filename or "").lower()
+    lines = codecs.iterdecode(upload.file, "utf-8-sig")
+
+    if filename.endswith(".csv"):
+        records = csv.DictReader(lines)
+    elif filename.endswith((".jsonl", ".ndjson")):
+        records = (line for line in lines if line.strip())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload must be a .csv or .jsonl file"
+        )
+
+    items = []
+    for index, record in enumerate(records):
+        check_batch_size(index + 1)
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            items.append((index, item_schema.model_validate(record)))
+        except (ValueError, ValidationError) as exc:
+            items.append((index, _first_error(exc)))
+    return items
+
+def _first_error(exc):
+    if isinstance(exc, ValidationError):
+        error = exc.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return f"{location}: {error['msg']}" if location else error["msg"]
+    return str(exc)
+
+def insert_rows(db: Session, model, indexed_rows, results, after_insert=None):
+    if indexed_rows:
+        ids = db.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            [row for _, row in indexed_rows]
+        ).all()
+        for (index, _), row_id in zip(indexed_rows, ids):
+            results.append(schemas.BulkRowResult(index=index, status="created", id=row_id))
+        if after_insert is not None:
+            after_insert(db, [(row_id, row) for (_, row), row_id in zip(indexed_rows, ids)])
+    db.commit()
+
+    results.sort(key=lambda result: result.index)
+    created = len(indexed_rows)
+    return schemas.BulkResult(created=created, failed=len(results) - created, results=results)
+
+def row_error(index: int, detail: str):
+    return schemas.BulkRowResult(index=index, status="error", detail=detail)
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import time
+from urllib.parse import urlparse
+from cache import TTLCache
+from metrics import LatencyHistogram
+
+CATALOG_CACHE_BACKEND = os.environ.get("CATALOG_CACHE_BACKEND", "memory").lower()
+CATALOG_CACHE_URL = os.environ.get("CATALOG_CACHE_URL", "redis://127.0.0.1:6379/0")
+CATALOG_CACHE_TTL_SECONDS = float(os.environ.get("CATALOG_CACHE_TTL_SECONDS", "60"))
+CATALOG_CACHE_MAX_SIZE = int(os.environ.get("CATALOG_CACHE_MAX_SIZE", "1000"))
+
+logger = logging.getLogger(__name__)
+
+class CatalogPage:
+    def __init__(self, etag: str, next_cursor, body: bytes):
+        self.etag = etag
+        self.next_cursor = next_cursor
+        self.body = body
+
+    def pack(self):
+        return b"\n".join((self.etag.encode(), (self.next_cursor or "").encode(), self.body))
+
+    @classmethod
+    def unpack(cls, raw: bytes):
+        etag, next_cursor, body = raw.split(b"\n", 2)
+        return cls(etag.decode(), next_cursor.decode() or None, body)
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, maxsize=CATALOG_CACHE_MAX_SIZE, ttl=CATALOG_CACHE_TTL_SECONDS):
+        self.entries = TTLCache(maxsize, ttl)
+
+    async def get(self, key: str):
+        return self.entries.get(key)
+
+    async def set(self, key: str, page: CatalogPage):
+        self.entries.set(key, page)
+
+    async def clear(self):
+        self.entries.clear()
+
+class RespBackend:
+    name = "redis"
+    key_prefix = b"ecolearn:catalog:"
+    scan_count = b"1000"
+
+    def __init__(self, url=CATALOG_CACHE_URL, ttl=CATALOG_CACHE_TTL_SECONDS):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.ttl_ms = int(ttl * 1000)
+        self._connection = None
+        self._loop = None
+        self._lock = None
+
+    async def _connect(self):
+        if self._connection is None:
+            self._connection = await asyncio.open_connection(self.host, self.port)
+            if self.db:
+                await self._send(b"SELECT", str(self.db).encode())
+
+    async def _send(self, *parts: bytes):
+        reader, writer = self._connection
+        writer.write(b"*%d\r\n" % len(parts) + b"".join(b"$%d\r\n%s\r\n" % (len(part), part) for part in parts))
+        await writer.drain()
+        return await self._read_reply(reader)
+
+    async def _read_reply(self, reader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise RuntimeError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            return [await self._read_reply(reader) for _ in range(int(payload))]
+        raise RuntimeError(f"Unexpected reply from cache server: {line!r}")
+
+    async def command(self, *parts: bytes):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._connection = None
+        async with self._lock:
+            try:
+                await self._connect()
+                return await self._send(*parts)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError):
+                self._connection = None
+                raise
+
+    async def get(self, key: str):
+        raw = await self.command(b"GET", self.key_prefix + key.encode())
+        return CatalogPage.unpack(raw) if raw is not None else None
+
+    async def set(self, key: str, page: CatalogPage):
+        await self.command(b"SET", self.key_prefix + key.encode(), page.pack(), b"PX", str(self.ttl_ms).encode())
+
+    async def clear(self):
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.command(
+                b"SCAN", cursor, b"MATCH", self.key_prefix + b"*", b"COUNT", self.scan_count
+            )
+            if keys:
+                await self.command(b"DEL", *keys)
+            if cursor == b"0":
+                return
+
+class NullBackend:
+    name = "none"
+
+    async def get(self, key: str):
+        return None
+
+    async def set(self, key: str, page: CatalogPage):
+        pass
+
+    async def clear(self):
+        pass
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "redis": RespBackend,
+    "none": NullBackend,
+}
+
+class CatalogCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.rebuilds = 0
+        self.rebuild_seconds = LatencyHistogram()
+        self._generation = 0
+        self.invalidated_at = 0.0
+        self._flights = {}
+
+    def variant_key(self, version: int, show_inactive: bool, teacher_id, cursor, limit: int):
+        return f"{version}:{int(show_inactive)}:{teacher_id or ''}:{cursor or ''}:{limit}"
+
+    async def _lookup(self, key: str):
+        try:
+            return await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            logger.warning("Catalog cache lookup failed", exc_info=True)
+            return None
+
+    async def _store(self, key: str, page: CatalogPage, generation: int):
+        if generation != self._generation:
+            return
+        try:
+            await self.backend.set(key, page)
+        except Exception:
+            self.errors += 1
+            logger.warning("Catalog cache store failed", exc_info=True)
+
+    async def get_or_build(self, key: str, build):
+        page = await self._lookup(key)
+        if page is not None:
+            self.hits += 1
+            return page
+
+        self.misses += 1
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                return await self._build(key, build)
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # Only the builder's request went away, so this waiter takes over the build
+                if not flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+    async def _build(self, key: str, build):
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        generation = self._generation
+        started = time.perf_counter()
+        try:
+            page = await build()
+            self.rebuilds += 1
+            self.rebuild_seconds.observe(time.perf_counter() - started)
+            await self._store(key, page, generation)
+            flight.set_result(page)
+            return page
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            flight.exception()
+            raise
+        finally:
+            self._flights.pop(key, None)
+
+    async def invalidate(self):
+        self._generation += 1
+        self.invalidated_at = time.time()
+        try:
+            await self.backend.clear()
+        except Exception:
+            self.errors += 1
+            logger.warning("Catalog cache invalidation failed", exc_info=True)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "rebuilds": self.rebuilds,
+            "rebuild_seconds": self.rebuild_seconds.snapshot(),
+        }
+
+def build_backend(name: str = CATALOG_CACHE_BACKEND):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown CATALOG_CACHE_BACKEND {name!r}, expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
+
+catalog_cache = CatalogCache(build_backend())
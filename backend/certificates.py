@@ -0,0 +1,159 @@
+import hashlib
+import hmac
+import json
+import os
+import urllib.request
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.orm import Session
+import jobs
+import models
+from queries import insert_ignore
+from security import SECRET_KEY
+
+CERTIFICATE_SECRET = os.environ.get("CERTIFICATE_SECRET") or SECRET_KEY
+CERTIFICATE_WEBHOOK_URL = os.environ.get("CERTIFICATE_WEBHOOK_URL", "")
+CERTIFICATE_WEBHOOK_TIMEOUT_SECONDS = float(os.environ.get("CERTIFICATE_WEBHOOK_TIMEOUT_SECONDS", "5"))
+
+def idempotency_key(student_id: int, course_id: int):
+    return f"certificate:{student_id}:{course_id}"
+
+def enqueue_certificate(db: Session, student_id: int, course_id: int):
+    return jobs.enqueue(
+        db, "certificate", idempotency_key(student_id, course_id),
+        {"student_id": student_id, "course_id": course_id},
+        owner_id=student_id
+    )
+
+def remove_for(db: Session, student_id=None, course_ids=()):
+    # Certificates have no ORM cascade, so they are deleted before the student or courses they reference
+    db.execute(
+        delete(models.Certificate)
+        .where(or_(models.Certificate.student_id == student_id, models.Certificate.course_id.in_(course_ids)))
+        .execution_options(synchronize_session=False)
+    )
+
+HASHED_FIELDS = ("student_id", "course_id", "student_name", "course_title", "quiz_score", "quiz_total")
+
+def verification_hash(certificate: dict):
+    message = json.dumps(
+        [certificate[field] for field in HASHED_FIELDS] + [certificate["issued_at"].isoformat()],
+        separators=(",", ":")
+    )
+    return hmac.new(CERTIFICATE_SECRET.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+def _pdf_text(value: str):
+    text = value.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def render_pdf(certificate: dict):
+    score = certificate["quiz_score"]
+    total = certificate["quiz_total"]
+    percentage = round(score * 100 / total) if total else 0
+    lines = [
+        (28, 700, "Certificate of Completion"),
+        (14, 640, "This is to certify that"),
+        (22, 605, certificate["student_name"]),
+        (14, 570, "has successfully completed the course"),
+        (18, 535, f'"{certificate["course_title"]}"'),
+        (12, 490, f"Score: {score}/{total} ({percentage}%)"),
+        (12, 470, f"Issued: {certificate['issued_at']:%Y-%m-%d}"),
+        (10, 150, "EcoLearn Environmental Learning Management System"),
+        (8, 130, f"Verification: {certificate['verification_hash']}"),
+    ]
+    content = "\n".join(
+        f"BT /F1 {size} Tf 0 0 0 rg 1 0 0 1 {max(36, 306 - len(text) * size * 0.26):.0f} {y} Tm ({_pdf_text(text)}) Tj ET"
+        for size, y, text in lines
+    ).encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+@jobs.handler("certificate")
+def issue_certificate(db: Session, payload: dict):
+    student_id = payload["student_id"]
+    course_id = payload["course_id"]
+    row = db.query(
+        models.StudentProgress.quiz_score,
+        models.StudentProgress.quiz_total,
+        models.StudentProgress.certificate_earned,
+        models.Course.title.label("course_title"),
+        models.User.name.label("student_name"),
+        models.Certificate.id.label("certificate_id"),
+        models.Certificate.verification_hash
+    ).join(
+        models.Course, models.StudentProgress.course_id == models.Course.id
+    ).join(
+        models.User, models.StudentProgress.student_id == models.User.id
+    ).outerjoin(
+        models.Certificate,
+        and_(
+            models.Certificate.student_id == models.StudentProgress.student_id,
+            models.Certificate.course_id == models.StudentProgress.course_id
+        )
+    ).filter(
+        models.StudentProgress.student_id == student_id,
+        models.StudentProgress.course_id == course_id
+    ).first()
+    if row and row.certificate_id:
+        return {"certificate_id": row.certificate_id, "verification_hash": row.verification_hash}
+    if not row or not row.certificate_earned:
+        return {"skipped": "Certificate not earned"}
+
+    certificate = {
+        "student_id": student_id,
+        "course_id": course_id,
+        "student_name": row.student_name,
+        "course_title": row.course_title,
+        "quiz_score": row.quiz_score or 0,
+        "quiz_total": row.quiz_total or 0,
+        "issued_at": jobs.utcnow().replace(microsecond=0),
+    }
+    certificate["verification_hash"] = verification_hash(certificate)
+    certificate["pdf"] = render_pdf(certificate)
+    insert_ignore(db, models.Certificate, **certificate)
+    certificate_id, issued_hash = db.query(models.Certificate.id, models.Certificate.verification_hash).filter(
+        models.Certificate.student_id == student_id,
+        models.Certificate.course_id == course_id
+    ).one()
+
+    if CERTIFICATE_WEBHOOK_URL:
+        jobs.enqueue(
+            db, "certificate_notification", f"certificate-notification:{certificate_id}",
+            {
+                "certificate_id": certificate_id,
+                "student_id": student_id,
+                "course_id": course_id,
+                "verification_hash": issued_hash,
+            },
+            owner_id=student_id
+        )
+    return {"certificate_id": certificate_id, "verification_hash": issued_hash}
+
+@jobs.handler("certificate_notification")
+def notify_certificate(db: Session, payload: dict):
+    request = urllib.request.Request(
+        CERTIFICATE_WEBHOOK_URL,
+        data=json.dumps({"event": "certificate.issued", **payload}).encode(),
+        headers={
+            "Content-Type": "application/json",
+            "Idempotency-Key": f"certificate-notification:{payload['certificate_id']}",
+        },
+        method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=CERTIFICATE_WEBHOOK_TIMEOUT_SECONDS) as response:
+        return {"status": response.status}
@@ -0,0 +1,242 @@
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from cache import TTLCache
+
+COMPRESSION = os.environ.get("COMPRESSION", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_ENCODINGS = os.environ.get("COMPRESSION_ENCODINGS", "br,zstd,gzip")
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_ZSTD_LEVEL = int(os.environ.get("COMPRESSION_ZSTD_LEVEL", "3"))
+COMPRESSED_CACHE_MAX_SIZE = int(os.environ.get("COMPRESSED_CACHE_MAX_SIZE", "1000"))
+COMPRESSED_CACHE_TTL_SECONDS = float(os.environ.get("COMPRESSED_CACHE_TTL_SECONDS", "600"))
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+logger = logging.getLogger(__name__)
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level=COMPRESSION_GZIP_LEVEL):
+        self.level = level
+
+    def compress(self, body: bytes):
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    def stream(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality=COMPRESSION_BROTLI_QUALITY):
+        import brotli
+        self.brotli = brotli
+        self.quality = quality
+
+    def compress(self, body: bytes):
+        return self.brotli.compress(body, quality=self.quality)
+
+    def stream(self):
+        return _BrotliStream(self.brotli.Compressor(quality=self.quality))
+
+class _BrotliStream:
+    def __init__(self, compressor):
+        self.compressor = compressor
+
+    def compress(self, chunk: bytes):
+        return self.compressor.process(chunk)
+
+    def flush(self):
+        return self.compressor.finish()
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level=COMPRESSION_ZSTD_LEVEL):
+        import zstandard
+        self.zstandard = zstandard
+        self.level = level
+
+    def compress(self, body: bytes):
+        return self.zstandard.ZstdCompressor(level=self.level).compress(body)
+
+    def stream(self):
+        return self.zstandard.ZstdCompressor(level=self.level).compressobj()
+
+ENCODERS = {
+    "br": BrotliEncoder,
+    "zstd": ZstdEncoder,
+    "gzip": GzipEncoder,
+}
+
+def build_encoders(names: str = COMPRESSION_ENCODINGS):
+    encoders = []
+    for name in (name.strip().lower() for name in names.split(",")):
+        if not name:
+            continue
+        if name not in ENCODERS:
+            raise ValueError(f"Unknown compression encoding {name!r}, expected one of {', '.join(ENCODERS)}")
+        try:
+            encoders.append(ENCODERS[name]())
+        except ImportError:
+            logger.info("Response compression: %s is not installed, skipping it", name)
+    return encoders
+
+def accepted_encodings(accept_encoding: str):
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = params.strip().removeprefix("q=")
+        try:
+            accepted[name] = float(quality) if quality else 1.0
+        except ValueError:
+            accepted[name] = 0.0
+    return accepted
+
+def accepts_encoding(accept_encoding: str, encoding: str):
+    accepted = accepted_encodings(accept_encoding)
+    return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+def negotiate(accept_encoding: str, encoders):
+    accepted = accepted_encodings(accept_encoding)
+    best = None
+    best_quality = 0.0
+    for encoder in encoders:
+        quality = accepted.get(encoder.name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoder, quality
+    return best
+
+def _compressible(headers: Headers):
+    content_type = headers.get("content-type", "")
+    return (
+        content_type.startswith(COMPRESSIBLE_TYPES)
+        and "content-encoding" not in headers
+        and "no-transform" not in headers.get("cache-control", "")
+    )
+
+class CompressedBodyCache:
+    def __init__(self, maxsize=COMPRESSED_CACHE_MAX_SIZE, ttl=COMPRESSED_CACHE_TTL_SECONDS):
+        self.entries = TTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def compress(self, encoder, body: bytes, cacheable: bool):
+        key = None
+        if cacheable and self.entries.enabled:
+            key = (encoder.name, hashlib.blake2b(body, digest_size=16).digest())
+            compressed = self.entries.get(key)
+            if compressed is not None:
+                self._count(body, compressed)
+                return compressed
+        compressed = encoder.compress(body)
+        if key is not None:
+            self.entries.set(key, compressed)
+        self._count(body, compressed)
+        return compressed
+
+    def _count(self, body: bytes, compressed: bytes):
+        with self._lock:
+            self.bytes_in += len(body)
+            self.bytes_out += len(compressed)
+
+    def clear(self):
+        self.entries.clear()
+        with self._lock:
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    def stats(self):
+        with self._lock:
+            totals = {"bytes_in": self.bytes_in, "bytes_out": self.bytes_out}
+        return {**self.entries.stats(), **totals}
+
+available_encoders = build_encoders() if COMPRESSION else []
+compressed_cache = CompressedBodyCache()
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size=COMPRESSION_MIN_BYTES, encoders=None, cache=compressed_cache):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = available_encoders if encoders is None else encoders
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        encoder = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encoders)
+        start = None
+        stream = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, stream, passthrough
+            if passthrough:
+                return await send(message)
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] in (204, 206, 304) or not _compressible(headers):
+                    passthrough = True
+                    return await send(message)
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                if encoder is None:
+                    passthrough = True
+                    return await send(message)
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is None and not more_body:
+                if len(body) < self.minimum_size:
+                    await send(start)
+                    return await send(message)
+                headers = MutableHeaders(scope=start)
+                cacheable = (
+                    scope["method"] == "GET" and start["status"] == 200
+                    and "no-store" not in headers.get("cache-control", "")
+                )
+                compressed = self.cache.compress(encoder, body, cacheable)
+                _set_encoded_headers(headers, encoder.name)
+                headers["Content-Length"] = str(len(compressed))
+                await send(start)
+                return await send({"type": "http.response.body", "body": compressed})
+
+            if stream is None:
+                stream = encoder.stream()
+                headers = MutableHeaders(scope=start)
+                _set_encoded_headers(headers, encoder.name)
+                del headers["Content-Length"]
+                await send(start)
+            chunk = stream.compress(body)
+            if not more_body:
+                chunk += stream.flush()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+def _set_encoded_headers(headers: MutableHeaders, encoding: str):
+    headers["Content-Encoding"] = encoding
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+def install(app):
+    app.add_middleware(CompressionMiddleware)
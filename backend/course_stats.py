@@ -0,0 +1,147 @@
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+import models
+import schemas
+from queries import insert_ignore
+
+STAT_COLUMNS = (
+    "students",
+    "attempted",
+    "attempts_0",
+    "attempts_1",
+    "attempts_2_plus",
+    "percentage_bp_sum",
+    "passed",
+    "certificates",
+)
+
+PASS_PERCENTAGE = 80
+
+def contribution(progress):
+    if progress is None:
+        return dict.fromkeys(STAT_COLUMNS, 0)
+
+    attempts = progress.quiz_attempts or 0
+    score = progress.quiz_score or 0
+    total = progress.quiz_total or 0
+    scored = attempts > 0 and total > 0
+    return {
+        "students": 1,
+        "attempted": int(attempts > 0),
+        "attempts_0": int(attempts == 0),
+        "attempts_1": int(attempts == 1),
+        "attempts_2_plus": int(attempts >= 2),
+        "percentage_bp_sum": score * 10000 // total if scored else 0,
+        "passed": int(scored and score * 100 >= PASS_PERCENTAGE * total),
+        "certificates": int(bool(progress.certificate_earned)),
+    }
+
+def _delta_values(old, new):
+    return {
+        column: getattr(models.CourseStats, column) + (new[column] - old[column])
+        for column in STAT_COLUMNS
+        if new[column] != old[column]
+    }
+
+def apply_progress_change(db: Session, course_id: int, old, new):
+    values = _delta_values(old, new)
+    if not values:
+        return
+
+    statement = (
+        update(models.CourseStats)
+        .where(models.CourseStats.course_id == course_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(statement).rowcount == 0:
+        insert_ignore(db, models.CourseStats, course_id=course_id)
+        db.execute(statement)
+
+@event.listens_for(models.StudentProgress, "after_delete")
+def _remove_deleted_progress(mapper, connection, target):
+    values = _delta_values(contribution(target), contribution(None))
+    if values:
+        connection.execute(
+            update(models.CourseStats)
+            .where(models.CourseStats.course_id == target.course_id)
+            .values(**values)
+        )
+
+def summarize(course_id: int, stats):
+    counts = {column: getattr(stats, column) if stats else 0 for column in STAT_COLUMNS}
+    attempted = counts["attempted"]
+    return schemas.CourseSummary(
+        course_id=course_id,
+        students=counts["students"],
+        attempted=attempted,
+        average_percentage=round(counts["percentage_bp_sum"] / attempted / 100, 2) if attempted else 0.0,
+        pass_rate=round(counts["passed"] * 100 / attempted, 2) if attempted else 0.0,
+        passed=counts["passed"],
+        certificates=counts["certificates"],
+        attempt_distribution={
+            "0": counts["attempts_0"],
+            "1": counts["attempts_1"],
+            "2+": counts["attempts_2_plus"],
+        }
+    )
+
+def get_summary(db: Session, course_id: int):
+    return summarize(course_id, db.get(models.CourseStats, course_id))
+
+def recompute(db: Session, course_id: int = None):
+    query = db.query(
+        models.StudentProgress.course_id,
+        models.StudentProgress.quiz_attempts,
+        models.StudentProgress.quiz_score,
+        models.StudentProgress.quiz_total,
+        models.StudentProgress.certificate_earned
+    ).order_by(models.StudentProgress.course_id)
+    if course_id is not None:
+        query = query.filter(models.StudentProgress.course_id == course_id)
+
+    totals = {}
+    for row in query.yield_per(1000):
+        counts = totals.setdefault(row.course_id, dict.fromkeys(STAT_COLUMNS, 0))
+        for column, value in contribution(row).items():
+            counts[column] += value
+    return totals
+
+def rebuild(db: Session, course_id: int = None):
+    totals = recompute(db, course_id)
+    stale = db.query(models.CourseStats)
+    if course_id is not None:
+        stale = stale.filter(models.CourseStats.course_id == course_id)
+    stale.delete(synchronize_session=False)
+
+    if totals:
+        db.execute(
+            models.CourseStats.__table__.insert(),
+            [{"course_id": key, **counts} for key, counts in totals.items()]
+        )
+    db.commit()
+    return len(totals)
+
+def check(db: Session, course_id: int = None):
+    expected = recompute(db, course_id)
+    stored_query = db.query(models.CourseStats)
+    if course_id is not None:
+        stored_query = stored_query.filter(models.CourseStats.course_id == course_id)
+    stored = {
+        stats.course_id: {column: getattr(stats, column) for column in STAT_COLUMNS}
+        for stats in stored_query
+    }
+
+    empty = dict.fromkeys(STAT_COLUMNS, 0)
+    mismatches = {}
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, empty)
+        have = stored.get(key, empty)
+        diff = {
+            column: {"stored": have[column], "expected": want[column]}
+            for column in STAT_COLUMNS
+            if have[column] != want[column]
+        }
+        if diff:
+            mismatches[key] = diff
+    return mismatches
@@ -1,11 +1,12 @@
 import sys
 sys.path.insert(0, '.')
 
-from database import engine, Base
-from models import User, Course, Lesson, Quiz, Enrollment, StudentProgress
+from database import engine
+import migrations
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    for migration in migrations.upgrade(engine):
+        print(f"Applied {migration.version}: {migration.description}")
     print("All tables created successfully!")
 
 if __name__ == "__main__":
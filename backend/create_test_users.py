@@ -3,6 +3,7 @@ sys.path.insert(0, '.')
 
 from database import SessionLocal
 from models import User
+from passwords import make_hash
 
 def create_test_users():
     db = SessionLocal()
@@ -13,7 +14,7 @@ def create_test_users():
             teacher = User(
                 name="Test Teacher",
                 email="teacher@test.com",
-                password="password123",
+                password=make_hash("password123"),
                 role="teacher"
             )
             db.add(teacher)
@@ -26,7 +27,7 @@ def create_test_users():
             student = User(
                 name="Test Student",
                 email="student@test.com",
-                password="password123",
+                password=make_hash("password123"),
                 role="student"
             )
             db.add(student)
@@ -1,16 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, run_db
 from security import decode_access_token
+from user_cache import user_cache, cache_user
+import http_cache
 import models
+import schemas
 
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
     payload = decode_access_token(token)
     
@@ -20,23 +20,54 @@ def get_current_user(
             detail="Invalid or expired token"
         )
     
-    user_id = payload.get("sub")
-    if user_id is None:
+    if payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload"
         )
     
-    user = db.query(models.User).filter(models.User.id == int(user_id)).first()
+    return payload
+
+def _get_user(db: Session, user_id: int, cached_version):
+    # Other workers only bump the version, so a cached user is served only while it still matches
+    version = http_cache.current_version(db, http_cache.user_key(user_id))
+    user = None
+    if version != cached_version:
+        user = db.query(models.User).filter(models.User.id == user_id).first()
+    # Hand the connection back before the endpoint queues for a worker thread
+    db.close()
+    return version, user
+
+async def load_user(payload: dict, db):
+    user_id = int(payload["sub"])
+    cached = user_cache.get(user_id)
+    version, user = await run_db(db, _get_user, user_id, cached[0] if cached is not None else None)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    return user
+    return cache_user(user, version)
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db = Depends(get_db)
+):
+    return await load_user(payload, db)
+
+async def get_current_principal(
+    payload: dict = Depends(get_token_payload),
+    db = Depends(get_db)
+):
+    if "role" in payload and "name" in payload:
+        return schemas.TokenUser(id=int(payload["sub"]), name=payload["name"], role=payload["role"])
+    return await load_user(payload, db)
 
-def require_teacher(current_user = Depends(get_current_user)):
+async def require_teacher(current_user = Depends(get_current_principal)):
     if current_user.role != "teacher":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -44,7 +75,7 @@ def require_teacher(current_user = Depends(get_current_user)):
         )
     return current_user
 
-def require_student(current_user = Depends(get_current_user)):
+async def require_student(current_user = Depends(get_current_principal)):
     if current_user.role != "student":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
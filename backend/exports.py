@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+import os
+import database
+import models
+from queries import progress_listing_select
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+def progress_export_statement(course_id: int):
+    return progress_listing_select().where(
+        models.StudentProgress.course_id == course_id
+    ).order_by(models.StudentProgress.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+def _csv_chunk(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+def _jsonl_chunk(rows):
+    return "".join(json.dumps(dict(row._mapping)) + "\n" for row in rows)
+
+def _format_rows(rows, export_format: str):
+    if export_format == "csv":
+        return _csv_chunk(rows)
+    return _jsonl_chunk(rows)
+
+def iter_progress_export(course_id: int, export_format: str):
+    db = database.SessionLocal()
+    try:
+        result = db.execute(progress_export_statement(course_id))
+        if export_format == "csv":
+            yield _csv_chunk([list(result.keys())])
+        for rows in result.partitions():
+            yield _format_rows(rows, export_format)
+    finally:
+        db.close()
+
+async def aiter_progress_export(course_id: int, export_format: str):
+    async with database.AsyncSessionLocal() as db:
+        result = await db.stream(progress_export_statement(course_id))
+        if export_format == "csv":
+            yield _csv_chunk([list(result.keys())])
+        async for rows in result.partitions():
+            yield _format_rows(rows, export_format)
+
+def progress_export_stream(course_id: int, export_format: str):
+    if database.ASYNC_DB:
+        return aiter_progress_export(course_id, export_format)
+    return iter_progress_export(course_id, export_format)
@@ -0,0 +1,84 @@
+import hashlib
+import os
+from fastapi import Response, status
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+import models
+from queries import insert_ignore
+
+CATALOG_MAX_AGE_SECONDS = int(os.environ.get("CATALOG_MAX_AGE_SECONDS", "0"))
+
+PUBLIC = f"public, max-age={CATALOG_MAX_AGE_SECONDS}, must-revalidate"
+PRIVATE = "private, no-cache"
+
+CATALOG = "catalog"
+
+def course_key(course_id: int):
+    return f"course:{course_id}"
+
+def lessons_key(course_id: int):
+    return f"lessons:{course_id}"
+
+def quizzes_key(course_id: int):
+    return f"quizzes:{course_id}"
+
+def user_key(user_id: int):
+    return f"user:{user_id}"
+
+def course_keys(course_id: int):
+    return (course_key(course_id), lessons_key(course_id), quizzes_key(course_id))
+
+def bump(db: Session, *keys):
+    for key in keys:
+        statement = (
+            update(models.ResourceVersion)
+            .where(models.ResourceVersion.key == key)
+            .values(version=models.ResourceVersion.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if db.execute(statement).rowcount == 0:
+            if not insert_ignore(db, models.ResourceVersion, key=key, version=1):
+                db.execute(statement)
+
+def bump_connection(connection, *keys):
+    # For mapper events, which run inside a flush and only have the connection
+    table = models.ResourceVersion.__table__
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(connection.dialect.name)
+    for key in keys:
+        if dialect is not None:
+            connection.execute(dialect.insert(table).values(key=key, version=1).on_conflict_do_update(
+                index_elements=[table.c.key], set_={"version": table.c.version + 1}
+            ))
+        elif connection.execute(
+            update(table).where(table.c.key == key).values(version=table.c.version + 1)
+        ).rowcount == 0:
+            connection.execute(insert(table).values(key=key, version=1))
+
+def current_version(db: Session, key: str):
+    return db.query(models.ResourceVersion.version).filter(
+        models.ResourceVersion.key == key
+    ).scalar() or 0
+
+def version_etag(key: str, version: int, *variant):
+    digest = hashlib.sha256(":".join(str(part) for part in (key, version) + variant).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+def current_etag(db: Session, key: str, *variant):
+    return version_etag(key, current_version(db, key), *variant)
+
+def etag_matches(if_none_match: str, etag: str):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def set_cache_headers(response: Response, etag: str, cache_control: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+def not_modified(etag: str, cache_control: str):
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
@@ -0,0 +1,320 @@
+import contextvars
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from metrics import LatencyHistogram
+
+INSTRUMENTATION = os.environ.get("INSTRUMENTATION", "false").lower() in ("1", "true", "yes")
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "500"))
+PROFILE_SECRET = os.environ.get("PROFILE_SECRET", "")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+
+logger = logging.getLogger(__name__)
+
+current_request = contextvars.ContextVar("current_request", default=None)
+
+class RequestStats:
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.lazy_loads = {}
+        self.profiled = False
+
+    def server_timing(self, total_seconds: float):
+        return (
+            f'app;dur={total_seconds * 1000:.2f}, '
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statements} statements", '
+            f'db-slowest;dur={self.slowest_seconds * 1000:.2f}'
+        )
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.durations = {}
+        self.db_statements = {}
+        self.db_seconds = {}
+        self.lazy_loads = {}
+        self.statement_seconds = LatencyHistogram()
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            key = (method, route, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.durations.get((method, route))
+            if histogram is None:
+                histogram = self.durations[(method, route)] = LatencyHistogram()
+            self.db_statements[route] = self.db_statements.get(route, 0) + stats.statements
+            self.db_seconds[route] = self.db_seconds.get(route, 0.0) + stats.db_seconds
+            for relationship, count in stats.lazy_loads.items():
+                self.lazy_loads[relationship] = self.lazy_loads.get(relationship, 0) + count
+        histogram.observe(seconds)
+
+    def render(self):
+        from database import pool_stats, pool_wait_histogram
+
+        lines = []
+        with self._lock:
+            requests = dict(self.requests)
+            durations = dict(self.durations)
+            db_statements = dict(self.db_statements)
+            db_seconds = dict(self.db_seconds)
+            lazy_loads = dict(self.lazy_loads)
+
+        _counter(lines, "ecolearn_http_requests_total", "HTTP requests by route and status", {
+            (("method", method), ("route", route), ("status", status)): count
+            for (method, route, status), count in requests.items()
+        })
+        _histograms(lines, "ecolearn_http_request_duration_seconds", "Request wall time", {
+            (("method", method), ("route", route)): histogram for (method, route), histogram in durations.items()
+        })
+        _counter(lines, "ecolearn_db_statements_total", "SQL statements executed by route", {
+            (("route", route),): count for route, count in db_statements.items()
+        })
+        _counter(lines, "ecolearn_db_seconds_total", "Time spent executing SQL by route", {
+            (("route", route),): round(seconds, 6) for route, seconds in db_seconds.items()
+        })
+        _counter(lines, "ecolearn_orm_lazy_loads_total", "Lazy relationship loads by relationship", {
+            (("relationship", relationship),): count for relationship, count in lazy_loads.items()
+        })
+        _histograms(lines, "ecolearn_db_statement_duration_seconds", "SQL statement duration", {
+            (): self.statement_seconds
+        })
+        _histograms(lines, "ecolearn_db_pool_wait_seconds", "Connection pool checkout wait", {
+            (): pool_wait_histogram
+        })
+        pool = pool_stats()
+        if "checked_out" in pool:
+            lines.append("# HELP ecolearn_db_pool_checked_out Connections currently checked out")
+            lines.append("# TYPE ecolearn_db_pool_checked_out gauge")
+            lines.append(f"ecolearn_db_pool_checked_out {pool['checked_out']}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _counter(lines, name, help_text, values):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in sorted(values.items()):
+        lines.append(f"{name}{_labels(labels)} {value}")
+
+def _histograms(lines, name, help_text, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(histograms.items()):
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {snapshot['sum_seconds']}")
+        lines.append(f"{name}_count{_labels(labels)} {snapshot['count']}")
+
+registry = Registry()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is not None:
+        conn.info.setdefault("instrumentation_started", []).append(time.perf_counter())
+        if stats.profiled:
+            _claim_thread(stats)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is None:
+        return
+    started = conn.info.get("instrumentation_started")
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    stats.db_seconds += seconds
+    stats.statements += 1
+    if seconds >= stats.slowest_seconds:
+        stats.slowest_seconds = seconds
+        stats.slowest_statement = statement
+    registry.statement_seconds.observe(seconds)
+
+def _handle_error(context):
+    started = context.connection.info.get("instrumentation_started") if context.connection else None
+    if started:
+        started.pop()
+
+def _do_orm_execute(orm_execute_state):
+    stats = current_request.get()
+    if stats is not None and orm_execute_state.is_relationship_load:
+        path = orm_execute_state.loader_strategy_path
+        relationship = str(path[-1]) if path else "unknown"
+        stats.lazy_loads[relationship] = stats.lazy_loads.get(relationship, 0) + 1
+
+def instrument_engine(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+IDLE_FRAMES = {("threading.py", "wait"), ("queue.py", "get"), ("selectors.py", "select"), ("thread.py", "_worker")}
+
+# Bottom frame of a worker thread (or of an async-mode greenlet) -> the profiled request whose SQL it last ran
+_frame_owners = {}
+
+def _root_frame(frame):
+    while frame.f_back is not None:
+        frame = frame.f_back
+    return frame
+
+def _claim_thread(stats: RequestStats):
+    _frame_owners[_root_frame(sys._getframe())] = stats
+
+class Sampler:
+    def __init__(self, interval: float, stats: RequestStats, request_frame):
+        self.interval = interval
+        self.stats = stats
+        self.request_frame = request_frame
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self.stats.profiled = True
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        for root, owner in list(_frame_owners.items()):
+            if owner is self.stats:
+                _frame_owners.pop(root, None)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                in_request = False
+                while True:
+                    code = frame.f_code
+                    stack.append((os.path.basename(code.co_filename), code.co_name))
+                    in_request = in_request or frame is self.request_frame
+                    if frame.f_back is None:
+                        break
+                    frame = frame.f_back
+                owned = _frame_owners.get(frame) is self.stats
+                if stack[0] in IDLE_FRAMES:
+                    if owned:
+                        _frame_owners.pop(frame, None)
+                    continue
+                if not (in_request or owned):
+                    continue
+                folded = ";".join(f"{filename}:{name}" for filename, name in reversed(stack))
+                self.stacks[folded] = self.stacks.get(folded, 0) + 1
+
+    def report(self):
+        lines = [f"# {self.samples} samples every {self.interval * 1000:g} ms, folded stacks (count last)"]
+        for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+            lines.append(f"{stack} {count}")
+        return lines
+
+def _route_label(scope):
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        return scope["path"]
+    return "unmatched"
+
+def _profile_requested(scope):
+    if not PROFILE_SECRET:
+        return False
+    for name, value in scope.get("headers", []):
+        if name == b"x-profile":
+            return hmac.compare_digest(value.decode("latin-1"), PROFILE_SECRET)
+    return False
+
+class InstrumentationMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        sampler = None
+        if _profile_requested(scope):
+            sampler = Sampler(PROFILE_INTERVAL_MS / 1000, stats, sys._getframe())
+            sampler.start()
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+            if sampler is None:
+                await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            elapsed = time.perf_counter() - started
+            if sampler is not None:
+                await run_in_threadpool(sampler.stop)
+            route = _route_label(scope)
+            registry.observe_request(scope["method"], route, status_code, elapsed, stats)
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                logger.warning(
+                    "Slow request %s %s: %.1f ms, %d statements in %.1f ms, slowest %.1f ms: %s, lazy loads: %s",
+                    scope["method"], route, elapsed * 1000, stats.statements, stats.db_seconds * 1000,
+                    stats.slowest_seconds * 1000, stats.slowest_statement, stats.lazy_loads or "none"
+                )
+
+        if sampler is not None:
+            body = "\n".join([
+                f"# {scope['method']} {route} -> {status_code}",
+                f"# wall {elapsed * 1000:.2f} ms, db {stats.db_seconds * 1000:.2f} ms, {stats.statements} statements",
+                f"# slowest statement {stats.slowest_seconds * 1000:.2f} ms: {stats.slowest_statement}",
+                f"# lazy loads: {stats.lazy_loads or 'none'}",
+            ] + sampler.report()) + "\n"
+            response = Response(body, media_type="text/plain", headers={
+                "Server-Timing": stats.server_timing(elapsed),
+                "X-Profiled-Status": str(status_code),
+            })
+            await response(scope, receive, send)
+
+def metrics_endpoint():
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+def install(app):
+    from database import engine, async_engine, replica_set
+
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    for replica in replica_set.replicas:
+        instrument_engine(replica.engine)
+        if replica.async_engine is not None:
+            instrument_engine(replica.async_engine.sync_engine)
+    event.listen(Session, "do_orm_execute", _do_orm_execute)
+    app.add_middleware(InstrumentationMiddleware)
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
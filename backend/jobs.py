@@ -0,0 +1,204 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import database
+import models
+from queries import insert_ignore
+
+JOB_RUNNER = os.environ.get("JOB_RUNNER", "inprocess").lower()
+JOB_CONCURRENCY = int(os.environ.get("JOB_CONCURRENCY", "2"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.environ.get("JOB_RETRY_BASE_SECONDS", "2"))
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", "300"))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "1"))
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def enqueue(db: Session, kind: str, idempotency_key: str, payload: dict, owner_id=None):
+    now = utcnow()
+    insert_ignore(
+        db, models.Job,
+        kind=kind,
+        idempotency_key=idempotency_key,
+        payload=json.dumps(payload),
+        owner_id=owner_id,
+        status="queued",
+        attempts=0,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        available_at=now,
+        created_at=now
+    )
+    return db.query(models.Job.id).filter(models.Job.idempotency_key == idempotency_key).scalar()
+
+def disown(db: Session, owner_id: int):
+    # Job history outlives the user; a queued job for a removed user finds nothing to do and is skipped
+    db.execute(
+        update(models.Job).where(models.Job.owner_id == owner_id).values(owner_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+def claimable_ids(db: Session, limit: int):
+    return db.execute(
+        select(models.Job.id)
+        .where(
+            models.Job.status.in_(("queued", "running")),
+            models.Job.available_at <= utcnow()
+        )
+        .order_by(models.Job.available_at, models.Job.id)
+        .limit(limit)
+    ).scalars().all()
+
+def claim(db: Session, job_ids):
+    now = utcnow()
+    claimed = db.execute(
+        update(models.Job)
+        .where(
+            models.Job.id.in_(job_ids),
+            models.Job.status.in_(("queued", "running")),
+            models.Job.available_at <= now
+        )
+        .values(
+            status="running",
+            attempts=models.Job.attempts + 1,
+            available_at=now + timedelta(seconds=JOB_LEASE_SECONDS)
+        )
+        .returning(models.Job.id, models.Job.kind, models.Job.payload, models.Job.attempts, models.Job.max_attempts)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return claimed
+
+def claim_ready(limit: int):
+    db = database.SessionLocal()
+    try:
+        job_ids = claimable_ids(db, limit)
+        return claim(db, job_ids) if job_ids else []
+    finally:
+        db.close()
+
+def _finish(db: Session, job_id: int, **values):
+    db.execute(
+        update(models.Job).where(models.Job.id == job_id).values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+def run_job(job):
+    db = database.SessionLocal()
+    try:
+        fn = HANDLERS.get(job.kind)
+        try:
+            if fn is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            if job.attempts > job.max_attempts:
+                raise TimeoutError("Lease expired on the final attempt")
+            result = fn(db, json.loads(job.payload))
+        except Exception as exc:
+            db.rollback()
+            error = f"{type(exc).__name__}: {exc}"
+            if fn is None or job.attempts >= job.max_attempts:
+                logger.error("Job %s (%s) failed after %d attempts: %s", job.id, job.kind, job.attempts, error)
+                _finish(db, job.id, status="failed", last_error=error, finished_at=utcnow())
+            else:
+                logger.warning("Job %s (%s) attempt %d failed, retrying: %s", job.id, job.kind, job.attempts, error)
+                retry_at = utcnow() + timedelta(seconds=JOB_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+                _finish(db, job.id, status="queued", last_error=error, available_at=retry_at)
+            return False
+        db.flush()
+        _finish(db, job.id, status="succeeded", result=json.dumps(result), last_error=None, finished_at=utcnow())
+        return True
+    except Exception:
+        logger.exception("Job %s (%s) could not be recorded; it runs again when its lease expires", job.id, job.kind)
+        return False
+    finally:
+        db.close()
+
+def job_stats():
+    db = database.SessionLocal()
+    try:
+        counts = dict(db.query(models.Job.status, func.count()).group_by(models.Job.status).all())
+    finally:
+        db.close()
+    return {"runner": JOB_RUNNER, "concurrency": JOB_CONCURRENCY, "jobs": counts}
+
+def work(concurrency: int = JOB_CONCURRENCY, once: bool = False):
+    processed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            try:
+                claimed = claim_ready(concurrency * 4)
+            except Exception:
+                logger.exception("Claiming jobs failed")
+                claimed = None
+            if claimed:
+                processed += len(list(executor.map(run_job, claimed)))
+            elif once and claimed is not None:
+                return processed
+            else:
+                time.sleep(JOB_POLL_SECONDS)
+
+class JobRunner:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._loop = None
+        self._wake = None
+        self._task = None
+
+    def wake(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._loop = self._task = None
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run(job):
+            async with slots:
+                await run_in_threadpool(run_job, job)
+
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await run_in_threadpool(claim_ready, self.concurrency * 4)
+                if claimed:
+                    await asyncio.gather(*(run(job) for job in claimed))
+                    continue
+            except Exception:
+                logger.exception("Job runner poll failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+runner = JobRunner(JOB_CONCURRENCY)
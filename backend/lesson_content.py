@@ -0,0 +1,80 @@
+import gzip
+import hashlib
+import os
+
+LESSON_COMPRESSION = os.environ.get("LESSON_COMPRESSION", "gzip").lower()
+LESSON_COMPRESS_MIN_BYTES = int(os.environ.get("LESSON_COMPRESS_MIN_BYTES", "4096"))
+GZIP_LEVEL = int(os.environ.get("LESSON_GZIP_LEVEL", "6"))
+ZSTD_LEVEL = int(os.environ.get("LESSON_ZSTD_LEVEL", "10"))
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level=GZIP_LEVEL):
+        self.level = level
+
+    def compress(self, raw: bytes):
+        return gzip.compress(raw, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: bytes):
+        return gzip.decompress(data)
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level=ZSTD_LEVEL):
+        import zstandard
+        self.zstandard = zstandard
+        self.level = level
+
+    def compress(self, raw: bytes):
+        return self.zstandard.ZstdCompressor(level=self.level).compress(raw)
+
+    def decompress(self, data: bytes):
+        return self.zstandard.ZstdDecompressor().decompress(data)
+
+CODECS = {
+    "gzip": GzipCodec,
+    "zstd": ZstdCodec,
+}
+
+def build_codec(name: str = LESSON_COMPRESSION):
+    if name == "none":
+        return None
+    if name not in CODECS:
+        raise ValueError(f"Unknown LESSON_COMPRESSION {name!r}, expected none or one of {', '.join(CODECS)}")
+    return CODECS[name]()
+
+codec = build_codec()
+EMPTY_HASH = hashlib.sha256(b"").hexdigest()
+_other_codecs = {}
+
+def _codec_for(encoding: str):
+    if codec is not None and codec.name == encoding:
+        return codec
+    if encoding not in _other_codecs:
+        _other_codecs[encoding] = CODECS[encoding]()
+    return _other_codecs[encoding]
+
+def pack(text):
+    if text is None:
+        return {"content": None, "content_compressed": None, "content_encoding": None,
+                "content_size": 0, "content_hash": EMPTY_HASH}
+
+    raw = text.encode("utf-8")
+    values = {"content_size": len(raw), "content_hash": hashlib.sha256(raw).hexdigest()}
+    if codec is not None and len(raw) >= LESSON_COMPRESS_MIN_BYTES:
+        compressed = codec.compress(raw)
+        if len(compressed) < len(raw):
+            return {**values, "content": None, "content_compressed": compressed, "content_encoding": codec.name}
+    return {**values, "content": text, "content_compressed": None, "content_encoding": None}
+
+def raw_bytes(content, compressed, encoding):
+    if encoding:
+        return _codec_for(encoding).decompress(compressed)
+    return content.encode("utf-8") if content is not None else b""
+
+def unpack(content, compressed, encoding):
+    if encoding:
+        return raw_bytes(content, compressed, encoding).decode("utf-8")
+    return content
@@ -1,9 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from routers import auth, users, courses, lessons, quizzes, enrollments, progress
+from database import engine, pool_stats, replica_set
+import migrations
+from user_cache import user_cache
+from security import token_cache
+from catalog_cache import catalog_cache
+import compression
+import instrumentation
+import replicas
+from jobs import JOB_RUNNER, job_stats, runner as job_runner
+from routers import auth, users, courses, lessons, quizzes, enrollments, progress, me, jobs, search
 
-app = FastAPI(title="EcoLearn Environmental LMS", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if JOB_RUNNER == "inprocess":
+        await job_runner.start()
+    if replica_set.replicas:
+        await replicas.monitor.start()
+    yield
+    await replicas.monitor.stop()
+    await job_runner.stop()
+
+app = FastAPI(title="EcoLearn Environmental LMS", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,8 +31,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "X-Last-Write"],
 )
 
+if compression.COMPRESSION:
+    compression.install(app)
+
+if replica_set.replicas:
+    replicas.install(app)
+
+if instrumentation.INSTRUMENTATION:
+    instrumentation.install(app)
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(courses.router)
@@ -20,6 +50,9 @@ app.include_router(lessons.router)
 app.include_router(quizzes.router)
 app.include_router(enrollments.router)
 app.include_router(progress.router)
+app.include_router(me.router)
+app.include_router(jobs.router)
+app.include_router(search.router)
 
 @app.get("/")
 def root():
@@ -28,3 +61,39 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/pool")
+def database_pool_stats():
+    return pool_stats()
+
+@app.get("/health/replicas")
+def replica_stats():
+    return replica_set.stats()
+
+@app.get("/health/user-cache")
+def user_cache_stats():
+    return user_cache.stats()
+
+@app.get("/health/token-cache")
+def token_cache_stats():
+    return token_cache.stats()
+
+@app.get("/health/catalog-cache")
+def catalog_cache_stats():
+    return catalog_cache.stats()
+
+@app.get("/health/compression")
+def compression_stats():
+    return {
+        "enabled": compression.COMPRESSION,
+        "encodings": [encoder.name for encoder in compression.available_encoders],
+        "cache": compression.compressed_cache.stats(),
+    }
+
+@app.get("/health/migrations")
+def migration_status():
+    return migrations.status(engine)
+
+@app.get("/health/jobs")
+def job_queue_stats():
+    return job_stats()
@@ -0,0 +1,40 @@
+import sys
+sys.path.insert(0, '.')
+
+import argparse
+from database import engine
+import migrations
+
+def show_status():
+    state = migrations.status(engine)
+    print(f"current: {state['current']}  head: {state['head']}")
+    for version in state["pending"]:
+        print(f"pending: {version}")
+    return not state["pending"]
+
+def upgrade(target=None):
+    applied = migrations.upgrade(engine, target)
+    for migration in applied:
+        print(f"Applied {migration.version}: {migration.description}")
+    if not applied:
+        print("Database schema is up to date")
+
+def downgrade(target):
+    reverted = migrations.downgrade(engine, target)
+    for migration in reverted:
+        print(f"Reverted {migration.version}: {migration.description}")
+    if not reverted:
+        print("Nothing to revert")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply or revert versioned schema migrations")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=("upgrade", "downgrade", "status"))
+    parser.add_argument("--to", default=None, help="target version (downgrade defaults to 0000, an empty schema)")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        sys.exit(0 if show_status() else 1)
+    elif args.command == "downgrade":
+        downgrade(args.to or migrations.BASE)
+    else:
+        upgrade(args.to)
@@ -0,0 +1,162 @@
+import importlib.util
+import os
+import re
+from functools import lru_cache
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions")
+VERSION_FILE = re.compile(r"^(\d{4})_\w+\.py$")
+BASE = "0000"
+
+metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("version", String(20), primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+class Migration:
+    def __init__(self, version: str, path: str):
+        self.version = version
+        spec = importlib.util.spec_from_file_location(f"migrations.versions.v{version}", path)
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+        self.description = self.module.description
+
+    def upgrade(self, connection):
+        self.module.upgrade(connection)
+
+    def downgrade(self, connection):
+        self.module.downgrade(connection)
+
+@lru_cache(maxsize=None)
+def discover():
+    migrations = []
+    for name in sorted(os.listdir(VERSIONS_DIR)):
+        match = VERSION_FILE.match(name)
+        if match:
+            migrations.append(Migration(match.group(1), os.path.join(VERSIONS_DIR, name)))
+
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError("Two migrations share a version number")
+    return tuple(migrations)
+
+def head():
+    migrations = discover()
+    return migrations[-1].version if migrations else BASE
+
+def applied_versions(connection):
+    if not inspect(connection).has_table(schema_migrations.name):
+        return set()
+    return {version for (version,) in connection.execute(select(schema_migrations.c.version))}
+
+def _lock(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('ecolearn_schema_migrations'))"))
+
+def status(engine):
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+    return {
+        "current": max(applied, default=BASE),
+        "head": head(),
+        "pending": [migration.version for migration in discover() if migration.version not in applied],
+    }
+
+def upgrade(engine, target=None):
+    done = []
+    for migration in discover():
+        if target is not None and migration.version > target:
+            break
+        with engine.begin() as connection:
+            _lock(connection)
+            metadata.create_all(connection)
+            if migration.version in applied_versions(connection):
+                continue
+            migration.upgrade(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.now(timezone.utc).replace(tzinfo=None)
+            ))
+        done.append(migration)
+    return done
+
+def downgrade(engine, target=BASE):
+    done = []
+    for migration in reversed(discover()):
+        if migration.version <= target:
+            break
+        with engine.begin() as connection:
+            _lock(connection)
+            if migration.version not in applied_versions(connection):
+                continue
+            migration.downgrade(connection)
+            connection.execute(schema_migrations.delete().where(
+                schema_migrations.c.version == migration.version
+            ))
+        done.append(migration)
+    return done
+
+def has_index(connection, table: str, name: str):
+    inspector = inspect(connection)
+    return any(index["name"] == name for index in inspector.get_indexes(table)) or any(
+        constraint["name"] == name for constraint in inspector.get_unique_constraints(table)
+    )
+
+def create_index(connection, table: str, name: str, columns, unique=False):
+    if has_index(connection, table, name):
+        return False
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    connection.execute(text(f"CREATE {kind} {name} ON {table} ({', '.join(columns)})"))
+    return True
+
+def drop_index(connection, table: str, name: str):
+    if not has_index(connection, table, name):
+        return False
+    connection.execute(text(f"DROP INDEX {name}"))
+    return True
+
+def has_column(connection, table: str, name: str):
+    return any(column["name"] == name for column in inspect(connection).get_columns(table))
+
+def add_column(connection, table: str, column):
+    if has_column(connection, table, column.name):
+        return False
+    definition = f"{column.name} {column.type.compile(dialect=connection.dialect)}"
+    if column.server_default is not None:
+        definition += f" DEFAULT {column.server_default.arg}"
+    if not column.nullable:
+        definition += " NOT NULL"
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {definition}"))
+    return True
+
+def drop_column(connection, table: str, name: str):
+    if not has_column(connection, table, name):
+        return False
+    connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {name}"))
+    return True
+
+def create_unique(connection, table: str, name: str, columns):
+    inspector = inspect(connection)
+    existing = [constraint["column_names"] for constraint in inspector.get_unique_constraints(table)]
+    existing += [index["column_names"] for index in inspector.get_indexes(table) if index["unique"]]
+    if list(columns) in existing:
+        return False
+
+    column_list = ", ".join(columns)
+    duplicates = connection.execute(text(
+        f"SELECT COUNT(*) FROM (SELECT {column_list} FROM {table} "
+        f"GROUP BY {column_list} HAVING COUNT(*) > 1) AS duplicates"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot add {name}: {table} has {duplicates} duplicated ({column_list}) group(s). "
+            "Remove the duplicate rows and run the migration again."
+        )
+    return create_index(connection, table, name, columns, unique=True)
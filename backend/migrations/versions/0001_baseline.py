@@ -0,0 +1,104 @@
+from sqlalchemy import (
+    BigInteger, Boolean, Column, ForeignKey, Index, Integer, MetaData, String, Table, Text, UniqueConstraint
+)
+
+description = "Baseline schema"
+
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("name", String(100), nullable=False),
+    Column("email", String(100), unique=True, nullable=False, index=True),
+    Column("password", String(200), nullable=False),
+    Column("role", String(20), nullable=False),
+    Index("ix_users_role_id", "role", "id"),
+)
+
+Table(
+    "courses",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("title", String(150), nullable=False),
+    Column("description", Text, nullable=True),
+    Column("teacher_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("is_active", Boolean),
+    Index("ix_courses_is_active_id", "is_active", "id"),
+    Index("ix_courses_teacher_id_id", "teacher_id", "id"),
+)
+
+Table(
+    "lessons",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("title", String(150), nullable=False),
+    Column("content", Text, nullable=True),
+    Column("course_id", Integer, ForeignKey("courses.id"), nullable=False),
+)
+
+Table(
+    "quizzes",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("question", Text, nullable=False),
+    Column("option_a", String(200), nullable=False),
+    Column("option_b", String(200), nullable=False),
+    Column("option_c", String(200), nullable=False),
+    Column("option_d", String(200), nullable=False),
+    Column("correct_answer", String(10), nullable=False),
+    Column("course_id", Integer, ForeignKey("courses.id"), nullable=False),
+)
+
+Table(
+    "enrollments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("course_id", Integer, ForeignKey("courses.id"), nullable=False),
+    UniqueConstraint("user_id", "course_id", name="unique_enrollment"),
+    Index("ix_enrollments_course_id_id", "course_id", "id"),
+)
+
+Table(
+    "student_progress",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("student_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("course_id", Integer, ForeignKey("courses.id"), nullable=False),
+    Column("lesson_completed", Boolean),
+    Column("quiz_score", Integer),
+    Column("quiz_total", Integer),
+    Column("quiz_attempts", Integer),
+    Column("certificate_earned", Boolean),
+    UniqueConstraint("student_id", "course_id", name="unique_student_progress"),
+    Index("ix_student_progress_course_id_id", "course_id", "id"),
+)
+
+Table(
+    "course_stats",
+    metadata,
+    Column("course_id", Integer, ForeignKey("courses.id"), primary_key=True),
+    Column("students", Integer, nullable=False),
+    Column("attempted", Integer, nullable=False),
+    Column("attempts_0", Integer, nullable=False),
+    Column("attempts_1", Integer, nullable=False),
+    Column("attempts_2_plus", Integer, nullable=False),
+    Column("percentage_bp_sum", BigInteger, nullable=False),
+    Column("passed", Integer, nullable=False),
+    Column("certificates", Integer, nullable=False),
+)
+
+Table(
+    "resource_versions",
+    metadata,
+    Column("key", String(100), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+def upgrade(connection):
+    metadata.create_all(connection)
+
+def downgrade(connection):
+    metadata.drop_all(connection)
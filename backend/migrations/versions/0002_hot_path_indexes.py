@@ -0,0 +1,21 @@
+from migrations import create_index, create_unique, drop_index
+
+description = "Indexes and unique constraints for hot lookup paths"
+
+def upgrade(connection):
+    create_unique(connection, "enrollments", "unique_enrollment", ("user_id", "course_id"))
+    create_unique(connection, "student_progress", "unique_student_progress", ("student_id", "course_id"))
+    create_index(connection, "users", "ix_users_role_id", ("role", "id"))
+    create_index(connection, "courses", "ix_courses_is_active_id", ("is_active", "id"))
+    create_index(connection, "courses", "ix_courses_teacher_id_id", ("teacher_id", "id"))
+    create_index(connection, "enrollments", "ix_enrollments_course_id_id", ("course_id", "id"))
+    create_index(connection, "student_progress", "ix_student_progress_course_id_id", ("course_id", "id"))
+
+    create_index(connection, "courses", "ix_courses_teacher_id_is_active_id", ("teacher_id", "is_active", "id"))
+    create_index(connection, "lessons", "ix_lessons_course_id_id", ("course_id", "id"))
+    create_index(connection, "quizzes", "ix_quizzes_course_id_id", ("course_id", "id"))
+
+def downgrade(connection):
+    drop_index(connection, "quizzes", "ix_quizzes_course_id_id")
+    drop_index(connection, "lessons", "ix_lessons_course_id_id")
+    drop_index(connection, "courses", "ix_courses_teacher_id_is_active_id")
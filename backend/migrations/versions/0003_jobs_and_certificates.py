@@ -0,0 +1,53 @@
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, LargeBinary, MetaData, String, Table, Text, UniqueConstraint
+)
+
+description = "Background job queue and issued certificates"
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("courses", metadata, Column("id", Integer, primary_key=True))
+
+jobs = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("kind", String(50), nullable=False),
+    Column("idempotency_key", String(200), unique=True, nullable=False),
+    Column("payload", Text, nullable=False),
+    Column("owner_id", Integer, ForeignKey("users.id"), nullable=True),
+    Column("status", String(20), nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    Column("available_at", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("finished_at", DateTime, nullable=True),
+    Column("last_error", Text, nullable=True),
+    Column("result", Text, nullable=True),
+    Index("ix_jobs_status_available_at", "status", "available_at"),
+)
+
+certificates = Table(
+    "certificates",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("student_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("course_id", Integer, ForeignKey("courses.id"), nullable=False),
+    Column("student_name", String(100), nullable=False),
+    Column("course_title", String(150), nullable=False),
+    Column("quiz_score", Integer, nullable=False),
+    Column("quiz_total", Integer, nullable=False),
+    Column("issued_at", DateTime, nullable=False),
+    Column("verification_hash", String(64), unique=True, nullable=False),
+    Column("pdf", LargeBinary, nullable=False),
+    UniqueConstraint("student_id", "course_id", name="unique_certificate"),
+)
+
+def upgrade(connection):
+    jobs.create(connection, checkfirst=True)
+    certificates.create(connection, checkfirst=True)
+
+def downgrade(connection):
+    certificates.drop(connection, checkfirst=True)
+    jobs.drop(connection, checkfirst=True)
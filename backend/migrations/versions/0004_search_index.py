@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, Text, UniqueConstraint, text
+
+description = "Full-text search documents for courses and lessons"
+
+metadata = MetaData()
+
+search_documents = Table(
+    "search_documents",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True, autoincrement=True),
+    Column("kind", String(10), nullable=False),
+    Column("ref_id", Integer, nullable=False),
+    Column("course_id", Integer, nullable=False),
+    Column("title", String(150), nullable=False),
+    Column("body", Text, nullable=True),
+    UniqueConstraint("kind", "ref_id", name="unique_search_document"),
+    Index("ix_search_documents_course_id", "course_id"),
+)
+
+POSTGRESQL_UPGRADE = (
+    "ALTER TABLE search_documents ADD COLUMN document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED",
+    "CREATE INDEX ix_search_documents_document ON search_documents USING GIN (document)",
+)
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE search_index USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_index(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_index(search_index, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_index(search_index, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_index(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+)
+
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS search_documents_au",
+    "DROP TRIGGER IF EXISTS search_documents_ad",
+    "DROP TRIGGER IF EXISTS search_documents_ai",
+    "DROP TABLE IF EXISTS search_index",
+)
+
+BACKFILL = (
+    "INSERT INTO search_documents (kind, ref_id, course_id, title, body) "
+    "SELECT 'course', id, id, title, description FROM courses",
+    "INSERT INTO search_documents (kind, ref_id, course_id, title, body) "
+    "SELECT 'lesson', id, course_id, title, content FROM lessons",
+)
+
+def upgrade(connection):
+    search_documents.create(connection, checkfirst=True)
+    dialect = connection.dialect.name
+    statements = {"postgresql": POSTGRESQL_UPGRADE, "sqlite": SQLITE_UPGRADE}.get(dialect, ())
+    for statement in statements + BACKFILL:
+        connection.execute(text(statement))
+
+def downgrade(connection):
+    if connection.dialect.name == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            connection.execute(text(statement))
+    search_documents.drop(connection, checkfirst=True)
@@ -0,0 +1,73 @@
+import gzip
+import hashlib
+from sqlalchemy import Column, Integer, LargeBinary, MetaData, String, Table, Text, select, update
+from migrations import add_column, drop_column
+
+description = "Lesson content size, hash and compressed storage"
+
+COMPRESS_MIN_BYTES = 4096
+BATCH_SIZE = 500
+
+metadata = MetaData()
+
+lessons = Table(
+    "lessons",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("content", Text, nullable=True),
+    Column("content_compressed", LargeBinary, nullable=True),
+    Column("content_encoding", String(10), nullable=True),
+    Column("content_size", Integer, nullable=False, server_default="0"),
+    Column("content_hash", String(64), nullable=True),
+)
+
+NEW_COLUMNS = ("content_compressed", "content_encoding", "content_size", "content_hash")
+
+def _pack(text):
+    raw = text.encode("utf-8")
+    values = {"content_size": len(raw), "content_hash": hashlib.sha256(raw).hexdigest()}
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        compressed = gzip.compress(raw, compresslevel=6, mtime=0)
+        if len(compressed) < len(raw):
+            return {**values, "content": None, "content_compressed": compressed, "content_encoding": "gzip"}
+    return values
+
+def _decompress(data, encoding):
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def upgrade(connection):
+    for name in NEW_COLUMNS:
+        add_column(connection, "lessons", lessons.c[name])
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(lessons.c.id, lessons.c.content)
+            .where(lessons.c.id > last_id, lessons.c.content.is_not(None), lessons.c.content_hash.is_(None))
+            .order_by(lessons.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for lesson_id, content in rows:
+            connection.execute(update(lessons).where(lessons.c.id == lesson_id).values(**_pack(content)))
+        last_id = rows[-1].id
+
+def downgrade(connection):
+    while True:
+        rows = connection.execute(
+            select(lessons.c.id, lessons.c.content_compressed, lessons.c.content_encoding)
+            .where(lessons.c.content_encoding.is_not(None))
+            .order_by(lessons.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for lesson_id, compressed, encoding in rows:
+            connection.execute(
+                update(lessons).where(lessons.c.id == lesson_id)
+                .values(content=_decompress(compressed, encoding).decode("utf-8"), content_encoding=None)
+            )
+    for name in reversed(NEW_COLUMNS):
+        drop_column(connection, "lessons", name)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Float, Integer, MetaData, Table, insert
+
+description = "Heartbeat row for measuring read-replica lag"
+
+metadata = MetaData()
+
+replica_heartbeat = Table(
+    "replica_heartbeat",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("written_at", Float, nullable=False),
+)
+
+def upgrade(connection):
+    replica_heartbeat.create(connection, checkfirst=True)
+    connection.execute(insert(replica_heartbeat).values(id=1, written_at=0.0))
+
+def downgrade(connection):
+    replica_heartbeat.drop(connection, checkfirst=True)
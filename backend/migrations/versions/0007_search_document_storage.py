@@ -0,0 +1,137 @@
+import gzip
+from sqlalchemy import Column, Integer, LargeBinary, MetaData, String, Table, Text, select, text, update
+from migrations import add_column, drop_column
+
+description = "Store lesson search documents compressed, as the lessons themselves are"
+
+BATCH_SIZE = 500
+
+metadata = MetaData()
+
+search_documents = Table(
+    "search_documents",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("body", Text, nullable=True),
+    Column("body_compressed", LargeBinary, nullable=True),
+    Column("body_encoding", String(10), nullable=True),
+)
+
+NEW_COLUMNS = ("body_compressed", "body_encoding")
+
+COPY_LESSON_BODIES = (
+    "UPDATE search_documents SET body = lessons.content, body_compressed = lessons.content_compressed, "
+    "body_encoding = lessons.content_encoding FROM lessons "
+    "WHERE search_documents.kind = 'lesson' AND lessons.id = search_documents.ref_id"
+)
+
+DOCUMENT_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B')"
+)
+
+POSTGRESQL_UPGRADE = (
+    "ALTER TABLE search_documents DROP COLUMN document",
+    "ALTER TABLE search_documents ADD COLUMN document tsvector",
+    f"UPDATE search_documents SET document = {DOCUMENT_VECTOR}",
+    "CREATE INDEX ix_search_documents_document ON search_documents USING GIN (document)",
+)
+
+POSTGRESQL_DOWNGRADE = (
+    "ALTER TABLE search_documents DROP COLUMN document",
+    f"ALTER TABLE search_documents ADD COLUMN document tsvector GENERATED ALWAYS AS ({DOCUMENT_VECTOR}) STORED",
+    "CREATE INDEX ix_search_documents_document ON search_documents USING GIN (document)",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS search_documents_au",
+    "DROP TRIGGER IF EXISTS search_documents_ad",
+    "DROP TRIGGER IF EXISTS search_documents_ai",
+    "DROP TABLE IF EXISTS search_index",
+    "DROP VIEW IF EXISTS search_content",
+)
+
+# unpack_text is registered on every SQLite connection by database.register_sqlite_functions
+SQLITE_UPGRADE = (
+    "CREATE VIEW search_content AS "
+    "SELECT id, title, unpack_text(body, body_compressed, body_encoding) AS body FROM search_documents",
+    "CREATE VIRTUAL TABLE search_index USING fts5("
+    "title, body, content='search_content', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_index(rowid, title, body) "
+    "VALUES (new.id, new.title, unpack_text(new.body, new.body_compressed, new.body_encoding)); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_index(search_index, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, unpack_text(old.body, old.body_compressed, old.body_encoding)); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_index(search_index, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, unpack_text(old.body, old.body_compressed, old.body_encoding)); "
+    "INSERT INTO search_index(rowid, title, body) "
+    "VALUES (new.id, new.title, unpack_text(new.body, new.body_compressed, new.body_encoding)); END",
+    "INSERT INTO search_index(search_index) VALUES ('rebuild')",
+)
+
+SQLITE_DOWNGRADE = (
+    "CREATE VIRTUAL TABLE search_index USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_index(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_index(search_index, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_index(search_index, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_index(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "INSERT INTO search_index(search_index) VALUES ('rebuild')",
+)
+
+def _decompress(data, encoding):
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def upgrade(connection):
+    for name in NEW_COLUMNS:
+        add_column(connection, "search_documents", search_documents.c[name])
+
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRESQL_UPGRADE:
+            connection.execute(text(statement))
+        connection.execute(text(COPY_LESSON_BODIES))
+    elif dialect == "sqlite":
+        for statement in SQLITE_DROP:
+            connection.execute(text(statement))
+        connection.execute(text(COPY_LESSON_BODIES))
+        for statement in SQLITE_UPGRADE:
+            connection.execute(text(statement))
+    else:
+        connection.execute(text(COPY_LESSON_BODIES))
+
+def downgrade(connection):
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DROP:
+            connection.execute(text(statement))
+
+    while True:
+        rows = connection.execute(
+            select(search_documents.c.id, search_documents.c.body_compressed, search_documents.c.body_encoding)
+            .where(search_documents.c.body_encoding.is_not(None))
+            .order_by(search_documents.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for document_id, compressed, encoding in rows:
+            connection.execute(update(search_documents).where(search_documents.c.id == document_id).values(
+                body=_decompress(compressed, encoding).decode("utf-8"), body_compressed=None, body_encoding=None
+            ))
+
+    for name in reversed(NEW_COLUMNS):
+        drop_column(connection, "search_documents", name)
+    if dialect == "postgresql":
+        for statement in POSTGRESQL_DOWNGRADE:
+            connection.execute(text(statement))
+    elif dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            connection.execute(text(statement))
@@ -0,0 +1,27 @@
+import hashlib
+from sqlalchemy import Column, Integer, LargeBinary, MetaData, String, Table, Text, update
+
+description = "Hash empty lesson bodies"
+
+EMPTY_HASH = hashlib.sha256(b"").hexdigest()
+
+metadata = MetaData()
+
+lessons = Table(
+    "lessons",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("content", Text, nullable=True),
+    Column("content_compressed", LargeBinary, nullable=True),
+    Column("content_hash", String(64), nullable=True),
+)
+
+def upgrade(connection):
+    connection.execute(update(lessons).where(lessons.c.content_hash.is_(None)).values(content_hash=EMPTY_HASH))
+
+def downgrade(connection):
+    connection.execute(
+        update(lessons)
+        .where(lessons.c.content.is_(None), lessons.c.content_compressed.is_(None))
+        .values(content_hash=None)
+    )
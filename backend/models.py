@@ -1,6 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, BigInteger, Float, String, Text, Boolean, DateTime, LargeBinary, ForeignKey, UniqueConstraint,
+    Index
+)
+from sqlalchemy.orm import deferred, relationship
 from database import Base
+import lesson_content
 
 class User(Base):
     __tablename__ = "users"
@@ -11,6 +15,8 @@ class User(Base):
     password = Column(String(200), nullable=False)
     role = Column(String(20), nullable=False)
     
+    __table_args__ = (Index("ix_users_role_id", "role", "id"),)
+    
     courses = relationship("Course", back_populates="teacher", cascade="all, delete-orphan")
     enrollments = relationship("Enrollment", back_populates="user", cascade="all, delete-orphan")
     progress = relationship("StudentProgress", back_populates="student", cascade="all, delete-orphan")
@@ -24,21 +30,38 @@ class Course(Base):
     teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     is_active = Column(Boolean, default=True)
     
+    __table_args__ = (
+        Index("ix_courses_is_active_id", "is_active", "id"),
+        Index("ix_courses_teacher_id_id", "teacher_id", "id"),
+        Index("ix_courses_teacher_id_is_active_id", "teacher_id", "is_active", "id"),
+    )
+    
     teacher = relationship("User", back_populates="courses")
     lessons = relationship("Lesson", back_populates="course", cascade="all, delete-orphan")
     quizzes = relationship("Quiz", back_populates="course", cascade="all, delete-orphan")
     enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan")
     progress = relationship("StudentProgress", back_populates="course", cascade="all, delete-orphan")
+    stats = relationship("CourseStats", back_populates="course", uselist=False, cascade="all, delete-orphan")
 
 class Lesson(Base):
     __tablename__ = "lessons"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String(150), nullable=False)
-    content = Column(Text, nullable=True)
+    content = deferred(Column(Text, nullable=True))
+    content_compressed = deferred(Column(LargeBinary, nullable=True))
+    content_encoding = Column(String(10), nullable=True)
+    content_size = Column(Integer, nullable=False, default=0, server_default="0")
+    content_hash = Column(String(64), nullable=True)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
     
+    __table_args__ = (Index("ix_lessons_course_id_id", "course_id", "id"),)
+    
     course = relationship("Course", back_populates="lessons")
+    
+    @property
+    def body(self):
+        return lesson_content.unpack(self.content, self.content_compressed, self.content_encoding)
 
 class Quiz(Base):
     __tablename__ = "quizzes"
@@ -52,6 +75,8 @@ class Quiz(Base):
     correct_answer = Column(String(10), nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
     
+    __table_args__ = (Index("ix_quizzes_course_id_id", "course_id", "id"),)
+    
     course = relationship("Course", back_populates="quizzes")
 
 class Enrollment(Base):
@@ -61,7 +86,10 @@ class Enrollment(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
     
-    __table_args__ = (UniqueConstraint("user_id", "course_id", name="unique_enrollment"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "course_id", name="unique_enrollment"),
+        Index("ix_enrollments_course_id_id", "course_id", "id"),
+    )
     
     user = relationship("User", back_populates="enrollments")
     course = relationship("Course", back_populates="enrollments")
@@ -78,5 +106,89 @@ class StudentProgress(Base):
     quiz_attempts = Column(Integer, default=0)
     certificate_earned = Column(Boolean, default=False)
     
+    __table_args__ = (
+        UniqueConstraint("student_id", "course_id", name="unique_student_progress"),
+        Index("ix_student_progress_course_id_id", "course_id", "id"),
+    )
+    
     student = relationship("User", back_populates="progress")
     course = relationship("Course", back_populates="progress")
+
+class CourseStats(Base):
+    __tablename__ = "course_stats"
+    
+    course_id = Column(Integer, ForeignKey("courses.id"), primary_key=True)
+    students = Column(Integer, nullable=False, default=0)
+    attempted = Column(Integer, nullable=False, default=0)
+    attempts_0 = Column(Integer, nullable=False, default=0)
+    attempts_1 = Column(Integer, nullable=False, default=0)
+    attempts_2_plus = Column(Integer, nullable=False, default=0)
+    percentage_bp_sum = Column(BigInteger, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    certificates = Column(Integer, nullable=False, default=0)
+    
+    course = relationship("Course", back_populates="stats")
+
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+    
+    key = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class ReplicaHeartbeat(Base):
+    __tablename__ = "replica_heartbeat"
+    
+    id = Column(Integer, primary_key=True)
+    written_at = Column(Float, nullable=False)
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)
+    idempotency_key = Column(String(200), unique=True, nullable=False)
+    payload = Column(Text, nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    available_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    
+    __table_args__ = (Index("ix_jobs_status_available_at", "status", "available_at"),)
+
+class Certificate(Base):
+    __tablename__ = "certificates"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    student_name = Column(String(100), nullable=False)
+    course_title = Column(String(150), nullable=False)
+    quiz_score = Column(Integer, nullable=False)
+    quiz_total = Column(Integer, nullable=False)
+    issued_at = Column(DateTime, nullable=False)
+    verification_hash = Column(String(64), unique=True, nullable=False)
+    pdf = Column(LargeBinary, nullable=False)
+    
+    __table_args__ = (UniqueConstraint("student_id", "course_id", name="unique_certificate"),)
+
+class SearchDocument(Base):
+    __tablename__ = "search_documents"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    kind = Column(String(10), nullable=False)
+    ref_id = Column(Integer, nullable=False)
+    course_id = Column(Integer, nullable=False)
+    title = Column(String(150), nullable=False)
+    body = Column(Text, nullable=True)
+    body_compressed = Column(LargeBinary, nullable=True)
+    body_encoding = Column(String(10), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint("kind", "ref_id", name="unique_search_document"),
+        Index("ix_search_documents_course_id", "course_id"),
+    )
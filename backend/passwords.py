@@ -0,0 +1,175 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "scrypt").lower()
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+SCRYPT_LOG_N = int(os.environ.get("SCRYPT_LOG_N", "14"))
+SCRYPT_R = int(os.environ.get("SCRYPT_R", "8"))
+SCRYPT_P = int(os.environ.get("SCRYPT_P", "1"))
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "1"))
+
+logger = logging.getLogger(__name__)
+
+def _b64encode(raw: bytes):
+    return base64.b64encode(raw).decode().rstrip("=")
+
+def _b64decode(text: str):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+class ScryptHasher:
+    prefix = "$scrypt$"
+
+    def __init__(self, log_n=SCRYPT_LOG_N, r=SCRYPT_R, p=SCRYPT_P):
+        self.log_n = log_n
+        self.r = r
+        self.p = p
+
+    def _derive(self, password: str, salt: bytes, log_n: int, r: int, p: int):
+        n = 1 << log_n
+        return hashlib.scrypt(
+            password.encode(), salt=salt, n=n, r=r, p=p, dklen=32, maxmem=256 * n * r + (1 << 20)
+        )
+
+    def _params(self):
+        return f"ln={self.log_n},r={self.r},p={self.p}"
+
+    def hash(self, password: str):
+        salt = secrets.token_bytes(16)
+        digest = self._derive(password, salt, self.log_n, self.r, self.p)
+        return f"{self.prefix}{self._params()}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, stored: str, password: str):
+        try:
+            params, salt, digest = stored[len(self.prefix):].split("$")
+            values = dict(item.split("=") for item in params.split(","))
+            actual = self._derive(
+                password, _b64decode(salt), int(values["ln"]), int(values["r"]), int(values["p"])
+            )
+        except (ValueError, KeyError):
+            return False
+        return hmac.compare_digest(actual, _b64decode(digest))
+
+    def needs_rehash(self, stored: str):
+        return not stored.startswith(f"{self.prefix}{self._params()}$")
+
+class BcryptHasher:
+    prefix = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds=BCRYPT_ROUNDS):
+        import bcrypt
+        self.bcrypt = bcrypt
+        self.rounds = rounds
+
+    def hash(self, password: str):
+        return self.bcrypt.hashpw(password.encode()[:72], self.bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, stored: str, password: str):
+        try:
+            return self.bcrypt.checkpw(password.encode()[:72], stored.encode())
+        except ValueError:
+            return False
+
+    def needs_rehash(self, stored: str):
+        return not stored.startswith("$2b$%02d$" % self.rounds)
+
+class Argon2Hasher:
+    prefix = "$argon2"
+
+    def __init__(self, time_cost=ARGON2_TIME_COST, memory_cost=ARGON2_MEMORY_COST, parallelism=ARGON2_PARALLELISM):
+        from argon2 import PasswordHasher
+        from argon2.exceptions import InvalidHashError, VerificationError
+        self.hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        self.errors = (InvalidHashError, VerificationError)
+
+    def hash(self, password: str):
+        return self.hasher.hash(password)
+
+    def verify(self, stored: str, password: str):
+        try:
+            return self.hasher.verify(stored, password)
+        except self.errors:
+            return False
+
+    def needs_rehash(self, stored: str):
+        return self.hasher.check_needs_rehash(stored)
+
+class UnavailableHasher:
+    def __init__(self, name: str):
+        self.name = name
+
+    def verify(self, stored: str, password: str):
+        return False
+
+    def needs_rehash(self, stored: str):
+        return True
+
+HASHERS = {
+    "scrypt": ScryptHasher,
+    "bcrypt": BcryptHasher,
+    "argon2": Argon2Hasher,
+}
+
+def build_hasher(name: str = PASSWORD_HASHER, **costs):
+    if name not in HASHERS:
+        raise ValueError(f"Unknown PASSWORD_HASHER {name!r}, expected one of {', '.join(HASHERS)}")
+    return HASHERS[name](**costs)
+
+hasher = build_hasher()
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_other_hashers = {}
+_dummy_hash = None
+
+def _hasher_for(stored: str):
+    for name, hasher_class in HASHERS.items():
+        if stored.startswith(hasher_class.prefix):
+            if isinstance(hasher, hasher_class):
+                return hasher
+            if name not in _other_hashers:
+                try:
+                    _other_hashers[name] = hasher_class()
+                except ImportError:
+                    logger.warning("Password hashes stored with %s cannot be verified, it is not installed", name)
+                    _other_hashers[name] = UnavailableHasher(name)
+            return _other_hashers[name]
+    return None
+
+def make_hash(password: str):
+    return hasher.hash(password)
+
+def check(password: str, stored: str):
+    stored_hasher = _hasher_for(stored)
+    if stored_hasher is None:
+        return hmac.compare_digest(stored.encode(), password.encode())
+    return stored_hasher.verify(stored, password)
+
+def needs_rehash(stored: str):
+    return _hasher_for(stored) is not hasher or hasher.needs_rehash(stored)
+
+def check_missing_user(password: str):
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = make_hash(secrets.token_hex(16))
+    check(password, _dummy_hash)
+    return False
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+async def hash_password(password: str):
+    return await _run(make_hash, password)
+
+async def verify_password(password: str, stored: str):
+    return await _run(check, password, stored)
+
+async def verify_missing_user(password: str):
+    return await _run(check_missing_user, password)
@@ -0,0 +1,208 @@
+import base64
+from fastapi import HTTPException, status
+from sqlalchemy import and_, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import models
+import schemas
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(last_id: int):
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def paginate(query, id_column, cursor=None, limit=None):
+    if cursor:
+        query = query.filter(id_column > decode_cursor(cursor))
+    query = query.order_by(id_column)
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
+
+def set_next_cursor(response, next_cursor):
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+def get_owned_course(db: Session, course_id: int, current_user, action: str):
+    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+
+    if course.teacher_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized to {action} this course"
+        )
+    return course
+
+def insert_ignore(db: Session, model, **values):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        result = db.execute(postgresql.insert(model).values(**values).on_conflict_do_nothing())
+    elif dialect == "sqlite":
+        result = db.execute(sqlite.insert(model).values(**values).on_conflict_do_nothing())
+    else:
+        try:
+            with db.begin_nested():
+                result = db.execute(insert(model).values(**values))
+        except IntegrityError:
+            return False
+    return result.rowcount == 1
+
+def course_listing_query(db: Session):
+    return db.query(
+        models.Course.id,
+        models.Course.title,
+        models.Course.description,
+        models.Course.teacher_id,
+        models.Course.is_active,
+        models.User.name.label("teacher_name")
+    ).outerjoin(models.User, models.Course.teacher_id == models.User.id)
+
+def student_course_query(db: Session, student_id: int):
+    return course_listing_query(db).add_columns(
+        models.Enrollment.id.label("enrollment_id"),
+        models.StudentProgress
+    ).outerjoin(
+        models.Enrollment,
+        and_(
+            models.Enrollment.course_id == models.Course.id,
+            models.Enrollment.user_id == student_id
+        )
+    ).outerjoin(
+        models.StudentProgress,
+        and_(
+            models.StudentProgress.course_id == models.Course.id,
+            models.StudentProgress.student_id == student_id
+        )
+    )
+
+def course_response(row):
+    return schemas.CourseResponse(
+        id=row.id,
+        title=row.title,
+        description=row.description,
+        teacher_id=row.teacher_id,
+        is_active=row.is_active,
+        teacher_name=row.teacher_name
+    )
+
+def progress_response(progress, course_title, student_name):
+    if progress is None:
+        return None
+    return schemas.ProgressResponse(
+        id=progress.id,
+        student_id=progress.student_id,
+        course_id=progress.course_id,
+        lesson_completed=progress.lesson_completed,
+        quiz_score=progress.quiz_score,
+        quiz_total=progress.quiz_total,
+        quiz_attempts=progress.quiz_attempts,
+        certificate_earned=progress.certificate_earned,
+        course_title=course_title,
+        student_name=student_name
+    )
+
+def enrollment_listing_query(db: Session):
+    return db.query(
+        models.Enrollment.id,
+        models.Enrollment.user_id,
+        models.Enrollment.course_id,
+        models.Course.title.label("course_title")
+    ).outerjoin(models.Course, models.Enrollment.course_id == models.Course.id)
+
+PROGRESS_LISTING_COLUMNS = (
+    models.StudentProgress.id,
+    models.StudentProgress.student_id,
+    models.StudentProgress.course_id,
+    models.StudentProgress.lesson_completed,
+    models.StudentProgress.quiz_score,
+    models.StudentProgress.quiz_total,
+    models.StudentProgress.quiz_attempts,
+    models.StudentProgress.certificate_earned,
+    models.Course.title.label("course_title"),
+    models.User.name.label("student_name"),
+)
+
+def _join_progress_names(query):
+    return query.outerjoin(
+        models.Course, models.StudentProgress.course_id == models.Course.id
+    ).outerjoin(
+        models.User, models.StudentProgress.student_id == models.User.id
+    )
+
+def progress_listing_query(db: Session):
+    return _join_progress_names(db.query(*PROGRESS_LISTING_COLUMNS))
+
+def progress_listing_select():
+    return _join_progress_names(select(*PROGRESS_LISTING_COLUMNS))
+
+def list_courses(db: Session, show_inactive: bool = False, teacher_id=None, cursor=None, limit=None):
+    query = course_listing_query(db)
+
+    if teacher_id:
+        query = query.filter(models.Course.teacher_id == teacher_id)
+
+    if not show_inactive:
+        query = query.filter(models.Course.is_active == True)
+
+    return paginate(query, models.Course.id, cursor, limit)
+
+def get_course(db: Session, course_id: int):
+    row = course_listing_query(db).filter(models.Course.id == course_id).first()
+    if row is None:
+        return None
+    return schemas.CourseResponse(**row._mapping)
+
+def list_users(db: Session, role=None, cursor=None, limit=None):
+    query = db.query(models.User.id, models.User.name, models.User.email, models.User.role)
+
+    if role is not None:
+        query = query.filter(models.User.role == role)
+
+    return paginate(query, models.User.id, cursor, limit)
+
+def list_enrollments(db: Session, user_id=None, course_id=None, cursor=None, limit=None):
+    query = enrollment_listing_query(db)
+
+    if user_id is not None:
+        query = query.filter(models.Enrollment.user_id == user_id)
+    if course_id is not None:
+        query = query.filter(models.Enrollment.course_id == course_id)
+
+    return paginate(query, models.Enrollment.id, cursor, limit)
+
+def list_progress(db: Session, student_id=None, course_id=None, certificate_earned=None,
+                  lesson_completed=None, cursor=None, limit=None):
+    query = progress_listing_query(db)
+
+    if student_id is not None:
+        query = query.filter(models.StudentProgress.student_id == student_id)
+    if course_id is not None:
+        query = query.filter(models.StudentProgress.course_id == course_id)
+    if certificate_earned is not None:
+        query = query.filter(models.StudentProgress.certificate_earned == certificate_earned)
+    if lesson_completed is not None:
+        query = query.filter(models.StudentProgress.lesson_completed == lesson_completed)
+
+    return paginate(query, models.StudentProgress.id, cursor, limit)
@@ -0,0 +1,43 @@
+import sys
+sys.path.insert(0, '.')
+
+import argparse
+from database import SessionLocal
+import course_stats
+
+def rebuild_course_stats(course_id=None):
+    db = SessionLocal()
+
+    try:
+        count = course_stats.rebuild(db, course_id)
+        print(f"Rebuilt stats for {count} course(s)")
+    finally:
+        db.close()
+
+def check_course_stats(course_id=None):
+    db = SessionLocal()
+
+    try:
+        mismatches = course_stats.check(db, course_id)
+    finally:
+        db.close()
+
+    if not mismatches:
+        print("Course stats are consistent")
+        return True
+
+    for key, diff in mismatches.items():
+        for column, values in diff.items():
+            print(f"course {key}: {column} stored={values['stored']} expected={values['expected']}")
+    print(f"{len(mismatches)} course(s) out of date, run without --check to rebuild")
+    return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or verify the course_stats aggregate")
+    parser.add_argument("--course-id", type=int, default=None)
+    parser.add_argument("--check", action="store_true", help="compare against a full recompute without writing")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check_course_stats(args.course_id) else 1)
+    rebuild_course_stats(args.course_id)
@@ -0,0 +1,17 @@
+import sys
+sys.path.insert(0, '.')
+
+from database import SessionLocal
+import search
+
+def rebuild_search_index():
+    db = SessionLocal()
+
+    try:
+        count = search.rebuild(db)
+        print(f"Indexed {count} search document(s)")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_search_index()
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from database import LAST_WRITE_HEADER, REPLICA_CHECK_SECONDS, SessionLocal, replica_set
+import models
+
+HEARTBEAT_ID = 1
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+logger = logging.getLogger(__name__)
+
+def write_heartbeat(now: float):
+    db = SessionLocal()
+    try:
+        written = db.execute(
+            update(models.ReplicaHeartbeat)
+            .where(
+                models.ReplicaHeartbeat.id == HEARTBEAT_ID,
+                models.ReplicaHeartbeat.written_at <= now - REPLICA_CHECK_SECONDS / 2
+            )
+            .values(written_at=now)
+        ).rowcount
+        if not written and db.get(models.ReplicaHeartbeat, HEARTBEAT_ID) is None:
+            db.add(models.ReplicaHeartbeat(id=HEARTBEAT_ID, written_at=now))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+    finally:
+        db.close()
+
+def read_heartbeat(replica):
+    with replica.engine.connect() as connection:
+        return connection.execute(
+            select(models.ReplicaHeartbeat.written_at).where(models.ReplicaHeartbeat.id == HEARTBEAT_ID)
+        ).scalar()
+
+def check():
+    try:
+        write_heartbeat(time.time())
+    except Exception:
+        logger.warning("Replica heartbeat write failed", exc_info=True)
+
+    for replica in replica_set.replicas:
+        try:
+            replayed_at = read_heartbeat(replica)
+        except Exception as exc:
+            logger.warning("Replica %s check failed: %s", replica.name, exc)
+            replica.record_error(type(exc).__name__, time.time())
+            continue
+        if replayed_at is None:
+            replica.record_error("no heartbeat", time.time())
+        else:
+            replica.record(replayed_at, time.time())
+
+class ReplicaMonitor:
+    def __init__(self, interval: float = REPLICA_CHECK_SECONDS):
+        self.interval = interval
+        self._task = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await run_in_threadpool(check)
+            await asyncio.sleep(self.interval)
+
+monitor = ReplicaMonitor()
+
+class LastWriteMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_with_last_write(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message)[LAST_WRITE_HEADER] = f"{time.time():.6f}"
+            await send(message)
+
+        await self.app(scope, receive, send_with_last_write)
+
+def install(app):
+    app.add_middleware(LastWriteMiddleware)
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import fnmatch
+import time
+
+class RespStore:
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+
+    def _alive(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.values
+
+    def execute(self, command, args):
+        if command == b"PING":
+            return b"+PONG"
+        if command == b"SELECT":
+            return b"+OK"
+        if command == b"FLUSHDB":
+            self.values.clear()
+            self.expires.clear()
+            return b"+OK"
+        if command == b"GET":
+            return self.values.get(args[0]) if self._alive(args[0]) else None
+        if command == b"SET":
+            self.values[args[0]] = args[1]
+            self.expires.pop(args[0], None)
+            if len(args) == 4 and args[2].upper() == b"PX":
+                self.expires[args[0]] = time.monotonic() + int(args[3]) / 1000
+            return b"+OK"
+        if command == b"DEL":
+            removed = [key for key in args if self._alive(key)]
+            for key in removed:
+                self.values.pop(key)
+                self.expires.pop(key, None)
+            return len(removed)
+        if command == b"SCAN":
+            options = dict(zip((name.upper() for name in args[1::2]), args[2::2]))
+            pattern = options.get(b"MATCH", b"*")
+            return [b"0", [key for key in list(self.values) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]]
+        return b"-ERR unknown command '" + command + b"'"
+
+def encode(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(encode(item) for item in reply)
+    if reply[:1] in (b"+", b"-"):
+        return reply + b"\r\n"
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+async def read_command(reader):
+    header = await reader.readline()
+    if not header:
+        return None
+    parts = []
+    for _ in range(int(header[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        parts.append((await reader.readexactly(length + 2))[:-2])
+    return parts
+
+def make_handler(store: RespStore):
+    async def handle(reader, writer):
+        try:
+            while (parts := await read_command(reader)) is not None:
+                writer.write(encode(store.execute(parts[0].upper(), parts[1:])))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+async def serve(host: str, port: int):
+    server = await asyncio.start_server(make_handler(RespStore()), host, port)
+    print(f"Redis-protocol cache listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Minimal in-memory Redis-protocol server for local catalog caching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
@@ -1,24 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from database import get_db
-from security import create_access_token
+from database import get_db, run_db
+from security import create_access_token, user_token_claims
 from deps import get_current_user
+from passwords import hash_password, needs_rehash, verify_missing_user, verify_password
 import models
 import schemas
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-@router.post("/login", response_model=schemas.TokenResponse)
-def login(request: schemas.LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == request.email).first()
+def _get_login_user(db: Session, email: str):
+    user = db.query(models.User).filter(models.User.email == email).first()
+    result = (schemas.UserResponse.model_validate(user), user.password) if user else (None, None)
+    # Hand the connection back to the pool while the password is being verified
+    db.close()
+    return result
+
+def _store_password_hash(db: Session, user_id: int, password_hash: str):
+    db.query(models.User).filter(models.User.id == user_id).update(
+        {models.User.password: password_hash}, synchronize_session=False
+    )
+    db.commit()
 
-    if not user or user.password != request.password:
+@router.post("/login", response_model=schemas.TokenResponse)
+async def login(request: schemas.LoginRequest, db = Depends(get_db)):
+    user, stored_password = await run_db(db, _get_login_user, request.email)
+    
+    if not user:
+        verified = await verify_missing_user(request.password)
+    else:
+        verified = await verify_password(request.password, stored_password)
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
-    access_token = create_access_token(data={"sub": str(user.id)})
+    if needs_rehash(stored_password):
+        password_hash = await hash_password(request.password)
+        await run_db(db, _store_password_hash, user.id, password_hash)
+    
+    access_token = create_access_token(data=user_token_claims(user))
     
     return {
         "access_token": access_token,
@@ -27,5 +50,5 @@ def login(request: schemas.LoginRequest, db: Session = Depends(get_db)):
     }
 
 @router.get("/me", response_model=schemas.UserResponse)
-def get_me(current_user: models.User = Depends(get_current_user)):
+async def get_me(current_user: models.User = Depends(get_current_user)):
     return current_user
@@ -1,25 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database import get_db
+from database import get_db, read_db, run_db
 from deps import get_current_user, require_teacher
 import models
 import schemas
+import queries
+from answer_keys import invalidate_answer_key
+import certificates
+import http_cache
+import search
+from catalog_cache import CatalogPage, catalog_cache
+from serialization import JSONBytesResponse, RowSerializer
+
+course_rows = RowSerializer(schemas.CourseResponse)
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
-@router.post("/", response_model=schemas.CourseResponse, status_code=status.HTTP_201_CREATED)
-def create_course(
-    course: schemas.CourseCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_teacher)
-):
+def _create_course(db: Session, course: schemas.CourseCreate, current_user):
     db_course = models.Course(
         title=course.title,
         description=course.description,
         teacher_id=current_user.id
     )
     db.add(db_course)
+    db.flush()
+    search.index_course(db, db_course)
+    http_cache.bump(db, http_cache.CATALOG, *http_cache.course_keys(db_course.id))
     db.commit()
     db.refresh(db_course)
     return schemas.CourseResponse(
@@ -31,57 +38,112 @@ def create_course(
         teacher_name=current_user.name
     )
 
-@router.get("/", response_model=List[schemas.CourseResponse])
-def get_courses(
+@router.post("/", response_model=schemas.CourseResponse, status_code=status.HTTP_201_CREATED)
+async def create_course(
+    course: schemas.CourseCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    created = await run_db(db, _create_course, course, current_user)
+    await catalog_cache.invalidate()
+    return created
+
+def _build_catalog_page(db: Session, etag, show_inactive, teacher_id, cursor, limit):
+    rows, next_cursor = queries.list_courses(
+        db, show_inactive=show_inactive, teacher_id=teacher_id, cursor=cursor, limit=limit
+    )
+    return CatalogPage(etag, next_cursor, course_rows.dump(rows))
+
+@router.get("/", response_model=List[schemas.CourseResponse], response_class=JSONBytesResponse)
+async def get_courses(
+    request: Request,
     show_inactive: bool = Query(False),
     teacher_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(queries.DEFAULT_PAGE_SIZE, ge=1, le=queries.MAX_PAGE_SIZE),
+    db = Depends(read_db(lambda: catalog_cache.invalidated_at))
 ):
-    query = db.query(models.Course)
-    
-    if teacher_id:
-        query = query.filter(models.Course.teacher_id == teacher_id)
+    # Writes on other workers only bump the catalog version, so pages are cached per version
+    version = await run_db(db, http_cache.current_version, http_cache.CATALOG)
+    etag = http_cache.version_etag(http_cache.CATALOG, version, show_inactive, teacher_id, cursor, limit)
+    if http_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return http_cache.not_modified(etag, http_cache.PUBLIC)
     
-    if not show_inactive:
-        query = query.filter(models.Course.is_active == True)
+    page = await catalog_cache.get_or_build(
+        catalog_cache.variant_key(version, show_inactive, teacher_id, cursor, limit),
+        lambda: run_db(db, _build_catalog_page, etag, show_inactive, teacher_id, cursor, limit)
+    )
+    response = JSONBytesResponse(page.body)
+    http_cache.set_cache_headers(response, page.etag, http_cache.PUBLIC)
+    queries.set_next_cursor(response, page.next_cursor)
+    return response
+
+def _get_course(db: Session, course_id: int, if_none_match):
+    etag = http_cache.current_etag(db, http_cache.course_key(course_id))
+    if http_cache.etag_matches(if_none_match, etag):
+        return etag, None
     
-    courses = query.all()
-    result = []
-    for course in courses:
-        result.append(schemas.CourseResponse(
-            id=course.id,
-            title=course.title,
-            description=course.description,
-            teacher_id=course.teacher_id,
-            is_active=course.is_active,
-            teacher_name=course.teacher.name if course.teacher else None
-        ))
-    return result
+    course = queries.get_course(db, course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    return etag, course
 
 @router.get("/{course_id}", response_model=schemas.CourseResponse)
-def get_course(course_id: int, db: Session = Depends(get_db)):
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
-    if not course:
+async def get_course(
+    course_id: int,
+    request: Request,
+    response: Response,
+    db = Depends(get_db)
+):
+    etag, course = await run_db(db, _get_course, course_id, request.headers.get("if-none-match"))
+    if course is None:
+        return http_cache.not_modified(etag, http_cache.PUBLIC)
+    
+    http_cache.set_cache_headers(response, etag, http_cache.PUBLIC)
+    return course
+
+def _get_quiz_view(db: Session, course_id: int, current_user):
+    row = queries.student_course_query(db, current_user.id).filter(models.Course.id == course_id).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
-    return schemas.CourseResponse(
-        id=course.id,
-        title=course.title,
-        description=course.description,
-        teacher_id=course.teacher_id,
-        is_active=course.is_active,
-        teacher_name=course.teacher.name if course.teacher else None
+    
+    if current_user.role == "teacher":
+        if row.teacher_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to view this course"
+            )
+    elif not row.enrollment_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You must be enrolled in this course to take quizzes"
+        )
+    
+    quizzes = db.query(models.Quiz).filter(
+        models.Quiz.course_id == course_id
+    ).order_by(models.Quiz.id).all()
+    
+    return schemas.QuizView(
+        course=queries.course_response(row),
+        quizzes=[schemas.QuizResponse.model_validate(quiz) for quiz in quizzes],
+        progress=queries.progress_response(row.StudentProgress, row.title, current_user.name)
     )
 
-@router.put("/{course_id}", response_model=schemas.CourseResponse)
-def update_course(
+@router.get("/{course_id}/quiz-view", response_model=schemas.QuizView)
+async def get_quiz_view(
     course_id: int,
-    course_update: schemas.CourseUpdate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_teacher)
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
 ):
+    return await run_db(db, _get_quiz_view, course_id, current_user)
+
+def _update_course(db: Session, course_id: int, course_update: schemas.CourseUpdate, current_user):
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(
@@ -100,6 +162,8 @@ def update_course(
     if course_update.description is not None:
         course.description = course_update.description
     
+    search.index_course(db, course)
+    http_cache.bump(db, http_cache.CATALOG, http_cache.course_key(course_id))
     db.commit()
     db.refresh(course)
     return schemas.CourseResponse(
@@ -111,12 +175,18 @@ def update_course(
         teacher_name=course.teacher.name if course.teacher else None
     )
 
-@router.patch("/{course_id}/toggle", response_model=schemas.CourseResponse)
-def toggle_course(
+@router.put("/{course_id}", response_model=schemas.CourseResponse)
+async def update_course(
     course_id: int,
-    db: Session = Depends(get_db),
+    course_update: schemas.CourseUpdate,
+    db = Depends(get_db),
     current_user: models.User = Depends(require_teacher)
 ):
+    course = await run_db(db, _update_course, course_id, course_update, current_user)
+    await catalog_cache.invalidate()
+    return course
+
+def _toggle_course(db: Session, course_id: int, current_user):
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(
@@ -131,6 +201,7 @@ def toggle_course(
         )
     
     course.is_active = not course.is_active
+    http_cache.bump(db, http_cache.CATALOG, http_cache.course_key(course_id))
     db.commit()
     db.refresh(course)
     return schemas.CourseResponse(
@@ -142,12 +213,17 @@ def toggle_course(
         teacher_name=course.teacher.name if course.teacher else None
     )
 
-@router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_course(
+@router.patch("/{course_id}/toggle", response_model=schemas.CourseResponse)
+async def toggle_course(
     course_id: int,
-    db: Session = Depends(get_db),
+    db = Depends(get_db),
     current_user: models.User = Depends(require_teacher)
 ):
+    course = await run_db(db, _toggle_course, course_id, current_user)
+    await catalog_cache.invalidate()
+    return course
+
+def _delete_course(db: Session, course_id: int, current_user):
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(
@@ -168,6 +244,19 @@ def delete_course(
             detail="Cannot delete course with enrolled students"
         )
     
+    certificates.remove_for(db, course_ids=[course_id])
     db.delete(course)
+    search.remove_course(db, course_id)
+    http_cache.bump(db, http_cache.CATALOG, *http_cache.course_keys(course_id))
     db.commit()
+    invalidate_answer_key(course_id)
+
+@router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_course(
+    course_id: int,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    await run_db(db, _delete_course, course_id, current_user)
+    await catalog_cache.invalidate()
     return None
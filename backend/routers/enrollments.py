@@ -1,19 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from deps import get_current_user
+from typing import List, Optional
+from database import get_db, run_db
+from deps import get_current_user, require_teacher
 import models
 import schemas
+import queries
+from bulk_import import check_batch_size, insert_rows, row_error
+from serialization import JSONBytesResponse, RowSerializer
 
 router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
 
-@router.post("/", response_model=schemas.EnrollmentResponse, status_code=status.HTTP_201_CREATED)
-def create_enrollment(
-    enrollment: schemas.EnrollmentCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
-):
+enrollment_rows = RowSerializer(schemas.EnrollmentResponse)
+
+def _create_enrollment(db: Session, enrollment: schemas.EnrollmentCreate):
     course = db.query(models.Course).filter(models.Course.id == enrollment.course_id).first()
     if not course:
         raise HTTPException(
@@ -53,34 +53,69 @@ def create_enrollment(
         course_title=course.title
     )
 
-@router.get("/student/{user_id}", response_model=List[schemas.EnrollmentResponse])
-def get_student_enrollments(user_id: int, db: Session = Depends(get_db)):
-    enrollments = db.query(models.Enrollment).filter(
-        models.Enrollment.user_id == user_id
-    ).all()
-    
-    result = []
-    for enrollment in enrollments:
-        result.append(schemas.EnrollmentResponse(
-            id=enrollment.id,
-            user_id=enrollment.user_id,
-            course_id=enrollment.course_id,
-            course_title=enrollment.course.title if enrollment.course else None
-        ))
-    return result
+@router.post("/", response_model=schemas.EnrollmentResponse, status_code=status.HTTP_201_CREATED)
+async def create_enrollment(
+    enrollment: schemas.EnrollmentCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return await run_db(db, _create_enrollment, enrollment)
 
-@router.get("/course/{course_id}", response_model=List[schemas.EnrollmentResponse])
-def get_course_enrollments(course_id: int, db: Session = Depends(get_db)):
-    enrollments = db.query(models.Enrollment).filter(
-        models.Enrollment.course_id == course_id
-    ).all()
+def _bulk_create_enrollments(db: Session, batch: schemas.EnrollmentBulkCreate, current_user):
+    course = queries.get_owned_course(db, batch.course_id, current_user, "enroll students in")
+    if not course.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot enroll in inactive course"
+        )
     
-    result = []
-    for enrollment in enrollments:
-        result.append(schemas.EnrollmentResponse(
-            id=enrollment.id,
-            user_id=enrollment.user_id,
-            course_id=enrollment.course_id,
-            course_title=enrollment.course.title if enrollment.course else None
-        ))
-    return result
+    roles = dict(db.query(models.User.id, models.User.role).filter(
+        models.User.id.in_(batch.user_ids)
+    ).all())
+    enrolled = {user_id for (user_id,) in db.query(models.Enrollment.user_id).filter(
+        models.Enrollment.course_id == batch.course_id,
+        models.Enrollment.user_id.in_(batch.user_ids)
+    )}
+    
+    rows = []
+    results = []
+    for index, user_id in enumerate(batch.user_ids):
+        if user_id not in roles:
+            results.append(row_error(index, "User not found"))
+        elif roles[user_id] != "student":
+            results.append(row_error(index, "Only students can be enrolled"))
+        elif user_id in enrolled:
+            results.append(row_error(index, "Already enrolled in this course"))
+        else:
+            enrolled.add(user_id)
+            rows.append((index, {"user_id": user_id, "course_id": batch.course_id}))
+    
+    return insert_rows(db, models.Enrollment, rows, results)
+
+@router.post("/bulk", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_enrollments(
+    batch: schemas.EnrollmentBulkCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    check_batch_size(len(batch.user_ids))
+    return await run_db(db, _bulk_create_enrollments, batch, current_user)
+
+@router.get("/student/{user_id}", response_model=List[schemas.EnrollmentResponse], response_class=JSONBytesResponse)
+async def get_student_enrollments(user_id: int, db = Depends(get_db)):
+    rows, _ = await run_db(db, queries.list_enrollments, user_id=user_id)
+    return enrollment_rows.response(rows)
+
+@router.get("/course/{course_id}", response_model=List[schemas.EnrollmentResponse], response_class=JSONBytesResponse)
+async def get_course_enrollments(
+    course_id: int,
+    user_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(queries.DEFAULT_PAGE_SIZE, ge=1, le=queries.MAX_PAGE_SIZE),
+    db = Depends(get_db)
+):
+    rows, next_cursor = await run_db(
+        db, queries.list_enrollments,
+        user_id=user_id, course_id=course_id, cursor=cursor, limit=limit
+    )
+    return enrollment_rows.response(rows, next_cursor)
@@ -0,0 +1,40 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from database import get_db, run_db
+from deps import get_current_user
+import models
+import schemas
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+def _get_job(db: Session, job_id: int, current_user):
+    job = db.query(models.Job).filter(
+        models.Job.id == job_id,
+        models.Job.owner_id == current_user.id
+    ).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return schemas.JobStatus(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        last_error=job.last_error,
+        result=json.loads(job.result) if job.result else None
+    )
+
+@router.get("/{job_id}", response_model=schemas.JobStatus)
+async def get_job(
+    job_id: int,
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return await run_db(db, _get_job, job_id, current_user)
@@ -1,19 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import re
+from fastapi import APIRouter, Depends, HTTPException, status, File, Form, Request, Response, UploadFile
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
-from database import get_db
+from database import get_db, get_read_db, run_db
 from deps import require_teacher, get_current_user
 import models
 import schemas
+from queries import get_owned_course
+import http_cache
+import lesson_content
+from compression import accepts_encoding
+import search
+from bulk_import import check_batch_size, read_upload_rows, insert_rows, row_error
 
 router = APIRouter(prefix="/lessons", tags=["Lessons"])
 
-@router.post("/", response_model=schemas.LessonResponse, status_code=status.HTTP_201_CREATED)
-def create_lesson(
-    lesson: schemas.LessonCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_teacher)
-):
+def _create_lesson(db: Session, lesson: schemas.LessonCreate, current_user):
     course = db.query(models.Course).filter(models.Course.id == lesson.course_id).first()
     if not course:
         raise HTTPException(
@@ -29,29 +32,69 @@ def create_lesson(
     
     db_lesson = models.Lesson(
         title=lesson.title,
-        content=lesson.content,
-        course_id=lesson.course_id
+        course_id=lesson.course_id,
+        **lesson_content.pack(lesson.content)
     )
     db.add(db_lesson)
+    db.flush()
+    search.index_lesson(db, db_lesson)
+    http_cache.bump(db, http_cache.lessons_key(lesson.course_id))
     db.commit()
-    db.refresh(db_lesson)
-    return db_lesson
+    return schemas.LessonResponse(
+        id=db_lesson.id,
+        title=lesson.title,
+        content=lesson.content,
+        course_id=lesson.course_id
+    )
 
-@router.get("/course/{course_id}", response_model=List[schemas.LessonResponse])
-def get_course_lessons(
-    course_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+@router.post("/", response_model=schemas.LessonResponse, status_code=status.HTTP_201_CREATED)
+async def create_lesson(
+    lesson: schemas.LessonCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
 ):
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Course not found"
-        )
+    return await run_db(db, _create_lesson, lesson, current_user)
+
+def _bulk_create_lessons(db: Session, course_id: int, items, current_user):
+    get_owned_course(db, course_id, current_user, "add lessons to")
     
+    rows = []
+    results = []
+    for index, item in items:
+        if isinstance(item, str):
+            results.append(row_error(index, item))
+        elif not item.title.strip():
+            results.append(row_error(index, "title: must not be empty"))
+        else:
+            rows.append((index, {"title": item.title, "course_id": course_id, **lesson_content.pack(item.content)}))
+    
+    if rows:
+        http_cache.bump(db, http_cache.lessons_key(course_id))
+    return insert_rows(db, models.Lesson, rows, results, after_insert=search.index_new_lessons)
+
+@router.post("/bulk", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_lessons(
+    batch: schemas.LessonBulkCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    check_batch_size(len(batch.lessons))
+    items = list(enumerate(batch.lessons))
+    return await run_db(db, _bulk_create_lessons, batch.course_id, items, current_user)
+
+@router.post("/bulk/upload", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+async def upload_lessons(
+    course_id: int = Form(...),
+    file: UploadFile = File(...),
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    items = await run_in_threadpool(read_upload_rows, file, schemas.LessonBulkItem)
+    return await run_db(db, _bulk_create_lessons, course_id, items, current_user)
+
+def _check_course_access(db: Session, course_id: int, teacher_id: int, current_user):
     if current_user.role == "teacher":
-        if course.teacher_id != current_user.id:
+        if teacher_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to view this course"
@@ -66,6 +109,127 @@ def get_course_lessons(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You must be enrolled in this course to view lessons"
             )
+
+def _get_course_lessons(db: Session, course_id: int, current_user, if_none_match):
+    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    _check_course_access(db, course_id, course.teacher_id, current_user)
+    
+    etag = http_cache.current_etag(db, http_cache.lessons_key(course_id))
+    if http_cache.etag_matches(if_none_match, etag):
+        return etag, None
+    
+    lessons = db.query(models.Lesson).filter(
+        models.Lesson.course_id == course_id
+    ).order_by(models.Lesson.id).all()
+    return etag, lessons
+
+@router.get("/course/{course_id}", response_model=List[schemas.LessonSummary])
+async def get_course_lessons(
+    course_id: int,
+    request: Request,
+    response: Response,
+    db = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    etag, lessons = await run_db(
+        db, _get_course_lessons, course_id, current_user, request.headers.get("if-none-match")
+    )
+    if lessons is None:
+        return http_cache.not_modified(etag, http_cache.PRIVATE)
     
-    lessons = db.query(models.Lesson).filter(models.Lesson.course_id == course_id).all()
+    http_cache.set_cache_headers(response, etag, http_cache.PRIVATE)
     return lessons
+
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def _byte_range(range_header: str, size: int):
+    match = BYTE_RANGE.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first and last and int(last) < int(first):
+        return None
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+def _get_lesson_content(db: Session, lesson_id: int, current_user, headers):
+    row = db.query(
+        models.Lesson.course_id,
+        models.Lesson.content_size,
+        models.Lesson.content_hash,
+        models.Lesson.content_encoding,
+        models.Course.teacher_id
+    ).join(models.Course, models.Lesson.course_id == models.Course.id).filter(
+        models.Lesson.id == lesson_id
+    ).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lesson not found"
+        )
+    
+    _check_course_access(db, row.course_id, row.teacher_id, current_user)
+    
+    range_header = headers.get("range")
+    if_range = headers.get("if-range")
+    if range_header and if_range and if_range != f'"{row.content_hash}"':
+        range_header = None
+    passthrough = (
+        row.content_encoding is not None and not range_header
+        and accepts_encoding(headers.get("accept-encoding", ""), row.content_encoding)
+    )
+    etag = f'"{row.content_hash}-{row.content_encoding}"' if passthrough else f'"{row.content_hash}"'
+    if http_cache.etag_matches(headers.get("if-none-match"), etag):
+        return http_cache.not_modified(etag, http_cache.PRIVATE)
+    
+    byte_range = _byte_range(range_header, row.content_size) if range_header else None
+    content, compressed = db.query(models.Lesson.content, models.Lesson.content_compressed).filter(
+        models.Lesson.id == lesson_id
+    ).one()
+    response_headers = {
+        "ETag": etag,
+        "Cache-Control": http_cache.PRIVATE,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+    }
+    if passthrough:
+        response_headers["Content-Encoding"] = row.content_encoding
+        return Response(compressed, media_type="text/plain; charset=utf-8", headers=response_headers)
+    
+    body = lesson_content.raw_bytes(content, compressed, row.content_encoding)
+    if byte_range is None:
+        return Response(body, media_type="text/plain; charset=utf-8", headers=response_headers)
+    start, end = byte_range
+    response_headers["Content-Range"] = f"bytes {start}-{end}/{row.content_size}"
+    return Response(
+        body[start:end + 1],
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="text/plain; charset=utf-8",
+        headers=response_headers
+    )
+
+@router.get("/{lesson_id}/content", response_class=Response)
+async def get_lesson_content(
+    lesson_id: int,
+    request: Request,
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return await run_db(db, _get_lesson_content, lesson_id, current_user, request.headers)
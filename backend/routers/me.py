@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from database import get_db, run_db
+from deps import get_current_user
+import models
+import schemas
+import queries
+
+router = APIRouter(prefix="/me", tags=["Me"])
+
+def _get_dashboard(db: Session, current_user):
+    rows = queries.student_course_query(db, current_user.id).filter(
+        models.Enrollment.id.isnot(None)
+    ).order_by(models.Enrollment.id).all()
+    
+    return schemas.StudentDashboard(
+        user=current_user,
+        courses=[
+            schemas.DashboardCourse(
+                enrollment_id=row.enrollment_id,
+                course=queries.course_response(row),
+                progress=queries.progress_response(row.StudentProgress, row.title, current_user.name)
+            )
+            for row in rows
+        ]
+    )
+
+@router.get("/dashboard", response_model=schemas.StudentDashboard)
+async def get_dashboard(
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return await run_db(db, _get_dashboard, current_user)
@@ -1,92 +1,224 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, update
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from deps import get_current_user
+from typing import List, Optional
+from database import get_db, get_read_db, run_db
+from deps import get_current_user, require_teacher
 import models
 import schemas
+import queries
+from exports import EXPORT_FORMATS, progress_export_stream
+from serialization import JSONBytesResponse, RowSerializer
+import course_stats
+import certificates
+import jobs
 
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
-@router.get("/student/{student_id}", response_model=List[schemas.ProgressResponse])
-def get_student_progress(student_id: int, db: Session = Depends(get_db)):
-    progress_list = db.query(models.StudentProgress).filter(
-        models.StudentProgress.student_id == student_id
-    ).all()
-    
-    result = []
-    for progress in progress_list:
-        result.append(schemas.ProgressResponse(
-            id=progress.id,
-            student_id=progress.student_id,
-            course_id=progress.course_id,
-            lesson_completed=progress.lesson_completed,
-            quiz_score=progress.quiz_score,
-            quiz_total=progress.quiz_total,
-            quiz_attempts=progress.quiz_attempts,
-            certificate_earned=progress.certificate_earned,
-            course_title=progress.course.title if progress.course else None,
-            student_name=progress.student.name if progress.student else None
-        ))
-    return result
-
-@router.get("/course/{course_id}", response_model=List[schemas.ProgressResponse])
-def get_course_progress(course_id: int, db: Session = Depends(get_db)):
-    progress_list = db.query(models.StudentProgress).filter(
+progress_rows = RowSerializer(schemas.ProgressResponse)
+
+@router.get("/student/{student_id}", response_model=List[schemas.ProgressResponse], response_class=JSONBytesResponse)
+async def get_student_progress(student_id: int, db = Depends(get_db)):
+    rows, _ = await run_db(db, queries.list_progress, student_id=student_id)
+    return progress_rows.response(rows)
+
+@router.get("/course/{course_id}", response_model=List[schemas.ProgressResponse], response_class=JSONBytesResponse)
+async def get_course_progress(
+    course_id: int,
+    certificate_earned: Optional[bool] = Query(None),
+    lesson_completed: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(queries.DEFAULT_PAGE_SIZE, ge=1, le=queries.MAX_PAGE_SIZE),
+    db = Depends(get_read_db)
+):
+    rows, next_cursor = await run_db(
+        db, queries.list_progress,
+        course_id=course_id,
+        certificate_earned=certificate_earned,
+        lesson_completed=lesson_completed,
+        cursor=cursor,
+        limit=limit
+    )
+    return progress_rows.response(rows, next_cursor)
+
+@router.get("/course/{course_id}/export")
+async def export_course_progress(
+    course_id: int,
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    await run_db(db, queries.get_owned_course, course_id, current_user, "export progress for")
+    return StreamingResponse(
+        progress_export_stream(course_id, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="course-{course_id}-progress.{format}"'}
+    )
+
+def _get_course_summary(db: Session, course_id: int, current_user):
+    queries.get_owned_course(db, course_id, current_user, "view analytics for")
+    return course_stats.get_summary(db, course_id)
+
+@router.get("/course/{course_id}/summary", response_model=schemas.CourseSummary)
+async def get_course_summary(
+    course_id: int,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    return await run_db(db, _get_course_summary, course_id, current_user)
+
+def _certificate_row(db: Session, student_id: int, course_id: int, current_user, *columns):
+    row = db.query(
+        models.StudentProgress.quiz_score,
+        models.StudentProgress.quiz_total,
+        models.StudentProgress.certificate_earned,
+        models.Course.title.label("course_title"),
+        models.Course.teacher_id,
+        models.User.name.label("student_name"),
+        *columns
+    ).join(
+        models.Course, models.StudentProgress.course_id == models.Course.id
+    ).join(
+        models.User, models.StudentProgress.student_id == models.User.id
+    ).outerjoin(
+        models.Certificate,
+        and_(
+            models.Certificate.student_id == models.StudentProgress.student_id,
+            models.Certificate.course_id == models.StudentProgress.course_id
+        )
+    ).filter(
+        models.StudentProgress.student_id == student_id,
         models.StudentProgress.course_id == course_id
-    ).all()
+    ).first()
+    
+    if row and current_user.id not in (student_id, row.teacher_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this certificate"
+        )
     
-    result = []
-    for progress in progress_list:
-        result.append(schemas.ProgressResponse(
-            id=progress.id,
-            student_id=progress.student_id,
-            course_id=progress.course_id,
-            lesson_completed=progress.lesson_completed,
-            quiz_score=progress.quiz_score,
-            quiz_total=progress.quiz_total,
-            quiz_attempts=progress.quiz_attempts,
-            certificate_earned=progress.certificate_earned,
-            course_title=progress.course.title if progress.course else None,
-            student_name=progress.student.name if progress.student else None
-        ))
-    return result
+    if not row or not row.certificate_earned:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificate not available for this course."
+        )
+    return row
 
-@router.post("/update", response_model=schemas.ProgressResponse)
-def update_progress(
-    progress_data: schemas.ProgressCreate,
-    db: Session = Depends(get_db),
+def _get_certificate(db: Session, student_id: int, course_id: int, current_user):
+    row = _certificate_row(
+        db, student_id, course_id, current_user,
+        models.Certificate.issued_at, models.Certificate.verification_hash
+    )
+    return schemas.CertificateView(
+        student_id=student_id,
+        student_name=row.student_name,
+        course_id=course_id,
+        course_title=row.course_title,
+        quiz_score=row.quiz_score,
+        quiz_total=row.quiz_total,
+        issued_at=row.issued_at,
+        verification_hash=row.verification_hash
+    )
+
+@router.get("/certificate/{student_id}/{course_id}", response_model=schemas.CertificateView)
+async def get_certificate(
+    student_id: int,
+    course_id: int,
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return await run_db(db, _get_certificate, student_id, course_id, current_user)
+
+def _get_certificate_pdf(db: Session, student_id: int, course_id: int, current_user):
+    row = _certificate_row(db, student_id, course_id, current_user, models.Certificate.pdf)
+    if row.pdf is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificate is still being generated."
+        )
+    return row.pdf
+
+@router.get("/certificate/{student_id}/{course_id}/pdf", response_class=Response)
+async def get_certificate_pdf(
+    student_id: int,
+    course_id: int,
+    db = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    progress = db.query(models.StudentProgress).filter(
+    pdf = await run_db(db, _get_certificate_pdf, student_id, course_id, current_user)
+    return Response(
+        pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="certificate-{student_id}-{course_id}.pdf"'}
+    )
+
+def _verify_certificate(db: Session, verification_hash: str):
+    certificate = db.query(
+        models.Certificate.student_name,
+        models.Certificate.course_title,
+        models.Certificate.quiz_score,
+        models.Certificate.quiz_total,
+        models.Certificate.issued_at
+    ).filter(models.Certificate.verification_hash == verification_hash).first()
+    if not certificate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No certificate matches this verification code"
+        )
+    return schemas.CertificateVerification(**certificate._mapping)
+
+@router.get("/verify/{verification_hash}", response_model=schemas.CertificateVerification)
+async def verify_certificate(verification_hash: str, db = Depends(get_db)):
+    return await run_db(db, _verify_certificate, verification_hash)
+
+def _update_progress(db: Session, progress_data: schemas.ProgressCreate):
+    progress_query = db.query(models.StudentProgress).filter(
         models.StudentProgress.student_id == progress_data.student_id,
         models.StudentProgress.course_id == progress_data.course_id
-    ).first()
+    ).with_for_update()
+    # SELECT ... FOR UPDATE does nothing on SQLite, so take the row lock with a no-op UPDATE first
+    db.execute(
+        update(models.StudentProgress)
+        .where(
+            models.StudentProgress.student_id == progress_data.student_id,
+            models.StudentProgress.course_id == progress_data.course_id
+        )
+        .values(quiz_attempts=models.StudentProgress.quiz_attempts)
+        .execution_options(synchronize_session=False)
+    )
+    progress = progress_query.first()
     
+    created = False
     if not progress:
-        progress = models.StudentProgress(
+        created = queries.insert_ignore(
+            db, models.StudentProgress,
             student_id=progress_data.student_id,
-            course_id=progress_data.course_id,
-            lesson_completed=progress_data.lesson_completed,
-            quiz_score=progress_data.quiz_score,
-            quiz_total=progress_data.quiz_total,
-            quiz_attempts=progress_data.quiz_attempts,
-            certificate_earned=progress_data.certificate_earned
+            course_id=progress_data.course_id
         )
-        db.add(progress)
-    else:
-        if progress_data.lesson_completed is not None:
-            progress.lesson_completed = progress_data.lesson_completed
-        if progress_data.quiz_score is not None:
-            progress.quiz_score = progress_data.quiz_score
-        if progress_data.quiz_total is not None:
-            progress.quiz_total = progress_data.quiz_total
-        if progress_data.quiz_attempts is not None:
-            progress.quiz_attempts = progress_data.quiz_attempts
-        if progress_data.certificate_earned is not None:
-            progress.certificate_earned = progress_data.certificate_earned
+        progress = progress_query.first()
+    
+    old = course_stats.contribution(None if created else progress)
+    
+    if progress_data.lesson_completed is not None:
+        progress.lesson_completed = progress_data.lesson_completed
+    if progress_data.quiz_score is not None:
+        progress.quiz_score = progress_data.quiz_score
+    if progress_data.quiz_total is not None:
+        progress.quiz_total = progress_data.quiz_total
+    if progress_data.quiz_attempts is not None:
+        progress.quiz_attempts = progress_data.quiz_attempts
+    if progress_data.certificate_earned is not None:
+        progress.certificate_earned = progress_data.certificate_earned
     
+    new = course_stats.contribution(progress)
+    course_stats.apply_progress_change(db, progress.course_id, old, new)
+    certificate_job_id = None
+    if new["certificates"] and not old["certificates"]:
+        certificate_job_id = certificates.enqueue_certificate(db, progress.student_id, progress.course_id)
     db.commit()
+    if certificate_job_id:
+        jobs.runner.wake()
     db.refresh(progress)
     
     return schemas.ProgressResponse(
@@ -101,3 +233,11 @@ def update_progress(
         course_title=progress.course.title if progress.course else None,
         student_name=progress.student.name if progress.student else None
     )
+
+@router.post("/update", response_model=schemas.ProgressResponse)
+async def update_progress(
+    progress_data: schemas.ProgressCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return await run_db(db, _update_progress, progress_data)
@@ -1,19 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, File, Form, Request, Response, UploadFile
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, case, or_, update
 from sqlalchemy.orm import Session
 from typing import List
-from database import get_db
+from database import get_db, get_read_db, run_db
 from deps import require_teacher, get_current_user
 import models
 import schemas
+from queries import insert_ignore, get_owned_course
+import http_cache
+from bulk_import import check_batch_size, read_upload_rows, insert_rows, row_error, VALID_ANSWERS
+from answer_keys import get_answer_key, invalidate_answer_key, grade
+import course_stats
+import certificates
+import jobs
 
 router = APIRouter(prefix="/quizzes", tags=["Quizzes"])
 
-@router.post("/", response_model=schemas.QuizResponse, status_code=status.HTTP_201_CREATED)
-def create_quiz(
-    quiz: schemas.QuizCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_teacher)
-):
+def _create_quiz(db: Session, quiz: schemas.QuizCreate, current_user):
     course = db.query(models.Course).filter(models.Course.id == quiz.course_id).first()
     if not course:
         raise HTTPException(
@@ -37,16 +41,64 @@ def create_quiz(
         course_id=quiz.course_id
     )
     db.add(db_quiz)
+    http_cache.bump(db, http_cache.quizzes_key(quiz.course_id))
     db.commit()
+    invalidate_answer_key(quiz.course_id)
     db.refresh(db_quiz)
     return db_quiz
 
-@router.get("/course/{course_id}", response_model=List[schemas.QuizResponse])
-def get_course_quizzes(
-    course_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+@router.post("/", response_model=schemas.QuizResponse, status_code=status.HTTP_201_CREATED)
+async def create_quiz(
+    quiz: schemas.QuizCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    return await run_db(db, _create_quiz, quiz, current_user)
+
+def _bulk_create_quizzes(db: Session, course_id: int, items, current_user):
+    get_owned_course(db, course_id, current_user, "add quizzes to")
+    
+    rows = []
+    results = []
+    for index, item in items:
+        if isinstance(item, str):
+            results.append(row_error(index, item))
+            continue
+        correct_answer = item.correct_answer.strip().upper()
+        if correct_answer not in VALID_ANSWERS:
+            results.append(row_error(index, "correct_answer: must be one of A, B, C, D"))
+            continue
+        row = item.model_dump()
+        row.update(correct_answer=correct_answer, course_id=course_id)
+        rows.append((index, row))
+    
+    if rows:
+        http_cache.bump(db, http_cache.quizzes_key(course_id))
+    result = insert_rows(db, models.Quiz, rows, results)
+    invalidate_answer_key(course_id)
+    return result
+
+@router.post("/bulk", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_quizzes(
+    batch: schemas.QuizBulkCreate,
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
+):
+    check_batch_size(len(batch.quizzes))
+    items = list(enumerate(batch.quizzes))
+    return await run_db(db, _bulk_create_quizzes, batch.course_id, items, current_user)
+
+@router.post("/bulk/upload", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+async def upload_quizzes(
+    course_id: int = Form(...),
+    file: UploadFile = File(...),
+    db = Depends(get_db),
+    current_user: models.User = Depends(require_teacher)
 ):
+    items = await run_in_threadpool(read_upload_rows, file, schemas.QuizBulkItem)
+    return await run_db(db, _bulk_create_quizzes, course_id, items, current_user)
+
+def _get_course_quizzes(db: Session, course_id: int, current_user, if_none_match):
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(
@@ -71,88 +123,167 @@ def get_course_quizzes(
                 detail="You must be enrolled in this course to take quizzes"
             )
     
-    quizzes = db.query(models.Quiz).filter(models.Quiz.course_id == course_id).all()
-    return quizzes
+    etag = http_cache.current_etag(db, http_cache.quizzes_key(course_id))
+    if http_cache.etag_matches(if_none_match, etag):
+        return etag, None
+    
+    quizzes = db.query(models.Quiz).filter(
+        models.Quiz.course_id == course_id
+    ).order_by(models.Quiz.id).all()
+    return etag, quizzes
 
-@router.post("/submit", response_model=schemas.QuizResult)
-def submit_quiz(
-    submission: schemas.QuizSubmit,
-    db: Session = Depends(get_db),
+@router.get("/course/{course_id}", response_model=List[schemas.QuizResponse])
+async def get_course_quizzes(
+    course_id: int,
+    request: Request,
+    response: Response,
+    db = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    course = db.query(models.Course).filter(models.Course.id == submission.course_id).first()
-    if not course:
+    etag, quizzes = await run_db(
+        db, _get_course_quizzes, course_id, current_user, request.headers.get("if-none-match")
+    )
+    if quizzes is None:
+        return http_cache.not_modified(etag, http_cache.PRIVATE)
+    
+    http_cache.set_cache_headers(response, etag, http_cache.PRIVATE)
+    return quizzes
+
+def _submit_quiz(db: Session, submission: schemas.QuizSubmit, current_user):
+    row = db.query(
+        models.Course.id,
+        models.Enrollment.id.label("enrollment_id"),
+        models.StudentProgress
+    ).outerjoin(
+        models.Enrollment,
+        and_(
+            models.Enrollment.course_id == models.Course.id,
+            models.Enrollment.user_id == current_user.id
+        )
+    ).outerjoin(
+        models.StudentProgress,
+        and_(
+            models.StudentProgress.course_id == models.Course.id,
+            models.StudentProgress.student_id == current_user.id
+        )
+    ).filter(models.Course.id == submission.course_id).first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
-    enrollment = db.query(models.Enrollment).filter(
-        models.Enrollment.user_id == current_user.id,
-        models.Enrollment.course_id == submission.course_id
-    ).first()
+    _, enrollment_id, progress = row
 
-    if not enrollment:
+    if not enrollment_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You must be enrolled in this course to take quizzes"
         )
 
-    progress = db.query(models.StudentProgress).filter(
-        models.StudentProgress.student_id == current_user.id,
-        models.StudentProgress.course_id == submission.course_id
-    ).first()
-
     if progress and progress.quiz_attempts >= 2:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Maximum quiz attempts (2) reached"
         )
 
-    quizzes = db.query(models.Quiz).filter(models.Quiz.course_id == submission.course_id).all()
-    if not quizzes:
+    answer_key = get_answer_key(db, submission.course_id)
+    if not answer_key:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No quiz questions found for this course"
         )
 
-    score = 0
-    total = len(quizzes)
-
-    for quiz in quizzes:
-        quiz_id_str = str(quiz.id)
-        if quiz_id_str in submission.answers:
-            if submission.answers[quiz_id_str].upper() == quiz.correct_answer.upper():
-                score += 1
+    score = grade(answer_key, submission.answers)
+    total = len(answer_key)
 
     percentage = (score / total) * 100 if total > 0 else 0
     certificate_earned = percentage >= 80
 
-    if not progress:
-        progress = models.StudentProgress(
-            student_id=current_user.id,
-            course_id=submission.course_id,
-            quiz_score=score,
-            quiz_total=total,
-            quiz_attempts=1,
-            certificate_earned=certificate_earned
+    created = not progress and insert_ignore(
+        db, models.StudentProgress,
+        student_id=current_user.id,
+        course_id=submission.course_id,
+        quiz_attempts=0
+    )
+    # A no-op UPDATE locks the row on every backend, where SELECT ... FOR UPDATE does nothing on SQLite,
+    # so the stats delta below starts from the state this submit actually replaces
+    locked = None if created else db.execute(
+        update(models.StudentProgress)
+        .where(
+            models.StudentProgress.student_id == current_user.id,
+            models.StudentProgress.course_id == submission.course_id
         )
-        db.add(progress)
-    else:
-        progress.quiz_attempts += 1
-        if score > progress.quiz_score:
-            progress.quiz_score = score
-            progress.quiz_total = total
-        if certificate_earned:
-            progress.certificate_earned = True
-    
+        .values(quiz_attempts=models.StudentProgress.quiz_attempts)
+        .returning(
+            models.StudentProgress.quiz_attempts,
+            models.StudentProgress.quiz_score,
+            models.StudentProgress.quiz_total,
+            models.StudentProgress.certificate_earned
+        )
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    result = db.execute(
+        update(models.StudentProgress)
+        .where(
+            models.StudentProgress.student_id == current_user.id,
+            models.StudentProgress.course_id == submission.course_id,
+            models.StudentProgress.quiz_attempts < 2
+        )
+        .values(
+            quiz_attempts=models.StudentProgress.quiz_attempts + 1,
+            quiz_score=case(
+                (models.StudentProgress.quiz_score < score, score),
+                else_=models.StudentProgress.quiz_score
+            ),
+            quiz_total=case(
+                (models.StudentProgress.quiz_score < score, total),
+                else_=models.StudentProgress.quiz_total
+            ),
+            certificate_earned=or_(models.StudentProgress.certificate_earned, certificate_earned)
+        )
+        .returning(
+            models.StudentProgress.quiz_attempts,
+            models.StudentProgress.quiz_score,
+            models.StudentProgress.quiz_total,
+            models.StudentProgress.certificate_earned
+        )
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if result is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum quiz attempts (2) reached"
+        )
+
+    course_stats.apply_progress_change(
+        db, submission.course_id,
+        course_stats.contribution(locked), course_stats.contribution(result)
+    )
+    certificate_job_id = None
+    if result.certificate_earned and not (locked and locked.certificate_earned):
+        certificate_job_id = certificates.enqueue_certificate(db, current_user.id, submission.course_id)
     db.commit()
-    db.refresh(progress)
+    if certificate_job_id:
+        jobs.runner.wake()
     
     return schemas.QuizResult(
         score=score,
         total=total,
         percentage=percentage,
-        attempts=progress.quiz_attempts,
-        certificate_earned=progress.certificate_earned
+        attempts=result.quiz_attempts,
+        certificate_earned=result.certificate_earned,
+        certificate_job_id=certificate_job_id
     )
+
+@router.post("/submit", response_model=schemas.QuizResult)
+async def submit_quiz(
+    submission: schemas.QuizSubmit,
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return await run_db(db, _submit_quiz, submission, current_user)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query, Response
+from typing import List, Optional
+from database import get_db, run_db
+from deps import get_current_user
+import models
+import schemas
+import queries
+import search
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("/", response_model=List[schemas.SearchHit])
+async def search_content(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(search.SEARCH_PAGE_SIZE, ge=1, le=search.SEARCH_MAX_PAGE_SIZE),
+    db = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    hits, next_cursor = await run_db(db, search.search, q, current_user, cursor, limit)
+    queries.set_next_cursor(response, next_cursor)
+    return hits
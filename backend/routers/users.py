@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from typing import List, Optional
+from database import get_db, run_db
 import models
 import schemas
+import queries
+from user_cache import invalidate_user
+from passwords import hash_password
+import certificates
+import http_cache
+import jobs
+import search
+from catalog_cache import catalog_cache
+from serialization import JSONBytesResponse, RowSerializer
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
-@router.post("/", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+user_rows = RowSerializer(schemas.UserResponse)
+
+def _create_user(db: Session, user: schemas.UserCreate, password_hash: str):
     existing = db.query(models.User).filter(models.User.email == user.email).first()
     if existing:
         raise HTTPException(
@@ -19,7 +29,7 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db_user = models.User(
         name=user.name,
         email=user.email,
-        password=user.password,
+        password=password_hash,
         role=user.role
     )
     db.add(db_user)
@@ -27,12 +37,22 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
-@router.get("/", response_model=List[schemas.UserResponse])
-def get_users(db: Session = Depends(get_db)):
-    return db.query(models.User).all()
+@router.post("/", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
+async def create_user(user: schemas.UserCreate, db = Depends(get_db)):
+    password_hash = await hash_password(user.password)
+    return await run_db(db, _create_user, user, password_hash)
 
-@router.get("/{user_id}", response_model=schemas.UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+@router.get("/", response_model=List[schemas.UserResponse], response_class=JSONBytesResponse)
+async def get_users(
+    role: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(queries.DEFAULT_PAGE_SIZE, ge=1, le=queries.MAX_PAGE_SIZE),
+    db = Depends(get_db)
+):
+    rows, next_cursor = await run_db(db, queries.list_users, role=role, cursor=cursor, limit=limit)
+    return user_rows.response(rows, next_cursor)
+
+def _get_user(db: Session, user_id: int):
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -41,14 +61,27 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
         )
     return user
 
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+@router.get("/{user_id}", response_model=schemas.UserResponse)
+async def get_user(user_id: int, db = Depends(get_db)):
+    return await run_db(db, _get_user, user_id)
+
+def _delete_user(db: Session, user_id: int):
+    user = _get_user(db, user_id)
+    course_ids = [course.id for course in user.courses]
+    certificates.remove_for(db, student_id=user_id, course_ids=course_ids)
+    jobs.disown(db, user_id)
     db.delete(user)
+    for course_id in course_ids:
+        search.remove_course(db, course_id)
+    if course_ids:
+        http_cache.bump(db, http_cache.CATALOG, *(
+            key for course_id in course_ids for key in http_cache.course_keys(course_id)
+        ))
     db.commit()
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(user_id: int, db = Depends(get_db)):
+    await run_db(db, _delete_user, user_id)
+    invalidate_user(user_id)
+    await catalog_cache.invalidate()
     return None
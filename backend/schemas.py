@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, EmailStr
-from typing import Optional, Dict
+from typing import Any, Optional, Dict, List
 
 class UserCreate(BaseModel):
     name: str
@@ -16,6 +17,11 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TokenUser(BaseModel):
+    id: int
+    name: str
+    role: str
+
 class LoginRequest(BaseModel):
     email: str
     password: str
@@ -58,6 +64,16 @@ class LessonResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class LessonSummary(BaseModel):
+    id: int
+    title: str
+    course_id: int
+    content_size: int
+    content_hash: Optional[str]
+    
+    class Config:
+        from_attributes = True
+
 class QuizCreate(BaseModel):
     question: str
     option_a: str
@@ -89,6 +105,7 @@ class QuizResult(BaseModel):
     percentage: float
     attempts: int
     certificate_earned: bool
+    certificate_job_id: Optional[int] = None
 
 class EnrollmentCreate(BaseModel):
     user_id: int
@@ -126,3 +143,99 @@ class ProgressResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class CourseSummary(BaseModel):
+    course_id: int
+    students: int
+    attempted: int
+    average_percentage: float
+    pass_rate: float
+    passed: int
+    certificates: int
+    attempt_distribution: Dict[str, int]
+
+class DashboardCourse(BaseModel):
+    enrollment_id: int
+    course: CourseResponse
+    progress: Optional[ProgressResponse] = None
+
+class StudentDashboard(BaseModel):
+    user: UserResponse
+    courses: List[DashboardCourse]
+
+class QuizView(BaseModel):
+    course: CourseResponse
+    quizzes: List[QuizResponse]
+    progress: Optional[ProgressResponse] = None
+
+class CertificateView(BaseModel):
+    student_id: int
+    student_name: str
+    course_id: int
+    course_title: str
+    quiz_score: int
+    quiz_total: int
+    issued_at: Optional[datetime] = None
+    verification_hash: Optional[str] = None
+
+class CertificateVerification(BaseModel):
+    student_name: str
+    course_title: str
+    quiz_score: int
+    quiz_total: int
+    issued_at: datetime
+
+class LessonBulkItem(BaseModel):
+    title: str
+    content: Optional[str] = None
+
+class LessonBulkCreate(BaseModel):
+    course_id: int
+    lessons: List[LessonBulkItem]
+
+class QuizBulkItem(BaseModel):
+    question: str
+    option_a: str
+    option_b: str
+    option_c: str
+    option_d: str
+    correct_answer: str
+
+class QuizBulkCreate(BaseModel):
+    course_id: int
+    quizzes: List[QuizBulkItem]
+
+class EnrollmentBulkCreate(BaseModel):
+    course_id: int
+    user_ids: List[int]
+
+class BulkRowResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkRowResult]
+
+class JobStatus(BaseModel):
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+class SearchHit(BaseModel):
+    kind: str
+    id: int
+    course_id: int
+    course_title: str
+    title: str
+    snippet: Optional[str] = None
+    score: float
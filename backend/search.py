@@ -0,0 +1,228 @@
+import html
+import re
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select, text, update
+from sqlalchemy.orm import Session
+import lesson_content
+import models
+import schemas
+from queries import decode_cursor, encode_cursor
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+SEARCH_MAX_TERMS = 8
+SNIPPET_WORDS = 24
+SNIPPET_SOURCE_CHARS = 20000
+REBUILD_BATCH_SIZE = 1000
+
+START_MARK = "\x02"
+STOP_MARK = "\x03"
+
+TERM = re.compile(r"\w+")
+
+def index_course(db: Session, course):
+    _upsert_document(db, "course", course.id, course.id, course.title, _stored_body(course.description))
+
+def index_lesson(db: Session, lesson):
+    _upsert_document(db, "lesson", lesson.id, lesson.course_id, lesson.title,
+                     _stored_body(lesson.content, lesson.content_compressed, lesson.content_encoding))
+
+def index_new_lessons(db: Session, lessons):
+    if lessons:
+        documents = [
+            {"kind": "lesson", "ref_id": lesson_id, "course_id": row["course_id"], "title": row["title"],
+             **_stored_body(row["content"], row["content_compressed"], row["content_encoding"])}
+            for lesson_id, row in lessons
+        ]
+        db.execute(insert(models.SearchDocument), documents)
+        _index_postgresql(db, documents)
+
+def remove_course(db: Session, course_id: int):
+    db.execute(
+        delete(models.SearchDocument).where(models.SearchDocument.course_id == course_id)
+        .execution_options(synchronize_session=False)
+    )
+
+def _stored_body(content, compressed=None, encoding=None):
+    return {"body": content, "body_compressed": compressed, "body_encoding": encoding}
+
+def _upsert_document(db: Session, kind: str, ref_id: int, course_id: int, title: str, body: dict):
+    values = {"course_id": course_id, "title": title, **body}
+    updated = db.execute(
+        update(models.SearchDocument)
+        .where(models.SearchDocument.kind == kind, models.SearchDocument.ref_id == ref_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        db.execute(insert(models.SearchDocument).values(kind=kind, ref_id=ref_id, **values))
+    _index_postgresql(db, [{"kind": kind, "ref_id": ref_id, **values}])
+
+POSTGRESQL_DOCUMENT = (
+    "UPDATE search_documents SET document = "
+    "setweight(to_tsvector('english', coalesce(:title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(:text, '')), 'B') "
+    "WHERE kind = :kind AND ref_id = :ref_id"
+)
+
+def _index_postgresql(db: Session, documents):
+    # SQLite's triggers decompress through unpack_text; PostgreSQL gets the tsvector from here
+    if documents and db.get_bind().dialect.name == "postgresql":
+        db.execute(text(POSTGRESQL_DOCUMENT), [
+            {"kind": document["kind"], "ref_id": document["ref_id"], "title": document["title"],
+             "text": lesson_content.unpack(document["body"], document["body_compressed"], document["body_encoding"])}
+            for document in documents
+        ])
+
+def rebuild(db: Session):
+    db.execute(delete(models.SearchDocument))
+    db.execute(text(
+        "INSERT INTO search_documents (kind, ref_id, course_id, title, body) "
+        "SELECT 'course', id, id, title, description FROM courses"
+    ))
+    db.execute(text(
+        "INSERT INTO search_documents (kind, ref_id, course_id, title, body, body_compressed, body_encoding) "
+        "SELECT 'lesson', id, course_id, title, content, content_compressed, content_encoding FROM lessons"
+    ))
+    if db.get_bind().dialect.name == "postgresql":
+        documents = db.execute(
+            select(
+                models.SearchDocument.kind, models.SearchDocument.ref_id, models.SearchDocument.title,
+                models.SearchDocument.body, models.SearchDocument.body_compressed, models.SearchDocument.body_encoding
+            ).execution_options(yield_per=REBUILD_BATCH_SIZE)
+        )
+        for batch in documents.partitions():
+            _index_postgresql(db, [row._mapping for row in batch])
+    db.commit()
+    return db.query(models.SearchDocument).count()
+
+def query_terms(query: str):
+    return TERM.findall(query.lower())[:SEARCH_MAX_TERMS]
+
+HIT_COLUMNS = (
+    "d.id AS document_id, d.kind, d.ref_id, d.course_id, d.title, "
+    "c.title AS course_title, c.teacher_id"
+)
+
+def _sqlite_match(terms):
+    return " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+
+SQLITE_PAGE = (
+    f"SELECT {HIT_COLUMNS}, m.score "
+    "FROM (SELECT rowid, -rank AS score FROM search_index "
+    "WHERE search_index MATCH :match AND rank MATCH 'bm25(4.0, 1.0)' ORDER BY rank LIMIT :window) m "
+    "JOIN search_documents d ON d.id = m.rowid "
+    "JOIN courses c ON c.id = d.course_id "
+    "WHERE c.is_active "
+    "ORDER BY m.score DESC, d.id LIMIT :limit OFFSET :offset"
+)
+
+def _sqlite_page(db: Session, terms, offset: int, limit: int):
+    params = {"match": _sqlite_match(terms), "limit": limit, "offset": offset}
+    rows = db.execute(text(SQLITE_PAGE), {**params, "window": (offset + limit) * 2}).all()
+    if len(rows) < limit:
+        rows = db.execute(text(SQLITE_PAGE), {**params, "window": -1}).all()
+    return rows
+
+def _sqlite_snippets(db: Session, terms, document_ids):
+    # "+rowid" keeps the IN list out of the FTS5 index so the MATCH doclist is walked once, not once per id
+    rows = db.execute(text(
+        "SELECT rowid, snippet(search_index, 1, :start, :stop, '…', :words) FROM search_index "
+        f"WHERE search_index MATCH :match AND +rowid IN ({', '.join(str(int(i)) for i in document_ids)})"
+    ), {"match": _sqlite_match(terms), "start": START_MARK, "stop": STOP_MARK, "words": SNIPPET_WORDS})
+    return dict(rows.all())
+
+def _postgresql_query(terms):
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+def _postgresql_page(db: Session, terms, offset: int, limit: int):
+    return db.execute(text(
+        f"SELECT {HIT_COLUMNS}, ts_rank_cd(d.document, q) AS score "
+        "FROM search_documents d "
+        "JOIN courses c ON c.id = d.course_id, "
+        "to_tsquery('english', :query) q "
+        "WHERE d.document @@ q AND c.is_active "
+        "ORDER BY score DESC, d.id LIMIT :limit OFFSET :offset"
+    ), {"query": _postgresql_query(terms), "limit": limit, "offset": offset}).all()
+
+def _postgresql_snippets(db: Session, terms, document_ids):
+    documents = db.execute(
+        select(
+            models.SearchDocument.id, models.SearchDocument.body,
+            models.SearchDocument.body_compressed, models.SearchDocument.body_encoding
+        ).where(models.SearchDocument.id.in_(document_ids))
+    ).all()
+    options = (
+        f"StartSel={START_MARK}, StopSel={STOP_MARK}, MaxWords={SNIPPET_WORDS}, "
+        "MinWords=10, MaxFragments=1, FragmentDelimiter=…"
+    )
+    rows = db.execute(text(
+        "SELECT t.id, ts_headline('english', t.body, to_tsquery('english', :query), :options) "
+        "FROM unnest(CAST(:ids AS integer[]), CAST(:bodies AS text[])) AS t(id, body)"
+    ), {
+        "ids": [document.id for document in documents],
+        "bodies": [
+            (lesson_content.unpack(document.body, document.body_compressed, document.body_encoding) or "")
+            [:SNIPPET_SOURCE_CHARS]
+            for document in documents
+        ],
+        "query": _postgresql_query(terms),
+        "options": options
+    })
+    return dict(rows.all())
+
+BACKENDS = {
+    "sqlite": (_sqlite_page, _sqlite_snippets),
+    "postgresql": (_postgresql_page, _postgresql_snippets),
+}
+
+def _highlight(snippet):
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(START_MARK, "<mark>").replace(STOP_MARK, "</mark>")
+
+def _readable_course_ids(db: Session, current_user, rows):
+    if current_user.role == "teacher":
+        return {row.course_id for row in rows if row.teacher_id == current_user.id}
+    lesson_course_ids = {row.course_id for row in rows if row.kind == "lesson"}
+    if not lesson_course_ids:
+        return set()
+    return {course_id for (course_id,) in db.query(models.Enrollment.course_id).filter(
+        models.Enrollment.user_id == current_user.id,
+        models.Enrollment.course_id.in_(lesson_course_ids)
+    )}
+
+def search(db: Session, query: str, current_user, cursor=None, limit=SEARCH_PAGE_SIZE):
+    backend = BACKENDS.get(db.get_bind().dialect.name)
+    if backend is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is not available on this database"
+        )
+    terms = query_terms(query)
+    if not terms:
+        return [], None
+
+    page, snippets = backend
+    offset = decode_cursor(cursor) if cursor else 0
+    rows = page(db, terms, offset, limit + 1)
+    next_cursor = encode_cursor(offset + limit) if len(rows) > limit else None
+    rows = rows[:limit]
+    if not rows:
+        return [], None
+
+    readable = _readable_course_ids(db, current_user, rows)
+    visible = [row.document_id for row in rows if row.kind == "course" or row.course_id in readable]
+    highlighted = snippets(db, terms, visible) if visible else {}
+    return [
+        schemas.SearchHit(
+            kind=row.kind,
+            id=row.ref_id,
+            course_id=row.course_id,
+            course_title=row.course_title,
+            title=row.title,
+            snippet=_highlight(highlighted.get(row.document_id)),
+            score=float(row.score)
+        )
+        for row in rows
+    ], next_cursor
@@ -1,11 +1,41 @@
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
+from cache import TTLCache
 
 SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret-key-change-in-production-minimum-32-chars")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+TOKEN_USER_CLAIMS = os.environ.get("TOKEN_USER_CLAIMS", "false").lower() in ("1", "true", "yes")
+
+JWT_CACHE_MAX_SIZE = int(os.environ.get("JWT_CACHE_MAX_SIZE", "50000"))
+JWT_CACHE_TTL_SECONDS = float(os.environ.get("JWT_CACHE_TTL_SECONDS", str(ACCESS_TOKEN_EXPIRE_MINUTES * 60)))
+
+def parse_signing_keys(value: str):
+    keys = {}
+    for entry in value.split(","):
+        if entry.strip():
+            kid, secret = entry.strip().split(":", 1)
+            keys[kid] = secret
+    return keys
+
+SIGNING_KEYS = parse_signing_keys(os.environ.get("JWT_KEYS", "")) or {"default": SECRET_KEY}
+ACTIVE_KID = os.environ.get("JWT_ACTIVE_KID") or next(iter(SIGNING_KEYS))
+
+if ACTIVE_KID not in SIGNING_KEYS:
+    raise RuntimeError(f"JWT_ACTIVE_KID {ACTIVE_KID!r} is not one of the JWT_KEYS")
+
+token_cache = TTLCache(JWT_CACHE_MAX_SIZE, JWT_CACHE_TTL_SECONDS)
+
+def user_token_claims(user):
+    claims = {"sub": str(user.id)}
+    if TOKEN_USER_CLAIMS:
+        claims["role"] = user.role
+        claims["name"] = user.name
+    return claims
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -14,12 +44,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(
+        to_encode, SIGNING_KEYS[ACTIVE_KID], algorithm=ALGORITHM, headers={"kid": ACTIVE_KID}
+    )
     return encoded_jwt
 
+def _verify(token: str):
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is not None:
+        if kid not in SIGNING_KEYS:
+            raise JWTError("Unknown key id")
+        return jwt.decode(token, SIGNING_KEYS[kid], algorithms=[ALGORITHM])
+    
+    # Tokens issued before key ids were introduced carry no kid header
+    for secret in SIGNING_KEYS.values():
+        try:
+            return jwt.decode(token, secret, algorithms=[ALGORITHM])
+        except JWTError as exc:
+            error = exc
+    raise error
+
 def decode_access_token(token: str):
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return dict(payload)
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = _verify(token)
     except JWTError:
         return None
+    
+    if isinstance(payload.get("exp"), (int, float)):
+        token_cache.set(digest, payload, ttl=payload["exp"] - time.time())
+    return dict(payload)
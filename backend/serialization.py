@@ -0,0 +1,35 @@
+import json
+from typing import List
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+from queries import set_next_cursor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class JSONBytesResponse(JSONResponse):
+    def render(self, content):
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class RowSerializer:
+    def __init__(self, schema):
+        fields = {name: field.annotation for name, field in schema.model_fields.items()}
+        self.adapter = TypeAdapter(List[TypedDict(f"{schema.__name__}Row", fields)])
+
+    def dump(self, rows):
+        if not rows:
+            return b"[]"
+        keys = rows[0]._fields
+        return self.adapter.dump_json(self.adapter.validate_python([dict(zip(keys, row)) for row in rows]))
+
+    def response(self, rows, next_cursor=None):
+        response = JSONBytesResponse(self.dump(rows))
+        set_next_cursor(response, next_cursor)
+        return response
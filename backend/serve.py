@@ -0,0 +1,312 @@
+import sys
+sys.path.insert(0, '.')
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import subprocess
+import time
+
+SERVE_HOST = os.environ.get("SERVE_HOST", "0.0.0.0")
+SERVE_PORT = int(os.environ.get("SERVE_PORT", "8000"))
+SERVE_WORKERS = int(os.environ.get("SERVE_WORKERS", "0")) or os.cpu_count() or 1
+SERVE_BACKLOG = int(os.environ.get("SERVE_BACKLOG", "2048"))
+SERVE_GRACEFUL_TIMEOUT_SECONDS = float(os.environ.get("SERVE_GRACEFUL_TIMEOUT_SECONDS", "30"))
+SERVE_BOOT_TIMEOUT_SECONDS = float(os.environ.get("SERVE_BOOT_TIMEOUT_SECONDS", "60"))
+SERVE_WARM_CONNECTIONS = os.environ.get("SERVE_WARM_CONNECTIONS")
+
+LISTEN_FD_ENV = "SERVE_LISTEN_FD"
+DRAIN_PIDS_ENV = "SERVE_DRAIN_PIDS"
+
+logger = logging.getLogger("serve")
+
+def elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+def listen_socket(host, port, backlog):
+    inherited = os.environ.pop(LISTEN_FD_ENV, None)
+    if inherited is not None:
+        sock = socket.socket(fileno=int(inherited))
+        sock.set_inheritable(False)
+        return sock
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+async def _warm_async_dialect(async_engine):
+    async with async_engine.connect() as connection:
+        await connection.exec_driver_sql("SELECT 1")
+    await async_engine.dispose()
+
+def preload():
+    timings = {}
+    started = time.perf_counter()
+    import main
+    timings["import_ms"] = elapsed_ms(started)
+
+    started = time.perf_counter()
+    from sqlalchemy.orm import configure_mappers
+    configure_mappers()
+    main.app.middleware_stack = main.app.build_middleware_stack()
+    main.app.openapi()
+    timings["configure_ms"] = elapsed_ms(started)
+
+    started = time.perf_counter()
+    import database
+    with database.engine.connect() as connection:
+        connection.exec_driver_sql("SELECT 1")
+    database.engine.dispose()
+    if database.async_engine is not None:
+        asyncio.run(_warm_async_dialect(database.async_engine))
+    timings["database_ms"] = elapsed_ms(started)
+
+    gc.collect()
+    gc.freeze()
+    return main.app, timings
+
+def warm_connections(count):
+    import database
+    if database.async_engine is not None:
+        return
+    connections = [database.engine.connect() for _ in range(count)]
+    for connection in connections:
+        connection.close()
+
+async def warm_async_connections(count):
+    import database
+    if database.async_engine is None:
+        return
+    connections = [await database.async_engine.connect() for _ in range(count)]
+    for connection in connections:
+        await connection.close()
+
+def run_worker(app, sock, ready_fd, args):
+    import uvicorn
+    import database
+
+    started = time.perf_counter()
+    arbiter_pid = os.getppid()
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+        signal.signal(signum, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.set_wakeup_fd(-1)
+
+    database.engine.dispose(close=False)
+    if database.async_engine is not None:
+        database.async_engine.sync_engine.dispose(close=False)
+    for replica in database.replica_set.replicas:
+        replica.engine.dispose(close=False)
+    warm_connections(args.warm_connections)
+
+    class WorkerServer(uvicorn.Server):
+        async def startup(self, sockets=None):
+            await warm_async_connections(args.warm_connections)
+            await super().startup(sockets=sockets)
+            if self.started:
+                os.write(ready_fd, f"{os.getpid()} {elapsed_ms(started)}\n".encode())
+
+        async def on_tick(self, counter):
+            if os.getppid() != arbiter_pid:
+                self.should_exit = True
+            return await super().on_tick(counter)
+
+    config = uvicorn.Config(
+        app,
+        log_level=args.log_level,
+        access_log=args.access_log,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=args.proxy_headers,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+    )
+    WorkerServer(config).run(sockets=[sock])
+
+class Arbiter:
+    def __init__(self, app, sock, args, timings):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.timings = timings
+        self.workers = {}
+        self.ready = set()
+        self.retiring = {int(pid) for pid in os.environ.pop(DRAIN_PIDS_ENV, "").split(",") if pid}
+        self.retire_deadline = None
+        self.stopping = False
+        self.signals = []
+        self.boot_started = time.perf_counter()
+        self.boot_logged = False
+        self.ready_r, self.ready_w = os.pipe()
+        self.wakeup_r, self.wakeup_w = os.pipe()
+        os.set_blocking(self.wakeup_w, False)
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                os.close(self.ready_r)
+                os.close(self.wakeup_r)
+                os.close(self.wakeup_w)
+                run_worker(self.app, self.sock, self.ready_w, self.args)
+            except BaseException:
+                logger.exception("Worker %s failed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.perf_counter()
+        return pid
+
+    def handle_signal(self, signum, frame):
+        self.signals.append(signum)
+
+    def install_signals(self):
+        signal.set_wakeup_fd(self.wakeup_w)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, self.handle_signal)
+
+    def run(self):
+        self.install_signals()
+        for _ in range(self.args.workers):
+            self.spawn()
+
+        while self.workers or self.retiring:
+            readable, _, _ = select.select([self.ready_r, self.wakeup_r], [], [], 1.0)
+            if self.wakeup_r in readable:
+                os.read(self.wakeup_r, 512)
+            if self.ready_r in readable:
+                self.read_ready()
+            while self.signals:
+                signum = self.signals.pop(0)
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    self.stop()
+                elif signum == signal.SIGHUP and not self.stopping:
+                    self.reload()
+            self.reap()
+            self.check_deadlines()
+
+        self.sock.close()
+        logger.info("Shut down")
+
+    def read_ready(self):
+        for line in os.read(self.ready_r, 4096).decode().splitlines():
+            pid, warm_ms = line.split()
+            self.ready.add(int(pid))
+            logger.info("Worker %s ready in %s ms", pid, warm_ms)
+
+        if not self.boot_logged and self.ready >= set(self.workers):
+            self.boot_logged = True
+            logger.info(
+                "%s worker(s) listening on %s:%s, boot took %s ms (%s)",
+                len(self.workers), self.args.host, self.args.port, elapsed_ms(self.boot_started),
+                ", ".join(f"{name} {value}" for name, value in self.timings.items()),
+            )
+            if self.retiring:
+                logger.info("Draining %s old worker(s)", len(self.retiring))
+                self.signal_all(self.retiring, signal.SIGTERM)
+                self.retire_deadline = time.perf_counter() + self.args.graceful_timeout
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            code = os.waitstatus_to_exitcode(status)
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                continue
+            self.workers.pop(pid, None)
+            was_ready = pid in self.ready
+            self.ready.discard(pid)
+            if self.stopping:
+                continue
+            if not was_ready:
+                logger.error("Worker %s exited with %s before it was ready, shutting down", pid, code)
+                self.stop()
+                continue
+            logger.warning("Worker %s exited with %s, starting a replacement", pid, code)
+            self.spawn()
+
+    def check_deadlines(self):
+        now = time.perf_counter()
+        if self.retire_deadline is not None and now > self.retire_deadline:
+            self.signal_all(self.retiring, signal.SIGKILL)
+            self.retire_deadline = None
+        if self.stopping and now > self.stop_deadline:
+            self.signal_all(self.workers, signal.SIGKILL)
+            self.signal_all(self.retiring, signal.SIGKILL)
+        if not self.boot_logged and now - self.boot_started > self.args.boot_timeout:
+            logger.error("Workers did not become ready within %s s, shutting down", self.args.boot_timeout)
+            self.boot_logged = True
+            self.stop()
+
+    def signal_all(self, pids, signum):
+        for pid in list(pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def stop(self):
+        if self.stopping:
+            return
+        logger.info("Draining %s worker(s)", len(self.workers) + len(self.retiring))
+        self.stopping = True
+        self.stop_deadline = time.perf_counter() + self.args.graceful_timeout + 5
+        self.signal_all(self.workers, signal.SIGTERM)
+        self.signal_all(self.retiring, signal.SIGTERM)
+
+    def reload(self):
+        if not self.boot_logged or self.retiring:
+            logger.warning("Reload ignored, the previous boot or reload has not finished")
+            return
+        check = subprocess.run([sys.executable, "-c", "import main"], capture_output=True, text=True)
+        if check.returncode != 0:
+            logger.error("Reload aborted, the new code does not import:\n%s", check.stderr)
+            return
+
+        logger.info("Reloading, %s worker(s) will drain once the new ones are ready", len(self.workers))
+        self.sock.set_inheritable(True)
+        os.environ[LISTEN_FD_ENV] = str(self.sock.fileno())
+        os.environ[DRAIN_PIDS_ENV] = ",".join(str(pid) for pid in self.workers)
+        signal.set_wakeup_fd(-1)
+        os.execv(sys.executable, [sys.executable] + sys.orig_argv[1:])
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the API from several preloaded worker processes")
+    parser.add_argument("--host", default=SERVE_HOST)
+    parser.add_argument("--port", type=int, default=SERVE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS, help="worker processes (default: CPU count)")
+    parser.add_argument("--backlog", type=int, default=SERVE_BACKLOG)
+    parser.add_argument("--graceful-timeout", type=float, default=SERVE_GRACEFUL_TIMEOUT_SECONDS,
+                        help="seconds a draining worker gets to finish in-flight requests")
+    parser.add_argument("--boot-timeout", type=float, default=SERVE_BOOT_TIMEOUT_SECONDS)
+    parser.add_argument("--warm-connections", type=int, default=None,
+                        help="database connections each worker opens before accepting (default: DB_POOL_SIZE)")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action="store_true")
+    parser.add_argument("--proxy-headers", action="store_true")
+    parser.add_argument("--forwarded-allow-ips", default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(asctime)s [%(process)d] %(levelname)s %(message)s")
+    logger.setLevel(args.log_level.upper())
+    sock = listen_socket(args.host, args.port, args.backlog)
+    app, timings = preload()
+    if args.warm_connections is None:
+        import database
+        args.warm_connections = int(SERVE_WARM_CONNECTIONS or database.DB_POOL_SIZE)
+    Arbiter(app, sock, args, timings).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import sqlite3
+import time
+
+def sqlite_path(url: str):
+    return url.removeprefix("sqlite:///")
+
+def replicate(primary: str, replicas):
+    source = sqlite3.connect(sqlite_path(primary))
+    try:
+        for replica in replicas:
+            target = sqlite3.connect(sqlite_path(replica), timeout=30)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+    finally:
+        source.close()
+
+def run(primary: str, replicas, interval: float, once=False):
+    print(f"Copying {primary} to {', '.join(replicas)} every {interval}s")
+    while True:
+        replicate(primary, replicas)
+        if once:
+            return
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy a SQLite primary into stand-in read replicas on an interval")
+    parser.add_argument("primary", help="primary database file or sqlite:/// URL")
+    parser.add_argument("replicas", nargs="+", help="replica database files or sqlite:/// URLs")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between copies, i.e. the simulated lag")
+    parser.add_argument("--once", action="store_true", help="copy once and exit")
+    args = parser.parse_args()
+    try:
+        run(args.primary, args.replicas, args.interval, args.once)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,144 @@
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="ecolearn_tests_"), "ecolearn.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from answer_keys import answer_key_cache
+from catalog_cache import catalog_cache
+from database import Base, SessionLocal, async_engine, engine
+from security import create_access_token, token_cache
+from user_cache import user_cache
+import migrations
+import main
+
+RACE_WINDOW_SECONDS = 0.02
+BOOT_TIMEOUT_SECONDS = 30
+KEPT_TABLES = {"resource_versions", "replica_heartbeat", "schema_migrations"}
+
+def reset_state():
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in KEPT_TABLES:
+                connection.execute(table.delete())
+    user_cache.clear()
+    answer_key_cache.clear()
+    token_cache.clear()
+    asyncio.run(catalog_cache.invalidate())
+    if async_engine is not None:
+        # The async pool's wait queue binds to the first event loop that waits on it, and each test runs its own
+        asyncio.run(async_engine.dispose())
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    migrations.upgrade(engine)
+    yield
+    engine.dispose()
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    reset_state()
+    yield
+
+@pytest.fixture
+def reset():
+    return reset_state
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+@pytest.fixture
+def auth_headers():
+    def headers(user):
+        token = create_access_token(data={"sub": str(user.id)})
+        return {"Authorization": f"Bearer {token}"}
+    return headers
+
+@pytest.fixture
+def count_statements():
+    targets = [engine] if async_engine is None else [engine, async_engine.sync_engine]
+
+    @contextlib.contextmanager
+    def counting():
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        for target in targets:
+            event.listen(target, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            for target in targets:
+                event.remove(target, "before_cursor_execute", count)
+
+    return counting
+
+@pytest.fixture
+def slow_stats_update():
+    # Hold each progress write open after it has read the old row, so concurrent writes overlap it
+    target = engine if async_engine is None else async_engine.sync_engine
+
+    def pause(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE course_stats"):
+            time.sleep(RACE_WINDOW_SECONDS)
+
+    event.listen(target, "before_cursor_execute", pause)
+    yield
+    event.remove(target, "before_cursor_execute", pause)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def start_worker():
+    started = []
+
+    def start(**env):
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning"],
+            cwd=BACKEND_DIR, env={**os.environ, "JOB_RUNNER": "worker", **env},
+        )
+        client = httpx.Client(base_url=f"http://127.0.0.1:{port}")
+        started.append((process, client))
+        deadline = time.monotonic() + BOOT_TIMEOUT_SECONDS
+        while True:
+            try:
+                if client.get("/health").status_code == 200:
+                    return client
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"worker on port {port} did not start")
+            time.sleep(0.1)
+
+    yield start
+    for process, client in started:
+        client.close()
+        process.terminate()
+        process.wait(10)
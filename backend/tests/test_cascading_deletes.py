@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import event
+import certificates
+import jobs
+import models
+from database import async_engine, engine
+
+def enable_foreign_keys(dbapi_connection, connection_record):
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+@pytest.fixture
+def foreign_keys():
+    # SQLite only enforces foreign keys on connections that opt in, so reconnect with enforcement on
+    targets = [engine] if async_engine is None else [engine, async_engine.sync_engine]
+    for target in targets:
+        event.listen(target, "connect", enable_foreign_keys)
+        target.dispose()
+    yield
+    for target in targets:
+        event.remove(target, "connect", enable_foreign_keys)
+        target.dispose()
+
+def seed(db):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    student = models.User(name="Student", email="student@test", password="pw", role="student")
+    db.add_all([teacher, student])
+    db.flush()
+    course = models.Course(title="Course", description="d", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    db.add(models.Enrollment(user_id=student.id, course_id=course.id))
+    db.add(models.StudentProgress(student_id=student.id, course_id=course.id, quiz_score=1, quiz_total=1,
+                                  quiz_attempts=1, certificate_earned=True))
+    db.commit()
+    certificates.enqueue_certificate(db, student.id, course.id)
+    db.commit()
+    (job,) = jobs.claim(db, jobs.claimable_ids(db, 1))
+    assert jobs.run_job(job)
+    assert db.query(models.Certificate).count() == 1
+    return teacher.id, student.id
+
+@pytest.mark.parametrize("deleted", ["student", "teacher"])
+def test_deleting_a_user_removes_their_certificates(deleted, db, client, foreign_keys):
+    teacher_id, student_id = seed(db)
+    user_id = student_id if deleted == "student" else teacher_id
+
+    response = client.delete(f"/users/{user_id}")
+
+    assert response.status_code == 204, response.text
+    assert db.get(models.User, user_id) is None
+    assert db.query(models.Certificate).count() == 0
+    assert db.query(models.Job.owner_id).all() == [(None if deleted == "student" else student_id,)]
+
+def test_deleting_a_course_removes_its_certificates(db, client, auth_headers, foreign_keys):
+    teacher_id, _ = seed(db)
+    course_id = db.query(models.Course.id).scalar()
+    db.query(models.Enrollment).delete()
+    db.commit()
+
+    response = client.delete(f"/courses/{course_id}", headers=auth_headers(db.get(models.User, teacher_id)))
+
+    assert response.status_code == 204, response.text
+    assert db.query(models.Certificate).count() == 0
@@ -0,0 +1,50 @@
+import asyncio
+from catalog_cache import CatalogCache, CatalogPage, MemoryBackend
+
+def test_waiter_takes_over_when_the_builder_is_cancelled():
+    async def scenario():
+        cache = CatalogCache(MemoryBackend())
+        started = asyncio.Event()
+        builds = []
+
+        async def build():
+            builds.append(len(builds))
+            started.set()
+            await asyncio.sleep(0 if len(builds) > 1 else 10)
+            return CatalogPage('"etag"', None, b"[]")
+
+        builder = asyncio.create_task(cache.get_or_build("page", build))
+        await started.wait()
+        waiters = [asyncio.create_task(cache.get_or_build("page", build)) for _ in range(3)]
+        await asyncio.sleep(0)
+        builder.cancel()
+        pages = await asyncio.gather(*waiters)
+        return builder, pages, builds, cache
+
+    builder, pages, builds, cache = asyncio.run(scenario())
+    assert builder.cancelled()
+    assert [page.body for page in pages] == [b"[]"] * 3
+    assert len(builds) == 2
+    assert cache.rebuilds == 1
+
+def test_cancelled_waiter_does_not_cancel_the_build():
+    async def scenario():
+        cache = CatalogCache(MemoryBackend())
+        release = asyncio.Event()
+
+        async def build():
+            await release.wait()
+            return CatalogPage('"etag"', None, b"[]")
+
+        builder = asyncio.create_task(cache.get_or_build("page", build))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_build("page", build))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await builder, waiter
+
+    page, waiter = asyncio.run(scenario())
+    assert page.body == b"[]"
+    assert waiter.cancelled()
@@ -0,0 +1,40 @@
+import re
+import lesson_content
+import models
+
+LESSONS = 20
+CONTENT_SIZES = (1_000, 500_000)
+LESSON_BODY = re.compile(r"\blessons\.content(_compressed)?\b")
+
+def seed(db):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course_ids = []
+    for size in CONTENT_SIZES:
+        course = models.Course(title=f"{size} byte lessons", description="d", teacher_id=teacher.id)
+        db.add(course)
+        db.flush()
+        db.add_all([
+            models.Lesson(title=f"Lesson {i}", course_id=course.id, **lesson_content.pack(f"{i} " + "x" * size))
+            for i in range(LESSONS)
+        ])
+        course_ids.append(course.id)
+    db.commit()
+    return teacher, course_ids
+
+def test_revalidation_is_constant_and_skips_lesson_bodies(db, client, auth_headers, count_statements):
+    teacher, course_ids = seed(db)
+    headers = auth_headers(teacher)
+
+    revalidations = []
+    for course_id in course_ids:
+        url = f"/lessons/course/{course_id}"
+        etag = client.get(url, headers=headers).headers["etag"]
+        with count_statements() as statements:
+            response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert not [statement for statement in statements if LESSON_BODY.search(statement)], statements
+        revalidations.append(statements)
+    assert len(revalidations[0]) == len(revalidations[1])
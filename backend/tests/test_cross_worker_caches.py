@@ -0,0 +1,58 @@
+import pytest
+import models
+
+@pytest.fixture
+def workers(start_worker):
+    return [start_worker() for _ in range(2)]
+
+def seed(db):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    students = [models.User(name=f"Student {i}", email=f"student{i}@test", password="pw", role="student") for i in range(2)]
+    db.add_all([teacher, *students])
+    db.flush()
+    course = models.Course(title="Course", description="d", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    db.add(models.Quiz(question="Q1", option_a="A", option_b="B", option_c="C", option_d="D",
+                       correct_answer="A", course_id=course.id))
+    db.add_all([models.Enrollment(user_id=student.id, course_id=course.id) for student in students])
+    db.commit()
+    return teacher, students, course.id
+
+def test_writes_on_one_worker_reach_the_other_workers_caches(db, auth_headers, workers):
+    writer, reader = workers
+    teacher, (first, second), course_id = seed(db)
+    quiz_ids = [str(quiz_id) for (quiz_id,) in db.query(models.Quiz.id)]
+
+    first_result = reader.post("/quizzes/submit", json={"course_id": course_id, "answers": {quiz_ids[0]: "A"}},
+                               headers=auth_headers(first))
+    assert first_result.json()["total"] == 1
+    assert [course["title"] for course in reader.get("/courses/").json()] == ["Course"]
+
+    created = writer.post("/quizzes/", headers=auth_headers(teacher), json={
+        "question": "Q2", "option_a": "A", "option_b": "B", "option_c": "C", "option_d": "D",
+        "correct_answer": "B", "course_id": course_id
+    })
+    assert created.status_code == 201, created.text
+    answers = {quiz_ids[0]: "A", str(created.json()["id"]): "B"}
+    second_result = reader.post("/quizzes/submit", json={"course_id": course_id, "answers": answers},
+                                headers=auth_headers(second))
+    assert (second_result.json()["score"], second_result.json()["total"]) == (2, 2)
+
+    created = writer.post("/courses/", json={"title": "New course", "description": "d"}, headers=auth_headers(teacher))
+    assert created.status_code == 201, created.text
+    assert [course["title"] for course in reader.get("/courses/").json()] == ["Course", "New course"]
+
+def test_user_changes_reach_the_other_workers_user_caches(db, auth_headers, workers):
+    writer, reader = workers
+    teacher, (student, _), course_id = seed(db)
+    summary = f"/progress/course/{course_id}/summary"
+    assert reader.get(summary, headers=auth_headers(teacher)).status_code == 200
+    assert reader.get("/auth/me", headers=auth_headers(student)).status_code == 200
+
+    db.get(models.User, teacher.id).role = "student"
+    db.commit()
+    assert reader.get(summary, headers=auth_headers(teacher)).status_code == 403
+
+    assert writer.delete(f"/users/{student.id}").status_code == 204
+    assert reader.get("/auth/me", headers=auth_headers(student)).status_code == 401
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import tracemalloc
+from sqlalchemy import insert
+import main
+import models
+
+EXPORT_TEST_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", "1000000"))
+EXPORT_TEST_PEAK_MB = float(os.environ.get("EXPORT_TEST_PEAK_MB", "8"))
+SEED_BATCH = 50000
+
+def seed_course(db, students):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Large course", description="d", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    for start in range(0, students, SEED_BATCH):
+        count = min(SEED_BATCH, students - start)
+        student_ids = db.scalars(
+            insert(models.User).returning(models.User.id, sort_by_parameter_order=True),
+            [
+                {"name": f"Student {start + i}", "email": f"student{start + i}@test", "password": "pw", "role": "student"}
+                for i in range(count)
+            ]
+        ).all()
+        db.execute(insert(models.StudentProgress), [
+            {"student_id": student_id, "course_id": course.id, "quiz_score": 8, "quiz_total": 10, "quiz_attempts": 1}
+            for student_id in student_ids
+        ])
+    db.commit()
+    return teacher, course.id
+
+async def download(path, headers):
+    messages = []
+    received = {"bytes": 0, "lines": 0}
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            messages.append(message)
+        elif message["type"] == "http.response.body":
+            received["bytes"] += len(message.get("body", b""))
+            received["lines"] += message.get("body", b"").count(b"\n")
+            if not message.get("more_body", False):
+                finished.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"format=csv", "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("testclient", 50000), "server": ("testserver", 80),
+    }
+    await main.app(scope, receive, send)
+    return messages[0]["status"], received
+
+def test_large_export_streams_in_bounded_memory(db, auth_headers):
+    teacher, course_id = seed_course(db, EXPORT_TEST_ROWS)
+    headers = auth_headers(teacher)
+
+    tracemalloc.start()
+    try:
+        status_code, received = asyncio.run(download(f"/progress/course/{course_id}/export", headers))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert status_code == 200
+    assert received["lines"] == EXPORT_TEST_ROWS + 1
+    assert peak < EXPORT_TEST_PEAK_MB * 1024 * 1024, (
+        f"exporting {EXPORT_TEST_ROWS} rows ({received['bytes']} bytes) peaked at {peak / 1024 / 1024:.1f} MB"
+    )
@@ -0,0 +1,86 @@
+import hashlib
+import re
+import lesson_content
+import models
+
+BODY = "Solar panels turn sunlight into electricity. " * 400
+LESSON_BODY = re.compile(r"\blessons\.content(_compressed)?\b")
+
+def create_course(db):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Course", description="d", teacher_id=teacher.id)
+    db.add(course)
+    db.commit()
+    return teacher, course.id
+
+def create_lesson(client, headers, course_id, content):
+    created = client.post("/lessons/", json={"title": "Lesson", "content": content, "course_id": course_id},
+                          headers=headers)
+    assert created.status_code == 201, created.text
+    return created.json()["id"]
+
+def test_large_lessons_are_stored_and_indexed_compressed(db, client, auth_headers):
+    teacher, course_id = create_course(db)
+    lesson_id = create_lesson(client, auth_headers(teacher), course_id, BODY)
+
+    lesson = db.get(models.Lesson, lesson_id)
+    assert lesson.content is None
+    assert lesson.content_encoding == lesson_content.codec.name
+    assert len(lesson.content_compressed) < len(BODY) // 10
+    assert lesson.content_size == len(BODY.encode())
+    assert lesson.content_hash == hashlib.sha256(BODY.encode()).hexdigest()
+
+    document = db.query(models.SearchDocument).filter_by(kind="lesson", ref_id=lesson_id).one()
+    assert document.body is None
+    assert lesson_content.unpack(document.body, document.body_compressed, document.body_encoding) == BODY
+
+def test_lesson_list_serves_summaries_without_bodies(db, client, auth_headers, count_statements):
+    teacher, course_id = create_course(db)
+    headers = auth_headers(teacher)
+    lesson_id = create_lesson(client, headers, course_id, BODY)
+
+    with count_statements() as statements:
+        response = client.get(f"/lessons/course/{course_id}", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": lesson_id, "title": "Lesson", "course_id": course_id,
+        "content_size": len(BODY.encode()), "content_hash": hashlib.sha256(BODY.encode()).hexdigest()
+    }]
+    assert not [statement for statement in statements if LESSON_BODY.search(statement)], statements
+
+def test_lesson_body_is_served_compressed_whole_or_by_range(db, client, auth_headers):
+    teacher, course_id = create_course(db)
+    headers = auth_headers(teacher)
+    url = f"/lessons/{create_lesson(client, headers, course_id, BODY)}/content"
+
+    compressed = client.get(url, headers={**headers, "Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"].endswith('-gzip"')
+    assert compressed.text == BODY
+
+    plain = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.text == BODY
+
+    partial = client.get(url, headers={**headers, "Range": "bytes=6-11"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 6-11/{len(BODY)}"
+    assert partial.text == "panels"
+
+    ignored = client.get(url, headers={**headers, "Range": "bytes=11-6"})
+    assert ignored.status_code == 200
+    assert ignored.text == BODY
+
+def test_empty_lessons_are_hashed(db, client, auth_headers):
+    teacher, course_id = create_course(db)
+    headers = auth_headers(teacher)
+    lesson_id = create_lesson(client, headers, course_id, None)
+
+    assert db.get(models.Lesson, lesson_id).content_hash == lesson_content.EMPTY_HASH
+    response = client.get(f"/lessons/{lesson_id}/content", headers=headers)
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{lesson_content.EMPTY_HASH}"'
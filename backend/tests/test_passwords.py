@@ -0,0 +1,18 @@
+import models
+import passwords
+
+class MissingBcrypt(passwords.BcryptHasher):
+    def __init__(self):
+        raise ImportError("No module named 'bcrypt'")
+
+def test_login_with_hash_from_missing_package_is_rejected(db, client, monkeypatch):
+    monkeypatch.setitem(passwords.HASHERS, "bcrypt", MissingBcrypt)
+    monkeypatch.setattr(passwords, "_other_hashers", {})
+    stored = "$2b$12$" + "a" * 53
+    db.add(models.User(name="Legacy", email="legacy@test", password=stored, role="student"))
+    db.commit()
+
+    response = client.post("/auth/login", json={"email": "legacy@test", "password": stored})
+    assert response.status_code == 401
+    response = client.post("/auth/login", json={"email": "legacy@test", "password": "secret-password"})
+    assert response.status_code == 401
@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+import course_stats
+import main
+import models
+
+UPDATES = 16
+
+def test_concurrent_updates_keep_course_stats_in_sync(db, auth_headers, slow_stats_update):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    student = models.User(name="Student", email="student@test", password="pw", role="student")
+    db.add_all([teacher, student])
+    db.flush()
+    course = models.Course(title="Course", description="d", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    db.add(models.StudentProgress(student_id=student.id, course_id=course.id, quiz_attempts=0))
+    db.commit()
+    course_stats.rebuild(db, course.id)
+    headers = auth_headers(student)
+
+    def update(i):
+        return client.post("/progress/update", headers=headers, json={
+            "student_id": student.id, "course_id": course.id, "quiz_attempts": i % 3, "quiz_score": i, "quiz_total": 20
+        })
+
+    with TestClient(main.app) as client, ThreadPoolExecutor(UPDATES) as pool:
+        responses = list(pool.map(update, range(UPDATES)))
+
+    assert all(response.status_code == 200 for response in responses), responses[0].text
+    assert course_stats.check(db) == {}
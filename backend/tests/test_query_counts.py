@@ -0,0 +1,49 @@
+import pytest
+import lesson_content
+import models
+
+N = 5
+
+def seed(db, n):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    student = models.User(name="Student", email="student@test", password="pw", role="student")
+    db.add_all([teacher, student])
+    db.flush()
+    courses = [models.Course(title=f"Course {i}", description="d", teacher_id=teacher.id) for i in range(n)]
+    db.add_all(courses)
+    db.flush()
+    for course in courses:
+        db.add(models.Lesson(title="Lesson", course_id=course.id, **lesson_content.pack("Lesson content")))
+        db.add(models.Enrollment(user_id=student.id, course_id=course.id))
+        db.add(models.StudentProgress(student_id=student.id, course_id=course.id, quiz_score=1, quiz_total=2))
+
+    classmates = [
+        models.User(name=f"Classmate {i}", email=f"classmate{i}@test", password="pw", role="student")
+        for i in range(n - 1)
+    ]
+    db.add_all(classmates)
+    db.flush()
+    for classmate in classmates:
+        db.add(models.Enrollment(user_id=classmate.id, course_id=courses[0].id))
+        db.add(models.StudentProgress(student_id=classmate.id, course_id=courses[0].id, quiz_score=1, quiz_total=2))
+    db.commit()
+    return {"student_id": student.id, "course_id": courses[0].id}
+
+@pytest.mark.parametrize("path", [
+    "/courses/",
+    "/enrollments/student/{student_id}",
+    "/enrollments/course/{course_id}",
+    "/progress/student/{student_id}",
+    "/progress/course/{course_id}",
+])
+def test_list_statements_do_not_grow_with_rows(path, db, client, reset, count_statements):
+    counts = []
+    for n in (N, 10 * N):
+        reset()
+        url = path.format(**seed(db, n))
+        with count_statements() as statements:
+            response = client.get(url)
+        assert response.status_code == 200, response.text
+        assert len(response.json()) == n
+        counts.append(len(statements))
+    assert counts[0] == counts[1], f"{path}: {counts[0]} statements for {N} rows, {counts[1]} for {10 * N}"
@@ -0,0 +1,128 @@
+from datetime import datetime
+import lesson_content
+import models
+import queries
+from database import engine
+
+TEACHERS = 20
+COURSES_PER_TEACHER = 10
+STUDENTS = 2000
+ENROLLMENTS_PER_STUDENT = 5
+ITEMS_PER_COURSE = 20
+
+def seed(db):
+    db.bulk_insert_mappings(models.User, [
+        {"name": f"Teacher {i}", "email": f"teacher{i}@seed", "password": "pw", "role": "teacher"}
+        for i in range(TEACHERS)
+    ] + [
+        {"name": f"Student {i}", "email": f"student{i}@seed", "password": "pw", "role": "student"}
+        for i in range(STUDENTS)
+    ])
+    teacher_ids = [user_id for (user_id,) in db.query(models.User.id).filter(models.User.role == "teacher")]
+    student_ids = [user_id for (user_id,) in db.query(models.User.id).filter(models.User.role == "student")]
+
+    db.bulk_insert_mappings(models.Course, [
+        {"title": f"Course {teacher_id}.{i}", "description": "Seeded course",
+         "teacher_id": teacher_id, "is_active": i % 4 != 0}
+        for teacher_id in teacher_ids for i in range(COURSES_PER_TEACHER)
+    ])
+    course_ids = [course_id for (course_id,) in db.query(models.Course.id)]
+
+    db.bulk_insert_mappings(models.Lesson, [
+        {"title": f"Lesson {i}", "course_id": course_id, **lesson_content.pack("Seeded lesson")}
+        for course_id in course_ids for i in range(ITEMS_PER_COURSE)
+    ])
+    db.bulk_insert_mappings(models.Quiz, [
+        {"question": f"Question {i}", "option_a": "a", "option_b": "b", "option_c": "c", "option_d": "d",
+         "correct_answer": "A", "course_id": course_id}
+        for course_id in course_ids for i in range(ITEMS_PER_COURSE)
+    ])
+
+    pairs = [
+        (student_id, course_ids[(index * 7 + offset) % len(course_ids)])
+        for index, student_id in enumerate(student_ids) for offset in range(ENROLLMENTS_PER_STUDENT)
+    ]
+    db.bulk_insert_mappings(models.Enrollment, [
+        {"user_id": student_id, "course_id": course_id} for student_id, course_id in pairs
+    ])
+    db.bulk_insert_mappings(models.StudentProgress, [
+        {"student_id": student_id, "course_id": course_id, "lesson_completed": True,
+         "quiz_score": 4, "quiz_total": 5, "quiz_attempts": 1, "certificate_earned": True}
+        for student_id, course_id in pairs
+    ])
+    db.commit()
+    db.connection().exec_driver_sql("ANALYZE")
+    db.commit()
+
+def hot_queries(db):
+    return [
+        ("login by email", "users",
+         db.query(models.User).filter(models.User.email == "student@test.com")),
+        ("users by role", "users",
+         db.query(models.User.id).filter(models.User.role == "student").order_by(models.User.id).limit(101)),
+        ("active catalog", "courses",
+         queries.course_listing_query(db).filter(models.Course.is_active == True)
+         .order_by(models.Course.id).limit(101)),
+        ("teacher courses", "courses",
+         queries.course_listing_query(db).filter(models.Course.teacher_id == 1)
+         .order_by(models.Course.id).limit(101)),
+        ("teacher active courses", "courses",
+         queries.course_listing_query(db).filter(models.Course.teacher_id == 1, models.Course.is_active == True)
+         .order_by(models.Course.id).limit(101)),
+        ("course lessons", "lessons",
+         db.query(models.Lesson).filter(models.Lesson.course_id == 1).order_by(models.Lesson.id)),
+        ("course quizzes", "quizzes",
+         db.query(models.Quiz).filter(models.Quiz.course_id == 1).order_by(models.Quiz.id)),
+        ("enrollment check", "enrollments",
+         db.query(models.Enrollment).filter(models.Enrollment.user_id == 2, models.Enrollment.course_id == 1)),
+        ("student enrollments", "enrollments",
+         queries.enrollment_listing_query(db).filter(models.Enrollment.user_id == 2).order_by(models.Enrollment.id)),
+        ("course enrollments", "enrollments",
+         queries.enrollment_listing_query(db).filter(models.Enrollment.course_id == 1)
+         .order_by(models.Enrollment.id).limit(101)),
+        ("progress lookup", "student_progress",
+         db.query(models.StudentProgress).filter(
+             models.StudentProgress.student_id == 2, models.StudentProgress.course_id == 1
+         )),
+        ("student progress", "student_progress",
+         queries.progress_listing_query(db).filter(models.StudentProgress.student_id == 2)
+         .order_by(models.StudentProgress.id)),
+        ("course progress", "student_progress",
+         queries.progress_listing_query(db).filter(models.StudentProgress.course_id == 1)
+         .order_by(models.StudentProgress.id).limit(101)),
+        ("claimable jobs", "jobs",
+         db.query(models.Job.id).filter(
+             models.Job.status.in_(("queued", "running")), models.Job.available_at <= datetime(2030, 1, 1)
+         ).order_by(models.Job.available_at, models.Job.id).limit(8)),
+        ("job by idempotency key", "jobs",
+         db.query(models.Job.id).filter(models.Job.idempotency_key == "certificate:2:1")),
+        ("certificate lookup", "certificates",
+         db.query(models.Certificate.id).filter(
+             models.Certificate.student_id == 2, models.Certificate.course_id == 1
+         )),
+        ("certificate verification", "certificates",
+         db.query(models.Certificate.student_name).filter(models.Certificate.verification_hash == "0" * 64)),
+        ("search document upsert", "search_documents",
+         db.query(models.SearchDocument.id).filter(
+             models.SearchDocument.kind == "lesson", models.SearchDocument.ref_id == 1
+         )),
+        ("search documents by course", "search_documents",
+         db.query(models.SearchDocument.id).filter(models.SearchDocument.course_id == 1)),
+    ]
+
+def explain(connection, sql, table):
+    plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    steps = [step for step in plan if step.split(" ")[1:2] == [table]]
+    ok = bool(steps) and all(step.startswith("SEARCH ") or " USING " in step for step in steps)
+    return ok, plan
+
+def test_hot_queries_are_served_by_indexes(db):
+    seed(db)
+    failures = []
+    with engine.connect() as connection:
+        for name, table, query in hot_queries(db):
+            sql = str(query.statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            ok, plan = explain(connection, sql, table)
+            if not ok:
+                failures.append(f"{name}: {' | '.join(plan)}")
+    assert not failures, "hot queries scan a table without an index:\n" + "\n".join(failures)
@@ -0,0 +1,50 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi.testclient import TestClient
+import course_stats
+import main
+import models
+
+STUDENTS = 4
+SUBMITS = 16
+
+@pytest.mark.parametrize("existing_progress", [False, True])
+def test_concurrent_submits_allow_two_attempts(existing_progress, db, auth_headers, slow_stats_update):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    students = [models.User(name=f"Student {i}", email=f"student{i}@test", password="pw", role="student")
+                for i in range(STUDENTS)]
+    db.add_all([teacher, *students])
+    db.flush()
+    course = models.Course(title="Course", description="d", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    quiz = models.Quiz(question="Q", option_a="A", option_b="B", option_c="C", option_d="D",
+                       correct_answer="A", course_id=course.id)
+    db.add(quiz)
+    for student in students:
+        db.add(models.Enrollment(user_id=student.id, course_id=course.id))
+        if existing_progress:
+            db.add(models.StudentProgress(student_id=student.id, course_id=course.id, quiz_attempts=0))
+    db.commit()
+    course_stats.rebuild(db, course.id)
+    requests = [(student.id, auth_headers(student)) for student in students for _ in range(SUBMITS)]
+
+    def submit(request):
+        student_id, headers = request
+        answer = "A" if student_id % 2 else "B"
+        response = client.post("/quizzes/submit", json={"course_id": course.id, "answers": {str(quiz.id): answer}},
+                               headers=headers)
+        return student_id, response
+
+    with TestClient(main.app) as client, ThreadPoolExecutor(SUBMITS) as pool:
+        responses = list(pool.map(submit, requests))
+
+    for student in students:
+        statuses = Counter(response.status_code for student_id, response in responses if student_id == student.id)
+        assert statuses == {200: 2, 400: SUBMITS - 2}, [response.text for _, response in responses]
+        attempts = sorted(response.json()["attempts"] for student_id, response in responses
+                          if student_id == student.id and response.status_code == 200)
+        assert attempts == [1, 2]
+    assert {progress.quiz_attempts for progress in db.query(models.StudentProgress)} == {2}
+    assert course_stats.check(db) == {}
@@ -0,0 +1,97 @@
+import re
+import time
+import pytest
+import lesson_content
+import models
+import sqlite_replica
+from database import LAST_WRITE_HEADER, engine
+
+MAX_LAG_SECONDS = 2
+WAIT_SECONDS = 10
+STATEMENTS = re.compile(r'desc="(\d+) statements"')
+
+@pytest.fixture
+def replica_urls(tmp_path):
+    return [f"sqlite:///{tmp_path / f'replica_{i}.db'}" for i in (1, 2)]
+
+@pytest.fixture
+def worker(start_worker, replica_urls):
+    return start_worker(
+        DATABASE_REPLICA_URLS=",".join(replica_urls),
+        REPLICA_MAX_LAG_SECONDS=str(MAX_LAG_SECONDS),
+        REPLICA_CHECK_SECONDS="0.1",
+        INSTRUMENTATION="true",
+    )
+
+def seed(db):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    db.add(teacher)
+    db.flush()
+    course = models.Course(title="Course", description="d", teacher_id=teacher.id)
+    db.add(course)
+    db.flush()
+    db.add(models.Lesson(title="Lesson 1", course_id=course.id, **lesson_content.pack("Lesson content")))
+    db.commit()
+    return teacher, course.id
+
+def wait_for(worker, available):
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        stats = worker.get("/health/replicas").json()
+        if all(replica["available"] == available for replica in stats["replicas"]):
+            return stats
+        time.sleep(0.05)
+    raise AssertionError(f"replicas never became {'available' if available else 'unavailable'}: {stats}")
+
+def replicate(worker, replica_urls):
+    sqlite_replica.replicate(str(engine.url), replica_urls)
+    return wait_for(worker, True)
+
+def reads(worker):
+    stats = worker.get("/health/replicas").json()
+    return stats["primary_reads"], [replica["reads"] for replica in stats["replicas"]]
+
+def lesson_titles(worker, course_id, headers):
+    response = worker.get(f"/lessons/course/{course_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return [lesson["title"] for lesson in response.json()], int(STATEMENTS.search(response.headers["server-timing"])[1])
+
+def test_reads_are_spread_over_fresh_replicas_and_instrumented(db, auth_headers, worker, replica_urls):
+    teacher, course_id = seed(db)
+    headers = auth_headers(teacher)
+    assert worker.get("/auth/me", headers=headers).status_code == 200
+    primary_titles, primary_statements = lesson_titles(worker, course_id, headers)
+    replicate(worker, replica_urls)
+    primary_reads, _ = reads(worker)
+
+    served = [lesson_titles(worker, course_id, headers) for _ in range(4)]
+
+    assert served == [(primary_titles, primary_statements)] * 4
+    assert reads(worker) == (primary_reads, [2, 2])
+
+def test_lagging_replicas_fall_back_to_the_primary(db, auth_headers, worker, replica_urls):
+    teacher, course_id = seed(db)
+    headers = auth_headers(teacher)
+    replicate(worker, replica_urls)
+    db.add(models.Lesson(title="Lesson 2", course_id=course_id, **lesson_content.pack("Lesson content")))
+    db.commit()
+    assert lesson_titles(worker, course_id, headers)[0] == ["Lesson 1"]
+
+    stats = wait_for(worker, False)
+
+    assert all(replica["lag_seconds"] > MAX_LAG_SECONDS for replica in stats["replicas"])
+    assert lesson_titles(worker, course_id, headers)[0] == ["Lesson 1", "Lesson 2"]
+    assert reads(worker)[0] == stats["primary_reads"] + 1
+
+def test_last_write_header_reads_your_own_writes(db, auth_headers, worker, replica_urls):
+    teacher, course_id = seed(db)
+    headers = auth_headers(teacher)
+    replicate(worker, replica_urls)
+
+    created = worker.post("/lessons/", json={"title": "Lesson 2", "content": "c", "course_id": course_id},
+                          headers=headers)
+    assert created.status_code == 201, created.text
+    last_write = created.headers[LAST_WRITE_HEADER]
+
+    assert lesson_titles(worker, course_id, headers)[0] == ["Lesson 1"]
+    assert lesson_titles(worker, course_id, {**headers, LAST_WRITE_HEADER: last_write})[0] == ["Lesson 1", "Lesson 2"]
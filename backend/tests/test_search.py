@@ -0,0 +1,20 @@
+import models
+
+def test_search_scores_keep_bm25_resolution(db, client, auth_headers):
+    teacher = models.User(name="Teacher", email="teacher@test", password="pw", role="teacher")
+    db.add(teacher)
+    db.commit()
+    headers = auth_headers(teacher)
+    for mentions in range(1, 5):
+        words = ["solar"] * mentions + ["energy"] * (8 - mentions)
+        created = client.post("/courses/", json={"title": f"Course {mentions}", "description": " ".join(words)},
+                              headers=headers)
+        assert created.status_code == 201, created.text
+
+    response = client.get("/search/", params={"q": "solar"}, headers=headers)
+
+    assert response.status_code == 200, response.text
+    hits = response.json()
+    assert [hit["title"] for hit in hits] == ["Course 4", "Course 3", "Course 2", "Course 1"]
+    scores = [hit["score"] for hit in hits]
+    assert scores == sorted(set(scores), reverse=True), scores
@@ -0,0 +1,36 @@
+import models
+from user_cache import user_cache
+
+def login(client, role):
+    created = client.post("/users/", json={
+        "name": "Cached User", "email": f"{role}@test", "password": "secret-password", "role": role
+    })
+    assert created.status_code == 201, created.text
+    response = client.post("/auth/login", json={"email": f"{role}@test", "password": "secret-password"})
+    assert response.status_code == 200, response.text
+    return created.json()["id"], {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def test_deleted_user_is_rejected_while_cache_entry_is_live(db, client):
+    user_id, headers = login(client, "student")
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert user_cache.get(user_id) is not None
+
+    db.delete(db.get(models.User, user_id))
+    db.commit()
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+def test_role_change_is_seen_while_cache_entry_is_live(db, client):
+    user_id, headers = login(client, "teacher")
+    course = models.Course(title="Course", description="d", teacher_id=user_id)
+    db.add(course)
+    db.commit()
+    summary = f"/progress/course/{course.id}/summary"
+    assert client.get(summary, headers=headers).status_code == 200
+    assert user_cache.get(user_id) is not None
+
+    db.get(models.User, user_id).role = "student"
+    db.commit()
+
+    assert client.get("/auth/me", headers=headers).json()["role"] == "student"
+    assert client.get(summary, headers=headers).status_code == 403
@@ -0,0 +1,29 @@
+import os
+from sqlalchemy import event
+from cache import TTLCache
+import http_cache
+import models
+import schemas
+
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_SIZE = int(os.environ.get("USER_CACHE_MAX_SIZE", "10000"))
+
+user_cache = TTLCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+def cache_user(user, version: int):
+    snapshot = schemas.UserResponse.model_validate(user)
+    user_cache.set(snapshot.id, (version, snapshot))
+    return snapshot
+
+def invalidate_user(user_id: int):
+    user_cache.invalidate(user_id)
+
+@event.listens_for(models.User, "after_update")
+def _invalidate_updated_user(mapper, connection, target):
+    http_cache.bump_connection(connection, http_cache.user_key(target.id))
+    invalidate_user(target.id)
+
+@event.listens_for(models.User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target):
+    http_cache.bump_connection(connection, http_cache.user_key(target.id))
+    invalidate_user(target.id)
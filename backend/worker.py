@@ -0,0 +1,23 @@
+import sys
+sys.path.insert(0, '.')
+
+import argparse
+import logging
+import jobs
+import certificates
+
+def run_worker(concurrency, once=False):
+    processed = jobs.work(concurrency, once=once)
+    print(f"Processed {processed} job(s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued background jobs (certificates, notifications)")
+    parser.add_argument("--concurrency", type=int, default=jobs.JOB_CONCURRENCY, help="jobs run in parallel")
+    parser.add_argument("--once", action="store_true", help="exit when no job is ready instead of polling")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        run_worker(args.concurrency, args.once)
+    except KeyboardInterrupt:
+        pass
@@ -1,6 +1,6 @@
 export const API_URL = '/api';
 
-export async function apiRequest(endpoint, options = {}) {
+async function sendRequest(endpoint, options = {}) {
   const token = localStorage.getItem('token');
   
   const headers = {
@@ -12,19 +12,76 @@ export async function apiRequest(endpoint, options = {}) {
     headers['Authorization'] = `Bearer ${token}`;
   }
   
+  const lastWrite = localStorage.getItem('lastWrite');
+  if (lastWrite) {
+    headers['X-Last-Write'] = lastWrite;
+  }
+  
   const response = await fetch(`${API_URL}${endpoint}`, {
     ...options,
     headers,
   });
   
+  const written = response.headers.get('X-Last-Write');
+  if (written) {
+    localStorage.setItem('lastWrite', written);
+  }
+  
   if (!response.ok) {
     const error = await response.json().catch(() => ({ detail: 'An error occurred' }));
     throw new Error(error.detail || 'Request failed');
   }
   
+  return response;
+}
+
+export async function apiRequest(endpoint, options = {}) {
+  const response = await sendRequest(endpoint, options);
+  
   if (response.status === 204) {
     return null;
   }
   
   return response.json();
 }
+
+export async function apiText(endpoint) {
+  const response = await sendRequest(endpoint);
+  return response.text();
+}
+
+export async function apiDownload(endpoint, filename) {
+  const response = await sendRequest(endpoint);
+  const url = URL.createObjectURL(await response.blob());
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = filename;
+  link.click();
+  URL.revokeObjectURL(url);
+}
+
+function withPageParams(endpoint, cursor, limit) {
+  const separator = endpoint.includes('?') ? '&' : '?';
+  let url = `${endpoint}${separator}limit=${limit}`;
+  if (cursor) {
+    url += `&cursor=${encodeURIComponent(cursor)}`;
+  }
+  return url;
+}
+
+export async function apiRequestPage(endpoint, cursor = null, limit = 20) {
+  const response = await sendRequest(withPageParams(endpoint, cursor, limit));
+  const items = await response.json();
+  return { items, nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
+export async function apiRequestAll(endpoint, limit = 500) {
+  const items = [];
+  let cursor = null;
+  do {
+    const page = await apiRequestPage(endpoint, cursor, limit);
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+}
@@ -1,14 +1,12 @@
 import { useState, useEffect } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
-import { apiRequest } from '../../api';
+import { apiRequest, apiDownload } from '../../api';
 import { getUser, logout } from '../../utils/auth';
 import BackButton from '../../components/BackButton';
 
 function Certificate() {
   const { studentId, courseId } = useParams();
-  const [progress, setProgress] = useState(null);
-  const [course, setCourse] = useState(null);
-  const [student, setStudent] = useState(null);
+  const [certificate, setCertificate] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const navigate = useNavigate();
@@ -20,20 +18,8 @@ function Certificate() {
 
   const fetchData = async () => {
     try {
-      const [progressData, courseData, userData] = await Promise.all([
-        apiRequest(`/progress/student/${studentId}`),
-        apiRequest(`/courses/${courseId}`),
-        apiRequest(`/users/${studentId}`)
-      ]);
-      
-      const courseProgress = progressData.find(p => p.course_id === parseInt(courseId));
-      if (!courseProgress || !courseProgress.certificate_earned) {
-        setError('Certificate not available for this course.');
-      } else {
-        setProgress(courseProgress);
-      }
-      setCourse(courseData);
-      setStudent(userData);
+      const certificateData = await apiRequest(`/progress/certificate/${studentId}/${courseId}`);
+      setCertificate(certificateData);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -45,6 +31,17 @@ function Certificate() {
     window.print();
   };
 
+  const handleDownload = async () => {
+    try {
+      await apiDownload(
+        `/progress/certificate/${studentId}/${courseId}/pdf`,
+        `certificate-${studentId}-${courseId}.pdf`
+      );
+    } catch (err) {
+      setError(err.message);
+    }
+  };
+
   const handleLogout = () => {
     logout();
     navigate('/');
@@ -84,24 +81,34 @@ function Certificate() {
             <div className="certificate">
               <h1>🌿 Certificate of Completion</h1>
               <p className="award-text">This is to certify that</p>
-              <p className="student-name">{student?.name}</p>
+              <p className="student-name">{certificate?.student_name}</p>
               <p className="award-text">has successfully completed the course</p>
-              <p className="course-name">"{course?.title}"</p>
+              <p className="course-name">"{certificate?.course_title}"</p>
               <p style={{ color: '#666', marginTop: '20px' }}>
-                Score: {progress?.quiz_score}/{progress?.quiz_total} ({Math.round((progress?.quiz_score / progress?.quiz_total) * 100)}%)
+                Score: {certificate?.quiz_score}/{certificate?.quiz_total} ({Math.round((certificate?.quiz_score / certificate?.quiz_total) * 100)}%)
               </p>
               <p style={{ color: '#888', marginTop: '30px', fontSize: '14px' }}>
                 EcoLearn Environmental Learning Management System
               </p>
               <p style={{ color: '#888', fontSize: '14px' }}>
-                Date: {new Date().toLocaleDateString()}
+                Date: {new Date(certificate?.issued_at ? `${certificate.issued_at}Z` : Date.now()).toLocaleDateString()}
               </p>
+              {certificate?.verification_hash && (
+                <p style={{ color: '#aaa', fontSize: '11px', wordBreak: 'break-all' }}>
+                  Verification: {certificate.verification_hash}
+                </p>
+              )}
             </div>
 
             <div className="no-print" style={{ textAlign: 'center', marginTop: '20px' }}>
               <button className="btn btn-primary" onClick={handlePrint}>
                 🖨️ Print Certificate
               </button>
+              {certificate?.verification_hash && (
+                <button className="btn btn-secondary" onClick={handleDownload} style={{ marginLeft: '10px' }}>
+                  📄 Download PDF
+                </button>
+              )}
             </div>
           </>
         )}
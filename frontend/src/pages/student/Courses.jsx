@@ -1,14 +1,21 @@
 import { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import { apiRequest } from '../../api';
+import { apiRequest, apiRequestPage } from '../../api';
 import { getUser, logout } from '../../utils/auth';
 import BackButton from '../../components/BackButton';
 
 function Courses() {
   const [courses, setCourses] = useState([]);
   const [enrolledIds, setEnrolledIds] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
+  const [query, setQuery] = useState('');
+  const [searchQuery, setSearchQuery] = useState('');
+  const [hits, setHits] = useState([]);
+  const [searchCursor, setSearchCursor] = useState(null);
+  const [searching, setSearching] = useState(false);
   const navigate = useNavigate();
   const user = getUser();
 
@@ -18,11 +25,12 @@ function Courses() {
 
   const fetchData = async () => {
     try {
-      const [coursesData, enrollmentsData] = await Promise.all([
-        apiRequest('/courses/'),
+      const [coursesPage, enrollmentsData] = await Promise.all([
+        apiRequestPage('/courses/'),
         apiRequest(`/enrollments/student/${user.id}`)
       ]);
-      setCourses(coursesData);
+      setCourses(coursesPage.items);
+      setNextCursor(coursesPage.nextCursor);
       setEnrolledIds(enrollmentsData.map(e => e.course_id));
     } catch (err) {
       setError(err.message);
@@ -31,6 +39,62 @@ function Courses() {
     }
   };
 
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await apiRequestPage('/courses/', nextCursor);
+      setCourses([...courses, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const searchPage = (q, cursor) => apiRequestPage(`/search/?q=${encodeURIComponent(q)}`, cursor);
+
+  const handleSearch = async (e) => {
+    e.preventDefault();
+    const q = query.trim();
+    if (!q) {
+      handleClearSearch();
+      return;
+    }
+    setSearching(true);
+    setError('');
+    try {
+      const page = await searchPage(q);
+      setSearchQuery(q);
+      setHits(page.items);
+      setSearchCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setSearching(false);
+    }
+  };
+
+  const handleMoreHits = async () => {
+    setSearching(true);
+    try {
+      const page = await searchPage(searchQuery, searchCursor);
+      setHits([...hits, ...page.items]);
+      setSearchCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setSearching(false);
+    }
+  };
+
+  const handleClearSearch = () => {
+    setQuery('');
+    setSearchQuery('');
+    setHits([]);
+    setSearchCursor(null);
+  };
+
   const handleEnroll = async (courseId) => {
     try {
       await apiRequest('/enrollments/', {
@@ -70,7 +134,64 @@ function Courses() {
 
         {error && <div className="error-message">{error}</div>}
 
-        {courses.length === 0 ? (
+        <form className="search-form" onSubmit={handleSearch}>
+          <input
+            type="search"
+            className="input"
+            placeholder="Search courses and lessons"
+            value={query}
+            onChange={(e) => setQuery(e.target.value)}
+          />
+          <button type="submit" className="btn btn-primary" disabled={searching}>
+            Search
+          </button>
+          {searchQuery && (
+            <button type="button" className="btn btn-secondary" onClick={handleClearSearch}>
+              Clear
+            </button>
+          )}
+        </form>
+
+        {searchQuery ? (
+          <>
+            {hits.length === 0 ? (
+              <div className="card">
+                <p>No results for "{searchQuery}".</p>
+              </div>
+            ) : (
+              hits.map(hit => (
+                <div key={`${hit.kind}-${hit.id}`} className="course-card">
+                  <span className="badge">{hit.kind === 'course' ? 'Course' : 'Lesson'}</span>
+                  <h3>{hit.title}</h3>
+                  {hit.kind === 'lesson' && (
+                    <p style={{ fontSize: '14px', color: '#888' }}>In {hit.course_title}</p>
+                  )}
+                  {hit.snippet ? (
+                    <p className="search-snippet" dangerouslySetInnerHTML={{ __html: hit.snippet }} />
+                  ) : (
+                    <p>Enroll in this course to read the lesson.</p>
+                  )}
+                  <div className="course-actions">
+                    {enrolledIds.includes(hit.course_id) ? (
+                      <button className="btn btn-secondary" onClick={() => navigate(`/lessons/${hit.course_id}`)}>
+                        View Lessons
+                      </button>
+                    ) : (
+                      <button className="btn btn-primary" onClick={() => handleEnroll(hit.course_id)}>
+                        Enroll Now
+                      </button>
+                    )}
+                  </div>
+                </div>
+              ))
+            )}
+            {searchCursor && (
+              <button className="btn btn-secondary" onClick={handleMoreHits} disabled={searching}>
+                {searching ? 'Loading...' : 'More Results'}
+              </button>
+            )}
+          </>
+        ) : courses.length === 0 ? (
           <div className="card">
             <p>No courses available at the moment.</p>
           </div>
@@ -102,6 +223,12 @@ function Courses() {
             </div>
           ))
         )}
+
+        {!searchQuery && nextCursor && (
+          <button className="btn btn-secondary" onClick={handleLoadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load More Courses'}
+          </button>
+        )}
       </div>
     </div>
   );
@@ -1,16 +1,14 @@
 import { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { apiRequest } from '../../api';
-import { getUser, logout } from '../../utils/auth';
+import { logout } from '../../utils/auth';
 import BackButton from '../../components/BackButton';
 
 function EnrolledCourses() {
   const [enrollments, setEnrollments] = useState([]);
-  const [courses, setCourses] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const navigate = useNavigate();
-  const user = getUser();
 
   useEffect(() => {
     fetchData();
@@ -18,15 +16,8 @@ function EnrolledCourses() {
 
   const fetchData = async () => {
     try {
-      const enrollmentsData = await apiRequest(`/enrollments/student/${user.id}`);
-      setEnrollments(enrollmentsData);
-      
-      const coursesData = await apiRequest('/courses/?show_inactive=true');
-      const coursesMap = {};
-      coursesData.forEach(course => {
-        coursesMap[course.id] = course;
-      });
-      setCourses(coursesMap);
+      const dashboard = await apiRequest('/me/dashboard');
+      setEnrollments(dashboard.courses);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -68,23 +59,20 @@ function EnrolledCourses() {
             </button>
           </div>
         ) : (
-          enrollments.map(enrollment => {
-            const course = courses[enrollment.course_id];
-            return (
-              <div key={enrollment.id} className="course-card">
-                <h3>{enrollment.course_title || course?.title || 'Course'}</h3>
-                <p>{course?.description || 'No description available'}</p>
-                <div className="course-actions">
-                  <button className="btn btn-secondary" onClick={() => navigate(`/lessons/${enrollment.course_id}`)}>
-                    View Lessons
-                  </button>
-                  <button className="btn btn-primary" onClick={() => navigate(`/quiz/${enrollment.course_id}`)}>
-                    Take Quiz
-                  </button>
-                </div>
+          enrollments.map(({ enrollment_id, course }) => (
+            <div key={enrollment_id} className="course-card">
+              <h3>{course.title || 'Course'}</h3>
+              <p>{course.description || 'No description available'}</p>
+              <div className="course-actions">
+                <button className="btn btn-secondary" onClick={() => navigate(`/lessons/${course.id}`)}>
+                  View Lessons
+                </button>
+                <button className="btn btn-primary" onClick={() => navigate(`/quiz/${course.id}`)}>
+                  Take Quiz
+                </button>
               </div>
-            );
-          })
+            </div>
+          ))
         )}
       </div>
     </div>
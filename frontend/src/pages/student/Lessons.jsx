@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Link, useParams, useNavigate } from 'react-router-dom';
-import { apiRequest } from '../../api';
+import { apiRequest, apiText } from '../../api';
 import { getUser, logout } from '../../utils/auth';
 import BackButton from '../../components/BackButton';
 
@@ -8,7 +8,10 @@ function Lessons() {
   const { courseId } = useParams();
   const [lessons, setLessons] = useState([]);
   const [course, setCourse] = useState(null);
+  const [current, setCurrent] = useState(0);
+  const [contents, setContents] = useState({});
   const [loading, setLoading] = useState(true);
+  const [loadingContent, setLoadingContent] = useState(false);
   const [error, setError] = useState('');
   const navigate = useNavigate();
   const user = getUser();
@@ -32,6 +35,27 @@ function Lessons() {
     }
   };
 
+  useEffect(() => {
+    const lesson = lessons[current];
+    if (lesson && lesson.content_size > 0 && !(lesson.content_hash in contents)) {
+      fetchContent(lesson);
+    }
+  }, [lessons, current]);
+
+  const fetchContent = async (lesson) => {
+    setLoadingContent(true);
+    try {
+      const text = await apiText(`/lessons/${lesson.id}/content`);
+      setContents(previous => ({ ...previous, [lesson.content_hash]: text }));
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingContent(false);
+    }
+  };
+
+  const formatSize = (bytes) => (bytes < 1024 ? `${bytes} B` : `${(bytes / 1024).toFixed(1)} KB`);
+
   const handleLogout = () => {
     logout();
     navigate('/');
@@ -72,14 +96,42 @@ function Lessons() {
             <p>No lessons available for this course yet.</p>
           </div>
         ) : (
-          lessons.map((lesson, index) => (
-            <div key={lesson.id} className="card">
-              <h3>Lesson {index + 1}: {lesson.title}</h3>
+          <>
+            <div className="card">
+              {lessons.map((lesson, index) => (
+                <button
+                  key={lesson.id}
+                  className={`btn ${index === current ? 'btn-primary' : 'btn-secondary'}`}
+                  style={{ margin: '0 10px 10px 0' }}
+                  onClick={() => setCurrent(index)}
+                >
+                  {index + 1}. {lesson.title} ({formatSize(lesson.content_size)})
+                </button>
+              ))}
+            </div>
+            <div className="card">
+              <h3>Lesson {current + 1}: {lessons[current].title}</h3>
               <div style={{ marginTop: '15px', whiteSpace: 'pre-wrap' }}>
-                {lesson.content || 'No content available'}
+                {lessons[current].content_size === 0
+                  ? 'No content available'
+                  : loadingContent && !(lessons[current].content_hash in contents)
+                    ? 'Loading lesson...'
+                    : contents[lessons[current].content_hash]}
+              </div>
+              <div className="course-actions" style={{ marginTop: '20px' }}>
+                <button className="btn btn-secondary" onClick={() => setCurrent(current - 1)} disabled={current === 0}>
+                  Previous
+                </button>
+                <button
+                  className="btn btn-secondary"
+                  onClick={() => setCurrent(current + 1)}
+                  disabled={current === lessons.length - 1}
+                >
+                  Next
+                </button>
               </div>
             </div>
-          ))
+          </>
         )}
 
         {user.role === 'student' && (
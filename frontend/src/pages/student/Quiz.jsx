@@ -23,16 +23,10 @@ function Quiz() {
 
   const fetchData = async () => {
     try {
-      const [quizzesData, courseData, progressData] = await Promise.all([
-        apiRequest(`/quizzes/course/${courseId}`),
-        apiRequest(`/courses/${courseId}`),
-        apiRequest(`/progress/student/${user.id}`)
-      ]);
-      setQuizzes(quizzesData);
-      setCourse(courseData);
-      
-      const courseProgress = progressData.find(p => p.course_id === parseInt(courseId));
-      setProgress(courseProgress);
+      const view = await apiRequest(`/courses/${courseId}/quiz-view`);
+      setQuizzes(view.quizzes);
+      setCourse(view.course);
+      setProgress(view.progress);
     } catch (err) {
       setError(err.message);
     } finally {
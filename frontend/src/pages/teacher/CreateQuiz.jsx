@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import { apiRequest } from '../../api';
+import { apiRequest, apiRequestAll } from '../../api';
 import { getUser, logout } from '../../utils/auth';
 import BackButton from '../../components/BackButton';
 
@@ -27,7 +27,7 @@ function CreateQuiz() {
 
   const fetchCourses = async () => {
     try {
-      const data = await apiRequest(`/courses/?show_inactive=true&teacher_id=${user.id}`);
+      const data = await apiRequestAll(`/courses/?show_inactive=true&teacher_id=${user.id}`);
       setCourses(data);
     } catch (err) {
       setError(err.message);
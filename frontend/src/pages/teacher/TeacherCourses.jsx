@@ -1,14 +1,17 @@
 import { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import { apiRequest } from '../../api';
+import { apiRequest, apiRequestPage } from '../../api';
 import { getUser, logout } from '../../utils/auth';
 import BackButton from '../../components/BackButton';
 import StudentRow from '../../components/StudentRow';
 
 function TeacherCourses() {
   const [courses, setCourses] = useState([]);
+  const [coursesCursor, setCoursesCursor] = useState(null);
   const [selectedCourse, setSelectedCourse] = useState(null);
   const [studentProgress, setStudentProgress] = useState([]);
+  const [progressCursor, setProgressCursor] = useState(null);
+  const [summary, setSummary] = useState(null);
   const [loading, setLoading] = useState(true);
   const [progressLoading, setProgressLoading] = useState(false);
   const [error, setError] = useState('');
@@ -19,10 +22,13 @@ function TeacherCourses() {
     fetchCourses();
   }, []);
 
+  const coursesEndpoint = `/courses/?show_inactive=true&teacher_id=${user.id}`;
+
   const fetchCourses = async () => {
     try {
-      const data = await apiRequest(`/courses/?show_inactive=true&teacher_id=${user.id}`);
-      setCourses(data);
+      const page = await apiRequestPage(coursesEndpoint);
+      setCourses(page.items);
+      setCoursesCursor(page.nextCursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -30,6 +36,16 @@ function TeacherCourses() {
     }
   };
 
+  const handleLoadMoreCourses = async () => {
+    try {
+      const page = await apiRequestPage(coursesEndpoint, coursesCursor);
+      setCourses([...courses, ...page.items]);
+      setCoursesCursor(page.nextCursor);
+    } catch (err) {
+      alert(err.message);
+    }
+  };
+
   const handleToggle = async (courseId) => {
     try {
       await apiRequest(`/courses/${courseId}/toggle`, { method: 'PATCH' });
@@ -43,8 +59,13 @@ function TeacherCourses() {
     setSelectedCourse(course);
     setProgressLoading(true);
     try {
-      const data = await apiRequest(`/progress/course/${course.id}`);
-      setStudentProgress(data);
+      const [page, courseSummary] = await Promise.all([
+        apiRequestPage(`/progress/course/${course.id}`, null, 50),
+        apiRequest(`/progress/course/${course.id}/summary`)
+      ]);
+      setStudentProgress(page.items);
+      setProgressCursor(page.nextCursor);
+      setSummary(courseSummary);
     } catch (err) {
       alert(err.message);
     } finally {
@@ -52,6 +73,16 @@ function TeacherCourses() {
     }
   };
 
+  const handleLoadMoreProgress = async () => {
+    try {
+      const page = await apiRequestPage(`/progress/course/${selectedCourse.id}`, progressCursor, 50);
+      setStudentProgress([...studentProgress, ...page.items]);
+      setProgressCursor(page.nextCursor);
+    } catch (err) {
+      alert(err.message);
+    }
+  };
+
   const handleDelete = async (courseId) => {
     if (!confirm('Are you sure you want to delete this course?')) return;
     
@@ -61,6 +92,8 @@ function TeacherCourses() {
       if (selectedCourse?.id === courseId) {
         setSelectedCourse(null);
         setStudentProgress([]);
+        setProgressCursor(null);
+        setSummary(null);
       }
     } catch (err) {
       alert(err.message);
@@ -134,10 +167,22 @@ function TeacherCourses() {
           </div>
         )}
 
+        {coursesCursor && (
+          <button className="btn btn-secondary" style={{ marginTop: '20px' }} onClick={handleLoadMoreCourses}>
+            Load More Courses
+          </button>
+        )}
+
         {selectedCourse && (
           <div className="card" style={{ marginTop: '30px' }}>
             <h2>Student Progress: {selectedCourse.title}</h2>
             
+            {!progressLoading && summary && summary.students > 0 && (
+              <p style={{ color: '#666', marginTop: '10px' }}>
+                {summary.students} students · Class average {summary.average_percentage}% · Pass rate {summary.pass_rate}% · {summary.certificates} certificates · Attempts: {summary.attempt_distribution['0']} none, {summary.attempt_distribution['1']} one, {summary.attempt_distribution['2+']} two
+              </p>
+            )}
+            
             {progressLoading ? (
               <p>Loading progress...</p>
             ) : studentProgress.length === 0 ? (
@@ -161,6 +206,12 @@ function TeacherCourses() {
                 </tbody>
               </table>
             )}
+
+            {!progressLoading && progressCursor && (
+              <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={handleLoadMoreProgress}>
+                Load More Students
+              </button>
+            )}
           </div>
         )}
       </div>